@@ -1,20 +1,25 @@
 import logging
 import os
 import requests
+from typing import Optional
 from dotenv import load_dotenv
 
+from services.api.quota_ledger import QuotaLedger, quota_ledger
+
 env_file = ".env.rds" if os.getenv("DOCKER_ENV") else ".env.local"
 load_dotenv(env_file)
 
 
 class ApiConfig:
-    def __init__(self) -> None:
+    def __init__(self, ledger: Optional[QuotaLedger] = None) -> None:
         self.base_url = os.getenv("API_FOOTBALL_BASE_URL", "")
         self.key_name = os.getenv("API_FOOTBALL_HEADER_KEY_NAME", "")
         self.key_value = os.getenv("API_FOOTBALL_HEADER_KEY_VALUE", "")
         self.host_name = os.getenv("API_FOOTBALL_HEADER_HOST_NAME", "")
         self.host_value = os.getenv("API_FOOTBALL_HEADER_HOST_VALUE", "")
         self.subscription_status = None  # Cache the subscription status
+        # Usage shared with other fetchers and processes
+        self.ledger = ledger or quota_ledger
 
     def get_headers(self) -> dict[str, str]:
         return {
@@ -25,21 +30,24 @@ class ApiConfig:
     def get_base_url(self) -> str | None:
         return self.base_url
 
-    def check_subscription_status(self) -> int | None:
+    def check_subscription_status(
+        self, session: Optional[requests.Session] = None
+    ) -> int | None:
         """
-        Checks the current subscription status or API usage limits.
+        Checks the current subscription status or API usage limits, on the given session
+        when provided. The API is asked only when the shared quota ledger is stale,
+        otherwise the remaining quota is read from the ledger.
         """
-        if self.subscription_status is None:
+        if self.ledger.needs_sync():
             url = f"{self.get_base_url()}/status"
             headers = self.get_headers()
-            response = requests.get(url, headers=headers)
+            response = (session or requests).get(url, headers=headers)
 
             if response.status_code != 200:
                 raise Exception(f"Response: {response.status_code}")
 
             if response.json()["response"]:
                 api_requests = response.json()["response"]["requests"]
-                remaining_quota = api_requests["limit_day"] - api_requests["current"]
                 logging.info(
                     f"\n* * * * * * * * * * "
                     f"Hi {response.json()['response']['account']['firstname']}! * * * * * * * * * * "
@@ -47,16 +55,18 @@ class ApiConfig:
                     f"until {response.json()['response']['subscription']['end']}\n"
                     f"* * * * * * * * Current usage: {api_requests['current']}/{api_requests['limit_day']} * * * * * * * * "
                 )
-                self.subscription_status = remaining_quota  # Cache the result
+                self.ledger.sync(api_requests["limit_day"], api_requests["current"])
             else:
                 logging.error(response.json()["errors"]["requests"])
+                return self.subscription_status
+        self.subscription_status = self.ledger.get_remaining()  # Cache the result
         return self.subscription_status
 
-    def has_quota(self) -> bool:
+    def has_quota(self, session: Optional[requests.Session] = None) -> bool:
         """
         Check if the user has enough quota left to make requests.
         """
-        status = self.check_subscription_status()
+        status = self.check_subscription_status(session)
         if status and status > 0:
             return True
         return False
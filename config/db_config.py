@@ -12,3 +12,32 @@ class DbConfig:
         self.DB_PASSWORD = os.getenv("DB_PASSWORD", "")
         self.DB_HOST = os.getenv("DB_HOST", "")
         self.DB_PORT = os.getenv("DB_PORT", "")
+        # Connection pool of each engine
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        # Seconds after which a pooled connection is replaced, -1 keeps it open
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        # Test connections on checkout, so ones dropped by the server are replaced
+        self.DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+        # Pool of each engine in worker processes (e.g. of multiprocessing.Pool), which
+        # connect at once and would otherwise multiply the connections of the main pool
+        self.DB_WORKER_POOL_SIZE = int(os.getenv("DB_WORKER_POOL_SIZE", "2"))
+        self.DB_WORKER_MAX_OVERFLOW = int(os.getenv("DB_WORKER_MAX_OVERFLOW", "0"))
+        # Comma-separated "host[:port]" of read replicas of the primary, e.g.
+        # "replica-1:5432,replica-2:5432". Reads are spread over them when set.
+        self.DB_REPLICA_HOSTS = [
+            host.strip()
+            for host in os.getenv("DB_REPLICA_HOSTS", "").split(",")
+            if host.strip()
+        ]
+        # Read query results through COPY TO STDOUT instead of row by row
+        self.DB_FAST_READS = os.getenv("DB_FAST_READS", "false").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
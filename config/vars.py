@@ -1,15 +1,130 @@
 from pathlib import Path
 
+from config.entity_names import (
+    COACHES_API_ENDPOINT,
+    COUNTRIES_API_ENDPOINT,
+    FIXTURE_EVENTS_API_ENDPOINT,
+    FIXTURE_LINEUPS_API_ENDPOINT,
+    FIXTURE_PLAYER_STATS_API_ENDPOINT,
+    FIXTURE_STATS_API_ENDPOINT,
+    FIXTURES_API_ENDPOINT,
+    LEAGUES_API_ENDPOINT,
+    TEAMS_API_ENDPOINT,
+    COACHES_DIR,
+    FIXTURE_EVENTS_DIR,
+    FIXTURE_PLAYER_STATS_DIR,
+    FIXTURE_STATS_DIR,
+    FIXTURES_DIR,
+    LEAGUES_DIR,
+    TEAMS_DIR,
+)
+
 # Project
 CONFIG_DIR = "config"
 DATA_DIR = "data"
 ROOT_DIR = Path(__file__).resolve().parent.parent
 SCRIPTS_DIR = "scripts"
+# Timezone of match days
+LOCAL_TIMEZONE = "Europe/Warsaw"
 
 # API
 CURRENT_API = "api-football"
 REQUEST_LIMIT_PER_MINUTE = 400
 SLEEP_TIME = 60 / REQUEST_LIMIT_PER_MINUTE
+# Requests kept in flight by the async fetcher, paced by a token bucket
+REQUEST_CONCURRENCY = 8
+# Requests the token bucket lets through at once, counted in the per-minute limit
+REQUEST_BURST = 5
+# Kept-alive connections of the API session, at least one per concurrent request
+REQUEST_POOL_SIZE = REQUEST_CONCURRENCY
+# Seconds to open a connection and to wait for data from the API
+REQUEST_CONNECT_TIMEOUT = 5
+REQUEST_READ_TIMEOUT = 30
+REQUEST_ACCEPT_ENCODING = "gzip, deflate"
+# Retries of a failed request, with jittered exponential backoff between attempts
+REQUEST_MAX_RETRIES = 4
+REQUEST_BACKOFF_BASE_SECONDS = 1
+REQUEST_BACKOFF_MAX_SECONDS = 60
+# Statuses of responses worth retrying
+REQUEST_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Consecutive failed requests after which the fetcher pauses for CIRCUIT_RESET_SECONDS,
+# doubled on each failure right after a pause
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 30
+# Longest pause, requests fail at once while the upstream needs a longer one
+CIRCUIT_MAX_PAUSE_SECONDS = 300
+# SQLite queue under DATA_DIR of items whose requests failed, re-fetched by the next
+# pull of the same endpoint, and attempts after which an item is dropped
+RETRY_QUEUE_FILE = "api_retry_queue.sqlite"
+RETRY_QUEUE_MAX_ATTEMPTS = 5
+# Store fetched responses as .json.gz, level 1 trades size for little CPU
+RESPONSE_COMPRESSION = False
+RESPONSE_COMPRESSION_LEVEL = 1
+
+# API QUOTA
+# SQLite ledger under DATA_DIR of requests made today, shared by all processes
+API_QUOTA_LEDGER_FILE = "api_quota.sqlite"
+# Seconds after which the ledger is reconciled with the API's /status
+API_QUOTA_SYNC_INTERVAL_SECONDS = 15 * 60
+# Priority of each entity pulled from the API, 0 is the highest. Entities only use
+# quota left over by the reserves of entities with a higher priority.
+API_QUOTA_PRIORITIES = {
+    FIXTURES_DIR: 0,
+    FIXTURE_EVENTS_DIR: 1,
+    FIXTURE_PLAYER_STATS_DIR: 1,
+    FIXTURE_STATS_DIR: 1,
+    LEAGUES_DIR: 2,
+    TEAMS_DIR: 2,
+    COACHES_DIR: 3,
+}
+# Priority of entities missing above, e.g. one-off backfills
+API_QUOTA_DEFAULT_PRIORITY = 3
+# Share of the daily limit held back for an entity until it used it
+API_QUOTA_RESERVED_SHARES = {
+    FIXTURES_DIR: 0.2,
+    FIXTURE_EVENTS_DIR: 0.1,
+    FIXTURE_PLAYER_STATS_DIR: 0.1,
+    FIXTURE_STATS_DIR: 0.1,
+}
+
+# RESPONSE CACHE
+RESPONSE_CACHE_ENABLED = True
+# Directory under DATA_DIR
+RESPONSE_CACHE_DIR = "response_cache"
+# Seconds a response of each endpoint is reused, None keeps it forever. Fixtures
+# responses whose fixtures have all finished never expire.
+RESPONSE_CACHE_TTL_SECONDS = {
+    FIXTURES_API_ENDPOINT: 5 * 60,
+    FIXTURE_EVENTS_API_ENDPOINT: 24 * 60 * 60,
+    FIXTURE_LINEUPS_API_ENDPOINT: 24 * 60 * 60,
+    FIXTURE_PLAYER_STATS_API_ENDPOINT: 24 * 60 * 60,
+    FIXTURE_STATS_API_ENDPOINT: 24 * 60 * 60,
+    LEAGUES_API_ENDPOINT: 24 * 60 * 60,
+    TEAMS_API_ENDPOINT: 7 * 24 * 60 * 60,
+    COACHES_API_ENDPOINT: 7 * 24 * 60 * 60,
+    COUNTRIES_API_ENDPOINT: 30 * 24 * 60 * 60,
+}
+RESPONSE_CACHE_DEFAULT_TTL_SECONDS = 60 * 60
+# Fixture statuses after which a fixture does not change any more
+FINISHED_FIXTURE_STATUSES = ("FT", "AET", "PEN", "AWD", "WO", "CANC", "ABD")
 
 # GOOGLE DRIVE
 GOOGLE_DRIVE_GRODT_FOLDER_ID = "123nk299C42r7XedkDfynqUMMJBdqKjm8"
+
+# DATABASE
+UPSERT_CHUNK_SIZE = 10000
+UPSERT_PARALLELISM = 4
+# Days changes are kept in `<table>_changes` change logs, older ones are pruned by upserts
+CHANGE_LOG_RETENTION_DAYS = 30
+# Seconds a writing transaction may run. Rows are stamped with `update_date` when their
+# transaction starts, so incremental refreshes only advance their watermark up to this
+# long before now, past rows of transactions that may still commit.
+REFRESH_WATERMARK_LAG_SECONDS = 15 * 60
+# Fixture ids per range partition of fixture detail tables, ids grow with match dates
+FIXTURE_ID_PARTITION_SIZE = 100000
+
+# QUERY CACHE
+QUERY_CACHE_MAX_ENTRIES = 64
+QUERY_CACHE_TTL_SECONDS = 600
+# Directory for query results evicted from memory, e.g. os.path.join(DATA_DIR, "query_cache")
+QUERY_CACHE_SPILL_DIR = None
@@ -1,161 +1,59 @@
+import datetime as dt
 import logging
 import pandas as pd
 
-from config.vars import DATA_DIR
+from config.vars import DATA_DIR, REFRESH_WATERMARK_LAG_SECONDS
+from models.analytics.breaks import (
+    Break,
+    BreaksTeamStats,
+    BreaksTeamStatsShares,
+    RefreshWatermark,
+)
+from models.data_warehouse.fixtures import Fixture
 from models.data_warehouse.main import Team
 from services.db import Db
 
 db = Db()
 
+BREAKS_WATERMARK_NAME = "breaks"
 
-def aggregate_breaks_team_stats_from_raw(df: pd.DataFrame) -> pd.DataFrame:
-    # Initialize the dataframe with team_id and team_name
-    breaks_team_stats_df = df.drop_duplicates("team_id")[
-        ["team_id", "team_name"]
-    ].reset_index(drop=True)
 
-    df["date"] = pd.to_datetime(df[["year", "month", "day"]])
-    last_break = df.groupby("team_id")["date"].max().reset_index()
-    total = df.groupby("team_id").size().reset_index(name="total")
-    home = (
-        df.loc[df["side"] == "home"].groupby("team_id").size().reset_index(name="home")
-    )
-    away = (
-        df.loc[df["side"] == "away"].groupby("team_id").size().reset_index(name="away")
-    )
-    won = df.loc[df["winner"]].groupby("team_id").size().reset_index(name="won")
-    lost = df.loc[~df["winner"]].groupby("team_id").size().reset_index(name="lost")
-    # Merge counts into the dataframe
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        last_break, on="team_id", how="left"
-    ).rename(columns={"date": "last_break"})
-    breaks_team_stats_df = breaks_team_stats_df.merge(total, on="team_id", how="left")
-    breaks_team_stats_df = breaks_team_stats_df.merge(home, on="team_id", how="left")
-    breaks_team_stats_df = breaks_team_stats_df.merge(away, on="team_id", how="left")
-    breaks_team_stats_df = breaks_team_stats_df.merge(won, on="team_id", how="left")
-    breaks_team_stats_df = breaks_team_stats_df.merge(lost, on="team_id", how="left")
+def refresh_breaks() -> None:
+    """
+    Refresh breaks and breaks team stats with fixtures inserted or changed since the last
+    refresh, tracked by a watermark of fixture `update_date`.
 
-    months = {
-        1: "jan",
-        2: "feb",
-        3: "mar",
-        4: "apr",
-        5: "may",
-        6: "jun",
-        7: "jul",
-        8: "aug",
-        9: "sep",
-        10: "oct",
-        11: "nov",
-        12: "dec",
-    }
-    for month, month_name in months.items():
-        month_count = (
-            df.loc[df["month"] == month]
-            .groupby("team_id")
-            .size()
-            .reset_index(name=month_name)
+    Only breaks of those fixtures and stats of their teams are recomputed, inside the
+    database and in one transaction with the new watermark. The first run recomputes all.
+    The watermark stays REFRESH_WATERMARK_LAG_SECONDS behind now, so fixtures committed
+    late with an older `update_date` are picked up by a later refresh.
+    """
+    with Fixture.db.transaction():
+        since = RefreshWatermark.get_watermark(BREAKS_WATERMARK_NAME)
+        watermark = Fixture.get_max_update_date(
+            lag=dt.timedelta(seconds=REFRESH_WATERMARK_LAG_SECONDS)
         )
-        breaks_team_stats_df = breaks_team_stats_df.merge(
-            month_count, on="team_id", how="left"
+        if since is not None and (watermark is None or watermark <= since):
+            logging.info("No fixtures changed since the last breaks refresh.")
+            return
+
+        logging.info(f"Refreshing breaks with fixtures updated after {since}...")
+        updated = Fixture.get_updated_since_condition(since)
+        Break.refresh_from_fixtures(updated)
+        BreaksTeamStats.refresh_teams(
+            Fixture.get_team_ids_statement(updated) if since is not None else None
         )
+        if watermark is not None:
+            RefreshWatermark.set_watermark(BREAKS_WATERMARK_NAME, watermark)
 
-    years = [
-        2020,
-        2021,
-        2022,
-        2023,
-        2024,
-    ]
-    for year in years:
-        year_count = (
-            df.loc[df["year"] == year]
-            .groupby("team_id")
-            .size()
-            .reset_index(name=f"c_{year}")
-        )
-        breaks_team_stats_df = breaks_team_stats_df.merge(
-            year_count, on="team_id", how="left"
-        )
 
-    # Add counts for specific day ranges within a month
-    beg_month = (
-        df.loc[df["day"] < 11].groupby("team_id").size().reset_index(name="beg_month")
-    )
-    mid_month = (
-        df.loc[(df["day"] > 11) & (df["day"] < 21)]
-        .groupby("team_id")
-        .size()
-        .reset_index(name="mid_month")
-    )
-    end_month = (
-        df.loc[df["day"] > 20].groupby("team_id").size().reset_index(name="end_month")
+def refresh_breaks_team_stats_shares() -> None:
+    """
+    Recompute breaks team stats shares from breaks team stats and swap in the new table.
+    """
+    BreaksTeamStatsShares.replace(
+        calculate_breaks_team_stats_shares_from_agg(BreaksTeamStats.get_all())
     )
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        beg_month, on="team_id", how="left"
-    )
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        mid_month, on="team_id", how="left"
-    )
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        end_month, on="team_id", how="left"
-    )
-
-    for round_num in range(1, 61):
-        round_count = (
-            df.loc[df["round"] == str(round_num)]
-            .groupby("team_id")
-            .size()
-            .reset_index(name=f"round_{round_num}")
-        )
-        breaks_team_stats_df = breaks_team_stats_df.merge(
-            round_count, on="team_id", how="left"
-        )
-
-    # Add grouped round counts
-    rounds_1_13 = (
-        df.loc[df["round"].isin([str(i) for i in range(1, 14)])]
-        .groupby("team_id")
-        .size()
-        .reset_index(name="rounds_1_13")
-    )
-    rounds_14_26 = (
-        df.loc[df["round"].isin([str(i) for i in range(14, 27)])]
-        .groupby("team_id")
-        .size()
-        .reset_index(name="rounds_14_26")
-    )
-    rounds_27_39 = (
-        df.loc[df["round"].isin([str(i) for i in range(27, 40)])]
-        .groupby("team_id")
-        .size()
-        .reset_index(name="rounds_27_39")
-    )
-    rounds_40_60 = (
-        df.loc[df["round"].isin([str(i) for i in range(40, 61)])]
-        .groupby("team_id")
-        .size()
-        .reset_index(name="rounds_40_60")
-    )
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        rounds_1_13, on="team_id", how="left"
-    )
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        rounds_14_26, on="team_id", how="left"
-    )
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        rounds_27_39, on="team_id", how="left"
-    )
-    breaks_team_stats_df = breaks_team_stats_df.merge(
-        rounds_40_60, on="team_id", how="left"
-    )
-
-    # Convert all columns except 'team_id' and 'team_name' to integers
-    for col in breaks_team_stats_df.columns:
-        if col not in ["team_id", "team_name", "last_break"]:
-            breaks_team_stats_df[col] = breaks_team_stats_df[col].fillna(0).astype(int)
-
-    return breaks_team_stats_df
 
 
 def calculate_breaks_team_stats_shares_from_agg(df: pd.DataFrame) -> pd.DataFrame:
@@ -164,7 +62,7 @@ def calculate_breaks_team_stats_shares_from_agg(df: pd.DataFrame) -> pd.DataFram
 
     for column in df.columns:
         if (
-            column not in ["team_id", "team_name", "last_break", "total"]
+            column not in ["team_id", "team_name", "last_break", "total", "update_date"]
             and "round_" not in column
         ):
             columns_to_calculate.append(column)
@@ -16,7 +16,7 @@ from config.entity_names import (
 from data_processing.data_processing import load_all_files_from_data_directory
 from data_processing.data_transformations import adjust_date_range_overlaps
 
-from helpers.utils import get_df_from_json, utf8_to_ascii
+from helpers.utils import get_df_from_json, get_json_file_stem, utf8_to_ascii
 import warnings
 
 warnings.simplefilter(action="ignore", category=FutureWarning)
@@ -58,7 +58,7 @@ def parse_teams() -> pd.DataFrame:
     from models.data_warehouse.main import Country, Team
 
     logging.info("** Parsing teams data **")
-    country_df = Country.get_df_from_table()
+    country_df = Country.get_df_from_table(columns=["country_id", "country_name"])
     df = load_all_files_from_data_directory(TEAMS_DIR)
     df.rename(
         columns={
@@ -132,7 +132,7 @@ def parse_fixtures_file(file_name: str) -> pd.DataFrame:
     from models.data_warehouse.main import Referee
     from models.data_warehouse.fixtures import Fixture
 
-    raw_df = get_df_from_json(file_name[:-5], sub_dir=FIXTURES_DIR)
+    raw_df = get_df_from_json(get_json_file_stem(file_name), sub_dir=FIXTURES_DIR)
 
     # TODO: check for duplicates; if Yes -> take status FT/AET/PEN
     # TODO: for now try without status = 'PST'
@@ -290,7 +290,7 @@ def parse_coaches() -> pd.DataFrame:
 
 
 def parse_fixture_events_file(file_name: str) -> pd.DataFrame:
-    raw_df = get_df_from_json(file_name[:-5], sub_dir="fixture_events")
+    raw_df = get_df_from_json(get_json_file_stem(file_name), sub_dir="fixture_events")
     final_df = raw_df.rename(
         columns={
             "time.elapsed": "elapsed_time",
@@ -321,7 +321,7 @@ def parse_fixture_events_file(file_name: str) -> pd.DataFrame:
 
 
 def parse_fixture_stats_file(file_name: str) -> pd.DataFrame:
-    raw_df = get_df_from_json(file_name[:-5], sub_dir=FIXTURE_STATS_DIR)
+    raw_df = get_df_from_json(get_json_file_stem(file_name), sub_dir=FIXTURE_STATS_DIR)
     # raw_df["side"] = ["home", "away"]
     # Transform from {"key": "Shots On Goal", "value": 5} to {"Shots On Goal": 10}
     raw_df["statistics"] = raw_df["statistics"].apply(
@@ -334,7 +334,9 @@ def parse_fixture_stats_file(file_name: str) -> pd.DataFrame:
 
 
 def parse_fixture_player_stats_file(file_name: str) -> pd.DataFrame:
-    raw_df = get_df_from_json(file_name[:-5], sub_dir=FIXTURE_PLAYER_STATS_DIR)
+    raw_df = get_df_from_json(
+        get_json_file_stem(file_name), sub_dir=FIXTURE_PLAYER_STATS_DIR
+    )
     # raw_df["side"] = ["home", "away"]
     # Transform statistics to key:value pairs
     raw_df["players"] = raw_df["players"].apply(
@@ -6,12 +6,16 @@ from pathlib import Path
 from typing import List
 
 from config.vars import DATA_DIR, ROOT_DIR
-from helpers.utils import get_df_from_json
+from helpers.utils import JSON_EXTENSIONS, get_df_from_json, get_json_file_stem
 
 
 def load_json_file_names_from_directory(sub_dir: str) -> List[str]:
     """Load file names from a data directory."""
-    return [p.name for p in Path(f"{DATA_DIR}/{sub_dir}").glob("*.json")]
+    return [
+        p.name
+        for p in Path(f"{DATA_DIR}/{sub_dir}").glob("*.json*")
+        if p.name.endswith(JSON_EXTENSIONS)
+    ]
 
 
 def load_all_files_from_data_directory(sub_dir: str) -> pd.DataFrame:
@@ -36,10 +40,12 @@ def load_all_files_from_data_directory(sub_dir: str) -> pd.DataFrame:
             if not files:
                 raise Exception(f"No files in {DATA_DIR}/{sub_dir}")
             for file_name in files:
-                if file_name.endswith(".json"):
+                if file_name.endswith(JSON_EXTENSIONS):
                     file_path = os.path.join(root, file_name)
                     try:
-                        df = get_df_from_json(file_name[:-5], sub_dir=sub_dir)
+                        df = get_df_from_json(
+                            get_json_file_stem(file_name), sub_dir=sub_dir
+                        )
                         if not df.empty:
                             list_of_dfs.append(df)
                         else:
@@ -77,8 +83,9 @@ def load_all_files_paths_from_data_directory(sub_dir: str) -> List[Path]:
     if not target_dir.exists():
         raise FileNotFoundError(f"The directory {target_dir} does not exist.")
 
-    for file in target_dir.glob("*.json"):
-        file_paths.append(file)
+    for file in target_dir.iterdir():
+        if file.name.endswith(JSON_EXTENSIONS):
+            file_paths.append(file)
 
     if not file_paths:
         raise Exception(f"No JSON files found in {DATA_DIR}/{sub_dir}")
@@ -1,7 +1,7 @@
 import logging
 from multiprocessing import Pool
 import pandas as pd
-from typing import Callable, List
+from typing import Callable, Iterator, List
 
 logging.basicConfig(level=logging.INFO)
 
@@ -47,10 +47,20 @@ class JsonProcessor:
 
     def process_files(self, file_paths: List[str]) -> pd.DataFrame:
         """Process all files in parallel batches and return the combined DataFrame."""
+        results = list(self.iter_files(file_paths))
+        return pd.concat(results) if results else pd.DataFrame()
+
+    def iter_files(self, file_paths: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Process files in parallel batches and yield each batch DataFrame as soon as it is parsed.
+
+        Combined with `BaseMixin.upsert`, which accepts an iterator of DataFrames, files can be
+        loaded without holding all parsed rows in memory at once.
+        """
         total_files = len(file_paths)
         if total_files == 0:
             logging.warning("No files provided to process")
-            return pd.DataFrame()
+            return
         logging.info(
             f"Processing {total_files} files with {self.num_processes} processes, batch_size={self.batch_size}"
         )
@@ -59,6 +69,5 @@ class JsonProcessor:
             for i in range(0, total_files, self.batch_size)
         ]
         with Pool(processes=self.num_processes) as pool:
-            results = pool.map(self.process_batch, batches)
+            yield from pool.imap(self.process_batch, batches)
         logging.info("Completed processing all files")
-        return pd.concat(results) if results else pd.DataFrame()
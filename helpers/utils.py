@@ -1,5 +1,6 @@
 import boto3
 import csv
+import gzip
 import json
 import logging
 import os
@@ -10,7 +11,7 @@ import unicodedata
 import pandas as pd
 
 from datetime import datetime
-from typing import List, Union
+from typing import IO, List, Union
 
 from config.entity_names import (
     FIXTURE_STATS_DIR,
@@ -19,6 +20,9 @@ from config.entity_names import (
 )
 from config.vars import DATA_DIR, ROOT_DIR
 
+# Extensions of stored API responses, plain or gzip-compressed
+JSON_EXTENSIONS = (".json", ".json.gz")
+
 
 def package_and_upload(local_dir: str, s3_bucket: str, prefix: str) -> None:
     """
@@ -42,12 +46,28 @@ def package_and_upload(local_dir: str, s3_bucket: str, prefix: str) -> None:
     logging.info("Package and upload completed.")
 
 
+def get_json_file_stem(file_name: str) -> str:
+    """Return file name without its ".json" or ".json.gz" extension."""
+    for extension in sorted(JSON_EXTENSIONS, key=len, reverse=True):
+        if file_name.endswith(extension):
+            return file_name[: -len(extension)]
+    return file_name
+
+
+def open_json_file(file_path: str) -> IO[bytes]:
+    """Open a stored JSON file for binary reading, decompressing ".json.gz" files."""
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rb")
+    return open(file_path, "rb")
+
+
 def get_df_from_json(filename: str, sub_dir: str) -> pd.DataFrame:
     """
     Read JSON data from a file and convert it to a pandas DataFrame.
 
     Args:
-        filename (str): The name of the JSON file (without the ".json" extension).
+        filename (str): The name of the JSON file (without the ".json" or ".json.gz"
+            extension).
         sub_dir (str, optional): The subdirectory within SOURCE_DIR where the file is located. Default is "".
 
     Returns:
@@ -57,8 +77,11 @@ def get_df_from_json(filename: str, sub_dir: str) -> pd.DataFrame:
         FileNotFoundError: If the specified JSON file is not found.
         JSONDecodeError: If the JSON data cannot be decoded.
     """
+    file_path = f"{ROOT_DIR}/{DATA_DIR}/{sub_dir}/{filename}.json"
+    if not os.path.exists(file_path):
+        file_path = f"{file_path}.gz"
     try:
-        with open(f"{ROOT_DIR}/{DATA_DIR}/{sub_dir}/{filename}.json", "r") as file:
+        with open_json_file(file_path) as file:
             json_data = json.load(file)
             df = pd.json_normalize(json_data["response"])
             # Take 'fixture_id' from response parameters
@@ -100,7 +123,9 @@ def append_data_to_csv(data: Union[str, List[str]], file_path: str) -> None:
 
 def move_json_files_between_directories(source_dir: str, target_dir: str) -> None:
     # List only JSON files in the source directory
-    files_to_move = [file for file in os.listdir(source_dir) if file.endswith(".json")]
+    files_to_move = [
+        file for file in os.listdir(source_dir) if file.endswith(JSON_EXTENSIONS)
+    ]
 
     # Create the child directory if it doesn't exist
     if not os.path.exists(target_dir):
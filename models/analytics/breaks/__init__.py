@@ -3,6 +3,7 @@ from models.analytics.breaks.breaks_team_stats import BreaksTeamStats
 from models.analytics.breaks.breaks_team_stats_share import BreaksTeamStatsShares
 from models.analytics.breaks.breaks_with_factors import BreaksWithFactors
 from models.analytics.breaks.pairs import Pair
+from models.analytics.breaks.refresh_watermarks import RefreshWatermark
 
 __all__ = [
     "Break",
@@ -10,4 +11,5 @@ __all__ = [
     "BreaksTeamStatsShares",
     "BreaksWithFactors",
     "Pair",
+    "RefreshWatermark",
 ]
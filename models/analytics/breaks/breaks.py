@@ -1,8 +1,20 @@
 import logging
-import pandas as pd
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    delete,
+    false,
+    func,
+    literal,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import ColumnElement, Select
 
 from config.entity_names import ANALYTICS_BREAKS_SCHEMA_NAME
 from models.data_warehouse.fixtures import Fixture
@@ -33,72 +45,87 @@ class Break(Fixture):
     goals_away_ht = Column(Integer)
 
     @classmethod
-    def get_breaks_team_stats_raw(cls) -> pd.DataFrame:
-        with cls.db.get_session() as session:
-            try:
-                breaks_df = pd.read_sql_query(
-                    session.query(Break).statement,
-                    cls.db.engine,
-                )
+    def refresh_from_fixtures(cls, updated: ColumnElement) -> tuple[int, int]:
+        """
+        Recompute breaks of fixtures matching `updated` inside the database. Those that are
+        breaks are inserted or updated, the other ones are removed.
 
-                # Filter rows where the date is greater than or equal to '2020-01-01'
-                filtered_breaks_df = breaks_df[breaks_df["date"] >= "2020-01-01"]
+        Args:
+            updated (ColumnElement): Condition of changed fixtures, e.g.
+                `Fixture.get_updated_since_condition(watermark)`.
 
-                # Create the 'home' DataFrame
-                home_df = filtered_breaks_df[
-                    [
-                        "league_id",
-                        "home_team_id",
-                        "home_team_name",
-                        "season_year",
-                        "season_stage",
-                        "round",
-                        "referee",
-                        "date",
-                        "goals_home",
-                        "goals_away",
-                    ]
-                ].copy()
-                home_df["side"] = "home"
-                home_df["winner"] = home_df["goals_home"] > home_df["goals_away"]
-                home_df["year"] = home_df["date"].dt.year
-                home_df["month"] = home_df["date"].dt.month
-                home_df["day"] = home_df["date"].dt.day
-                home_df.rename(
-                    columns={"home_team_id": "team_id", "home_team_name": "team_name"},
-                    inplace=True,
+        Returns:
+            tuple[int, int]: Numbers of upserted and removed breaks.
+        """
+        cls.ensure_table()
+        fixtures = Fixture.__table__
+        is_break = Fixture.get_breaks_condition()
+        columns = [column.name for column in cls.__table__.columns]
+        upsert = insert(cls.__table__).from_select(
+            columns,
+            select(*[fixtures.c[column] for column in columns]).where(
+                updated & is_break
+            ),
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=cls.get_primary_keys(),
+            set_={
+                column: upsert.excluded[column]
+                for column in columns
+                if column not in cls.get_primary_keys()
+            },
+        )
+        # Games without a result yet have NULL condition
+        removal = delete(cls.__table__).where(
+            cls.__table__.c.fixture_id.in_(
+                select(fixtures.c.fixture_id).where(
+                    updated & ~func.coalesce(is_break, false())
                 )
-                home_df.drop(columns=["goals_home", "goals_away"], inplace=True)
+            )
+        )
+        with cls.db.transaction() as session:
+            upserted = session.execute(upsert).rowcount
+            removed = session.execute(removal).rowcount
+            cls.invalidate_cached_queries()
+        logging.info(
+            f"{cls.__name__} refreshed: {upserted} upserted, {removed} removed"
+        )
+        return upserted, removed
 
-                # Create the 'away' DataFrame
-                away_df = filtered_breaks_df[
-                    [
-                        "league_id",
-                        "away_team_id",
-                        "away_team_name",
-                        "season_year",
-                        "season_stage",
-                        "round",
-                        "referee",
-                        "date",
-                        "goals_home",
-                        "goals_away",
-                    ]
-                ].copy()
-                away_df["winner"] = away_df["goals_home"] < away_df["goals_away"]
-                away_df["side"] = "away"
-                away_df["year"] = away_df["date"].dt.year
-                away_df["month"] = away_df["date"].dt.month
-                away_df["day"] = away_df["date"].dt.day
-                away_df.rename(
-                    columns={"away_team_id": "team_id", "away_team_name": "team_name"},
-                    inplace=True,
-                )
-                away_df.drop(columns=["goals_home", "goals_away"], inplace=True)
+    @classmethod
+    def get_team_sides_statement(cls, team_ids: Select | None = None) -> Select:
+        """
+        Build a SELECT of breaks from the perspective of each team, one row per side, with
+        the team, whether it won, and the date and round of the break.
 
-                # Concatenate home_df and away_df
-                result_df = pd.concat([home_df, away_df], ignore_index=True)
-            except OperationalError as e:
-                logging.error(f"OperationalError occurred: {str(e)}")
-                raise  # This raises the original error
-        return result_df
+        Args:
+            team_ids (Select | None): Teams to include. Defaults to all teams.
+        """
+        table = cls.__table__
+        sides = []
+        for side, team_id, team_name, winner in (
+            (
+                "home",
+                table.c.home_team_id,
+                table.c.home_team_name,
+                table.c.goals_home > table.c.goals_away,
+            ),
+            (
+                "away",
+                table.c.away_team_id,
+                table.c.away_team_name,
+                table.c.goals_home < table.c.goals_away,
+            ),
+        ):
+            statement = select(
+                team_id.label("team_id"),
+                team_name.label("team_name"),
+                literal(side).label("side"),
+                winner.label("winner"),
+                table.c.date,
+                table.c.round,
+            ).where(table.c.date >= "2020-01-01")
+            if team_ids is not None:
+                statement = statement.where(team_id.in_(team_ids))
+            sides.append(statement)
+        return union_all(*sides)
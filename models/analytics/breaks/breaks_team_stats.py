@@ -1,9 +1,43 @@
-import pandas as pd
-from sqlalchemy import Column, Integer, String, Date, DateTime, asc
+import logging
+import re
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Date,
+    DateTime,
+    asc,
+    cast,
+    delete,
+    extract,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.sql import Select
 
 from config.entity_names import ANALYTICS_BREAKS_SCHEMA_NAME
+from models.analytics.breaks.breaks import Break
 from models.base import Base
+from services.query_cache import cached_query
+
+MONTH_COLUMNS = (
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "may",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "oct",
+    "nov",
+    "dec",
+)
 
 
 class BreaksTeamStats(Base):
@@ -106,15 +140,104 @@ class BreaksTeamStats(Base):
     update_date = Column(DateTime)
 
     @classmethod
+    @cached_query
     def get_all(cls):
         with cls.db.get_session() as session:
             try:
-                breaks_team_stats_df = pd.read_sql_query(
+                breaks_team_stats_df = cls.db.read_df(
                     session.query(cls).order_by(asc(cls.team_id)).statement,
-                    cls.db.engine,
                 )
             except InvalidRequestError as e:
                 raise InvalidRequestError(
                     f"Error while reading {cls.__name__} data: {e}"
                 )
         return breaks_team_stats_df
+
+    @classmethod
+    def get_aggregate_statement(cls, team_ids: Select | None = None) -> Select:
+        """
+        Build a SELECT computing stats of teams from breaks inside the database, from
+        their sides of `Break.get_team_sides_statement`. Columns are in table order.
+
+        Args:
+            team_ids (Select | None): Teams to compute. Defaults to all teams with breaks.
+        """
+        sides = Break.get_team_sides_statement(team_ids).subquery()
+        day = extract("day", sides.c.date)
+
+        def count_where(condition):
+            return func.count().filter(condition)
+
+        columns = []
+        for column in cls.__table__.columns:
+            name = column.name
+            if name == "team_id":
+                value = sides.c.team_id
+            elif name == "team_name":
+                # Name used in the latest break
+                value = array_agg(
+                    aggregate_order_by(sides.c.team_name, sides.c.date.desc())
+                )[1]
+            elif name == "last_break":
+                value = cast(func.max(sides.c.date), Date)
+            elif name == "total":
+                value = func.count()
+            elif name in ("home", "away"):
+                value = count_where(sides.c.side == name)
+            elif name == "won":
+                value = count_where(sides.c.winner)
+            elif name == "lost":
+                value = count_where(~sides.c.winner)
+            elif name in MONTH_COLUMNS:
+                month = MONTH_COLUMNS.index(name) + 1
+                value = count_where(extract("month", sides.c.date) == month)
+            elif name.isdigit():
+                value = count_where(extract("year", sides.c.date) == int(name))
+            elif name == "beg_month":
+                value = count_where(day < 11)
+            elif name == "mid_month":
+                value = count_where((day > 11) & (day < 21))
+            elif name == "end_month":
+                value = count_where(day > 20)
+            elif match := re.fullmatch(r"round_(\d+)", name):
+                value = count_where(sides.c.round == match[1])
+            elif match := re.fullmatch(r"rounds_(\d+)-(\d+)", name):
+                first, last = int(match[1]), int(match[2])
+                value = count_where(
+                    sides.c.round.in_([str(i) for i in range(first, last + 1)])
+                )
+            elif name == "update_date":
+                value = func.now()
+            else:
+                raise ValueError(f"No aggregate defined for {cls.__name__}.{name}")
+            columns.append(value.label(name))
+        return select(*columns).group_by(sides.c.team_id)
+
+    @classmethod
+    def refresh_teams(cls, team_ids: Select | None = None) -> int:
+        """
+        Recompute stats of given teams from breaks inside the database. Teams left without
+        breaks are removed. A refresh of all teams replaces the table with a new one built
+        aside, see `BaseMixin.replace_from_select`.
+
+        Args:
+            team_ids (Select | None): Teams to refresh. Defaults to all teams.
+
+        Returns:
+            int: Number of refreshed teams.
+        """
+        if team_ids is None:
+            return cls.replace_from_select(cls.get_aggregate_statement())
+
+        cls.ensure_table()
+        removal = delete(cls.__table__).where(cls.__table__.c.team_id.in_(team_ids))
+        refresh = insert(cls.__table__).from_select(
+            [column.name for column in cls.__table__.columns],
+            cls.get_aggregate_statement(team_ids),
+        )
+        with cls.db.transaction() as session:
+            session.execute(removal)
+            refreshed = session.execute(refresh).rowcount
+            cls.invalidate_cached_queries()
+        logging.info(f"{cls.__name__} refreshed for {refreshed} teams")
+        return refreshed
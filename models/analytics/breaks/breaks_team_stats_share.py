@@ -60,11 +60,10 @@ class BreaksTeamStatsShares(Base):
         referee: str,
     ) -> pd.DataFrame:
         with cls.db.get_session() as session:
-            team_shares = pd.read_sql_query(
+            team_shares = cls.db.read_df(
                 session.query(cls)
                 .filter(or_(cls.team_id == home_team_id, cls.team_id == away_team_id))
                 .statement,
-                cls.db.engine,
             )
 
         def calculate_home_away_factor(team_id: int) -> Decimal:
@@ -204,11 +203,11 @@ class BreaksTeamStatsShares(Base):
         with cls.db.get_session() as session:
             try:
                 # TODO: original value = breaks_df (not current_year_fixtures_df)
-                current_year_fixtures_df = pd.read_sql_query(
+                current_year_fixtures_df = cls.db.read_df(
                     session.query(Fixture)
                     .filter(Fixture.date > "2024-01-01")
+                    .filter(Fixture.get_seasons_since_condition("2024-01-01"))
                     .statement,
-                    cls.db.engine,
                 )
                 for idx, single_break in current_year_fixtures_df.iterrows():
                     break_with_factors_df = cls.get_breaks_teams_points_for_fixture(
@@ -224,9 +223,8 @@ class BreaksTeamStatsShares(Base):
                 combined_df = pd.concat(list_of_dfs, ignore_index=True)
 
                 # Get total breaks data for each team
-                total_breaks_per_team_df = pd.read_sql_query(
+                total_breaks_per_team_df = cls.db.read_df(
                     session.query(cls.team_id, cls.total).statement,
-                    cls.db.engine,
                 )
 
                 fixtures_with_total_home_breaks_df = current_year_fixtures_df.merge(
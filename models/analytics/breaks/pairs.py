@@ -1,7 +1,7 @@
 import logging
+from itertools import product
 
 import pandas as pd
-from numpy import product
 from sqlalchemy import Column, Integer, String, Date, Sequence
 
 from config.entity_names import ANALYTICS_BREAKS_SCHEMA_NAME
@@ -35,6 +35,7 @@ class Pair(Base):
             unique_team_ids_df, teams_df, how="left", on="team_id"
         )
 
+        pair_dfs = []
         # Iterate over the unique 'team_id's
         for i, first_team_row in unique_teams_df.iterrows():
             logging.info(
@@ -159,4 +160,10 @@ class Pair(Base):
                             index=[0],
                         )
 
-                        Pair.upsert(pair_df)
+                        pair_dfs.append(pair_df)
+
+        if not pair_dfs:
+            logging.warning("No pairs found, keeping existing pairs.")
+            return
+        # Pairs are recomputed from scratch and swapped in at once
+        Pair.replace(pd.concat(pair_dfs, ignore_index=True))
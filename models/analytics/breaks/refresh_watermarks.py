@@ -0,0 +1,28 @@
+import datetime as dt
+
+import pandas as pd
+from sqlalchemy import Column, DateTime, String, func, select
+
+from config.entity_names import ANALYTICS_BREAKS_SCHEMA_NAME
+from models.base import Base
+
+
+class RefreshWatermark(Base):
+    """Source `update_date` up to which an incrementally refreshed table is current."""
+
+    __tablename__ = "refresh_watermarks"
+    __table_args__ = {"schema": ANALYTICS_BREAKS_SCHEMA_NAME}
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime, nullable=False)
+    update_date = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    @classmethod
+    def get_watermark(cls, name: str) -> dt.datetime | None:
+        """Return the watermark of the named refresh, or None before its first run."""
+        cls.ensure_table()
+        return cls.get_scalar(select(cls.watermark).where(cls.name == name))
+
+    @classmethod
+    def set_watermark(cls, name: str, watermark: dt.datetime) -> None:
+        cls.upsert(pd.DataFrame([{"name": name, "watermark": watermark}]))
@@ -1,9 +1,74 @@
+import io
+import json
 import logging
+import re
+import threading
 import pandas as pd
 
-from typing import Any, ClassVar
-from sqlalchemy import or_, and_, inspect, Table, PrimaryKeyConstraint
-from sqlalchemy.orm import Mapper, declarative_base
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, ClassVar, Iterable, Iterator
+from sqlalchemy import (
+    and_,
+    bindparam,
+    cast,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    select,
+    table,
+    tuple_,
+    BigInteger,
+    Column,
+    Identity,
+    Table,
+    PrimaryKeyConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import ColumnElement, Delete, Select
+from sqlalchemy.orm import Mapper, Session, declarative_base
+from sqlalchemy.types import JSON, Date, DateTime, Float, Integer, Numeric, String
+
+from config.vars import CHANGE_LOG_RETENTION_DAYS, UPSERT_CHUNK_SIZE
+from services.copy_reader import render_statement
+from services.query_cache import cached_query, query_cache
+from services.schema_cache import schema_cache
+
+COPY_NULL_MARKER = "\\N"
+KEY_LOOKUP_CHUNK_SIZE = 1000
+
+# Guards lazy definition of change-log tables by concurrent upserts
+_change_log_lock = threading.Lock()
+
+
+@dataclass
+class UpsertResult:
+    """Number of rows inserted, updated and skipped as unchanged by an upsert."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other: "UpsertResult") -> "UpsertResult":
+        return UpsertResult(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+        )
+
+
+def iter_chunks(
+    data: pd.DataFrame | Iterable[pd.DataFrame], chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Yield consecutive slices of at most `chunk_size` rows from a frame or frames."""
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    for frame in frames:
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start : start + chunk_size]
 
 
 class BaseMixin:
@@ -15,6 +80,22 @@ class BaseMixin:
     ) = None
     __tablename__: str = ""
     db: ClassVar[Any] = None  # Dynamic reference for Db
+    # "orm" (bulk insert/update mappings) or "copy" (PostgreSQL COPY + merge)
+    load_method: ClassVar[str] = "orm"
+    # Compare content fingerprints and write only new or changed rows
+    skip_unchanged: ClassVar[bool] = False
+    fingerprint_exclude_columns: ClassVar[tuple[str, ...]] = ("update_date",)
+    upsert_chunk_size: ClassVar[int] = UPSERT_CHUNK_SIZE
+    # Number of key-hash partitions of each chunk written concurrently on pooled connections
+    upsert_parallelism: ClassVar[int] = 1
+    # Width of range partitions in partition key values, for tables declared with
+    # `postgresql_partition_by: "RANGE (column)"`
+    partition_interval: ClassVar[int] = 1
+    # Append keys of inserted and updated rows to the `<table>_changes` change log,
+    # readable with `get_changes_since`. Enable it for models with a downstream reader.
+    track_changes: ClassVar[bool] = False
+    # Days changes stay in the change log, pruned after each upsert
+    change_log_retention_days: ClassVar[int] = CHANGE_LOG_RETENTION_DAYS
 
     @classmethod
     def set_db(cls, db_instance: Any) -> None:
@@ -27,197 +108,1169 @@ class BaseMixin:
         return []
 
     @classmethod
-    def get_df_from_table(cls) -> pd.DataFrame:
+    def get_bind(cls) -> Connection | Engine:
+        """
+        Return connection of the unit of work open in the current thread, so reads see its
+        uncommitted writes, or the primary engine when there is none. Used for writes and
+        for reads they depend on, like existing keys of upserted rows.
         """
-        Retrieve all data from the database table associated with the class as a DataFrame.
+        session = cls.db.current_transaction
+        return session.connection() if session is not None else cls.db.engine
+
+    @classmethod
+    def get_read_bind(cls) -> Connection | Engine:
+        """
+        Return connection of the unit of work open in the current thread, or the engine
+        reads are routed to, which may be a read replica.
+        """
+        session = cls.db.current_transaction
+        return session.connection() if session is not None else cls.db.read_engine
+
+    @classmethod
+    def get_scalar(cls, statement: Select) -> Any:
+        """
+        Execute statement on the unit of work's connection or the engine and return the
+        first column of its first row.
+        """
+        bind = cls.get_bind()
+        if isinstance(bind, Engine):
+            with bind.connect() as connection:
+                return connection.execute(statement).scalar()
+        return bind.execute(statement).scalar()
+
+    @classmethod
+    def get_table_select(
+        cls, columns: list[str] | None = None, where: ColumnElement | None = None
+    ) -> Select:
+        """
+        Build a SELECT of the given table columns (all by default) filtered by `where`.
+        """
+        statement = select(
+            *(
+                [cls.__table__.c[column] for column in columns]
+                if columns
+                else [cls.__table__]
+            )
+        )
+        if where is not None:
+            statement = statement.where(where)
+        return statement
+
+    @classmethod
+    @cached_query
+    def get_df_from_table(
+        cls, columns: list[str] | None = None, where: ColumnElement | None = None
+    ) -> pd.DataFrame:
+        """
+        Retrieve data from the database table associated with the class as a DataFrame.
+
+        Args:
+            columns (list[str] | None): Table columns to read. Defaults to all columns.
+            where (ColumnElement | None): Filter expression, e.g. `Team.team_id.in_(ids)`.
 
         Returns:
-            pd.DataFrame: A DataFrame containing all the data from the database table.
+            pd.DataFrame: A DataFrame containing the selected data from the database table.
 
         Raises:
             Exception: If there's any error during the database query or processing.
         """
         if not cls.db:
             raise RuntimeError("Database instance not set for BaseMixin.")
-        with cls.db.get_session() as session:
-            try:
-                df = pd.read_sql_query(session.query(cls).statement, cls.db.engine)
-                # Replace None and NaN values with a placeholder value to avoid None/NaN values in
-                df.fillna(pd.NA, inplace=True)
-            except Exception as e:
-                logging.error(f"Error while getting {cls.__name__} data: {str(e)}")
-                raise Exception
-            return df
+        try:
+            df = cls.db.read_df(
+                cls.get_table_select(columns, where), cls.get_read_bind()
+            )
+            # Replace None and NaN values with a placeholder value to avoid None/NaN values in
+            df.fillna(pd.NA, inplace=True)
+        except Exception as e:
+            logging.error(f"Error while getting {cls.__name__} data: {str(e)}")
+            raise Exception
+        return df
 
     @classmethod
-    def upsert(cls, df: pd.DataFrame) -> None:
+    def upsert(
+        cls,
+        data: pd.DataFrame | Iterable[pd.DataFrame],
+        load_method: str | None = None,
+        chunk_size: int | None = None,
+        parallelism: int | None = None,
+    ) -> UpsertResult:
         """
         Class method performing bulk upsert of provided DataFrame.
+
+        Input is processed in chunks of fixed size, each loaded in its own transaction, so
+        peak memory depends on the chunk size rather than on the input size. For range
+        partitioned tables missing partitions of each chunk are created before it is
+        loaded, and PostgreSQL routes its rows to them. Inside
+        `db.transaction()` all chunks join that unit of work instead: nothing is committed
+        until it ends, errors are raised rather than logged, and chunks are written
+        sequentially on its connection.
+
+        Args:
+            data (pd.DataFrame | Iterable[pd.DataFrame]): Rows to insert or update. An
+                iterator of frames is consumed lazily.
+            load_method (str | None): "orm" or "copy". Defaults to the model's `load_method`.
+                "copy" falls back to "orm" when the database is not PostgreSQL.
+            chunk_size (int | None): Rows per chunk. Defaults to the model's
+                `upsert_chunk_size`.
+            parallelism (int | None): Number of primary-key hash partitions each chunk is
+                split into and written concurrently, each in its own transaction on its own
+                pooled connection. Defaults to the model's `upsert_parallelism`.
+
+        Returns:
+            UpsertResult: Counts of inserted, updated and unchanged rows. Rows are reported as
+                unchanged only for models with `skip_unchanged` enabled.
+        """
+        cls.ensure_table()
+
+        load_method = load_method or cls.load_method
+        if load_method == "copy" and cls.db.engine.dialect.name != "postgresql":
+            logging.warning(
+                f"COPY load is not supported by '{cls.db.engine.dialect.name}' dialect. "
+                f"Falling back to ORM upsert for {cls.__name__}."
+            )
+            load_method = "orm"
+
+        load_chunk = cls.copy_upsert if load_method == "copy" else cls.orm_upsert
+        parallelism = max(parallelism or cls.upsert_parallelism, 1)
+        if cls.db.current_transaction is not None:
+            # A unit of work owns a single connection, partitions cannot share it concurrently
+            parallelism = 1
+        chunks = iter_chunks(data, chunk_size or cls.upsert_chunk_size)
+
+        result = UpsertResult()
+        try:
+            if parallelism == 1:
+                for chunk in chunks:
+                    cls.ensure_partitions(chunk)
+                    result += load_chunk(cls.sort_by_primary_keys(chunk))
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=parallelism,
+                    thread_name_prefix=f"upsert-{cls.__name__}",
+                ) as executor:
+                    for chunk in chunks:
+                        cls.ensure_partitions(chunk)
+                        partitions = cls.partition_by_key_hash(chunk, parallelism)
+                        for partition_result in executor.map(load_chunk, partitions):
+                            result += partition_result
+            if cls.track_changes:
+                cls.prune_change_log()
+            return result
+        finally:
+            cls.invalidate_cached_queries()
+
+    @classmethod
+    def invalidate_cached_queries(cls) -> None:
+        """
+        Drop cached read results of the model's table and bump its cache version, so
+        other processes drop theirs too. Inside a unit of work the version is bumped in
+        its transaction, and results are dropped again once it commits, as reads made
+        meanwhile do not see its writes.
+        """
+        table = cls.__table__.fullname
+        query_cache.invalidate(table)
+        cls.ensure_cache_versions_table()
+        session = cls.db.current_transaction
+        if session is None:
+            with cls.db.engine.begin() as connection:
+                cls.bump_cache_version(connection)
+        else:
+            event.listen(
+                session,
+                "before_commit",
+                lambda session: cls.bump_cache_version(session.connection()),
+                once=True,
+            )
+            event.listen(
+                session,
+                "after_commit",
+                lambda _: query_cache.invalidate(table),
+                once=True,
+            )
+
+    @classmethod
+    def ensure_cache_versions_table(cls) -> None:
+        """Create the table of cache versions shared by all models if it does not exist."""
+        if schema_cache.has_table(cls.db.engine, cache_versions_table):
+            return
+        cache_versions_table.create(cls.db.engine, checkfirst=True)
+        schema_cache.add_table(cls.db.engine, cache_versions_table)
+
+    @classmethod
+    def get_cache_version(cls) -> int:
+        """
+        Return the version of the model's table, bumped by every committed write of any
+        process. It is read from the primary with a primary-key lookup, so cached reads
+        see writes of other processes, e.g. pipelines writing while exporters read.
+        """
+        cls.ensure_cache_versions_table()
+        with cls.db.engine.connect() as connection:
+            version = connection.execute(
+                select(cache_versions_table.c.version).where(
+                    cache_versions_table.c.table_name == cls.__table__.fullname
+                )
+            ).scalar()
+        return version or 0
+
+    @classmethod
+    def bump_cache_version(cls, connection: Connection) -> None:
+        """Increment the cache version of the model's table in the given transaction."""
+        statement = pg_insert(cache_versions_table).values(
+            table_name=cls.__table__.fullname, version=1
+        )
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[cache_versions_table.c.table_name],
+                set_={"version": cache_versions_table.c.version + 1},
+            )
+        )
+
+    @classmethod
+    def ensure_table(cls) -> None:
+        """
+        Create the model's table if it does not exist. Existence is answered by the
+        process-level schema cache, so the catalog is not queried on every write.
+        """
+        bind = cls.get_bind()
+        tables = [cls.__table__]
+        if cls.track_changes:
+            tables.append(cls.get_change_log_table())
+        for model_table in tables:
+            if schema_cache.has_table(bind, model_table):
+                continue
+            logging.info(f"Table {model_table.fullname} does not exist. Creating it...")
+            model_table.create(bind, checkfirst=True)
+            schema_cache.add_table(bind, model_table)
+            logging.info(f"Table {model_table.fullname} created successfully.")
+
+    @classmethod
+    def get_change_log_table(cls) -> Table:
+        """
+        Return the model's change-log table, `<table>_changes` in the same schema. Each
+        inserted or updated row is logged with its primary key, the operation and an
+        increasing `change_id`, which consumers keep as their offset.
+        """
+        schema = cls.__table__.schema
+        name = f"{cls.__tablename__}_changes"
+        with _change_log_lock:
+            change_log = cls.metadata.tables.get(f"{schema}.{name}" if schema else name)
+            if change_log is None:
+                change_log = Table(
+                    name,
+                    cls.metadata,
+                    Column("change_id", BigInteger, Identity(), primary_key=True),
+                    *[
+                        Column(column.name, column.type, nullable=False)
+                        for column in cls.__table__.primary_key.columns
+                    ],
+                    Column("operation", String, nullable=False),
+                    Column(
+                        "changed_at",
+                        DateTime,
+                        nullable=False,
+                        server_default=func.now(),
+                        index=True,
+                    ),
+                    schema=schema,
+                )
+            return change_log
+
+    @classmethod
+    def log_changes(cls, session: Session, df: pd.DataFrame, operation: str) -> None:
+        """
+        Append primary keys of rows written by the ORM upsert to the change log.
+
+        Args:
+            session (Session): Session of the upsert, so changes commit with the rows.
+            df (pd.DataFrame): Inserted or updated rows.
+            operation (str): "insert" or "update".
+        """
+        if df.empty:
+            return
+        primary_keys = cls.get_primary_keys()
+        key_df = cls._to_column_names(df)[primary_keys]
+        session.execute(
+            insert(cls.get_change_log_table()),
+            [
+                {**keys, "operation": operation}
+                for keys in key_df.to_dict(orient="records")
+            ],
+        )
+
+    @classmethod
+    def get_change_log_prune_statement(cls) -> Delete:
+        """Build a DELETE of changes older than `change_log_retention_days`."""
+        change_log = cls.get_change_log_table()
+        return delete(change_log).where(
+            change_log.c.changed_at
+            < func.now() - timedelta(days=cls.change_log_retention_days)
+        )
+
+    @classmethod
+    def prune_change_log(cls) -> int:
+        """
+        Remove changes older than `change_log_retention_days`, so the change log does not
+        grow with every upsert. Consumers must read the log more often than that.
+
+        Returns:
+            int: Number of removed changes.
+        """
+        with cls.db.transaction() as session:
+            removed = session.execute(cls.get_change_log_prune_statement()).rowcount
+        if removed:
+            logging.info(
+                f"Pruned {removed} changes of {cls.__name__} older than "
+                f"{cls.change_log_retention_days} days"
+            )
+        return removed
+
+    @classmethod
+    def get_changes_since(
+        cls, offset: int = 0, limit: int | None = None
+    ) -> pd.DataFrame:
+        """
+        Read changes logged after the given offset, oldest first.
+
+        Consumers store the `change_id` of the last change they processed and pass it as
+        the offset of their next read. A key changed several times appears once per change.
+
+        Args:
+            offset (int): Last `change_id` already processed, 0 to read from the start.
+            limit (int | None): Maximum number of changes to read.
+
+        Returns:
+            pd.DataFrame: `change_id`, primary key columns, `operation` and `changed_at`.
+        """
+        cls.ensure_table()
+        change_log = cls.get_change_log_table()
+        statement = (
+            select(change_log)
+            .where(change_log.c.change_id > offset)
+            .order_by(change_log.c.change_id)
+            .limit(limit)
+        )
+        return cls.db.read_df(statement, cls.get_bind())
+
+    @classmethod
+    def get_last_change_id(cls) -> int:
+        """Return the offset of the latest logged change, 0 when there is none."""
+        cls.ensure_table()
+        change_log = cls.get_change_log_table()
+        return cls.get_scalar(
+            select(func.coalesce(func.max(change_log.c.change_id), 0))
+        )
+
+    @classmethod
+    def get_changed_since_condition(cls, offset: int) -> ColumnElement:
+        """
+        Return condition matching rows changed after the given offset, e.g. to recompute
+        only affected fixtures inside the database.
+        """
+        change_log = cls.get_change_log_table()
+        primary_keys = cls.get_primary_keys()
+        return tuple_(*[cls.__table__.c[key] for key in primary_keys]).in_(
+            select(*[change_log.c[key] for key in primary_keys]).where(
+                change_log.c.change_id > offset
+            )
+        )
+
+    @classmethod
+    def get_partition_column(cls) -> str | None:
+        """Return the range partition key column of the model's table, if partitioned."""
+        partition_by = cls.__table__.dialect_options["postgresql"]["partition_by"]
+        match = re.fullmatch(r"RANGE\s*\((\w+)\)", partition_by or "", re.IGNORECASE)
+        return match.group(1) if match else None
+
+    @classmethod
+    def get_partition_bounds(cls, value: Any) -> tuple[Any, Any]:
+        """
+        Return the lower (inclusive) and upper (exclusive) bound of the range partition
+        holding given partition key value, e.g. ("2024", "2025") for season "2024".
+        """
+        lower = int(value) // cls.partition_interval * cls.partition_interval
+        upper = lower + cls.partition_interval
+        column = cls.__table__.c[cls.get_partition_column()]
+        if isinstance(column.type, String):
+            return str(lower), str(upper)
+        return lower, upper
+
+    @classmethod
+    def ensure_partitions(
+        cls, df: pd.DataFrame, bind: Connection | Engine | None = None
+    ) -> None:
+        """
+        Create range partitions missing for partition key values of provided DataFrame.
+
+        Partitions are named after their lower bound (e.g. `fixtures_p2024`). Existence is
+        answered by the process-level schema cache, so the catalog is not queried on every
+        write. Tables that are not partitioned are left untouched.
+
+        Args:
+            df (pd.DataFrame): Rows about to be loaded.
+            bind (Connection | Engine | None): Where partitions are created. Defaults to
+                the unit of work's connection or the engine.
+        """
+        partition_column = cls.get_partition_column()
+        if partition_column is None or partition_column not in df.columns:
+            return
+        bind = bind or cls.get_bind()
+        dialect = bind.dialect
+        preparer = dialect.identifier_preparer
+        column_type = cls.__table__.c[partition_column].type
+
+        bounds = {
+            cls.get_partition_bounds(value)
+            for value in df[partition_column].dropna().unique()
+        }
+        for lower, upper in sorted(bounds):
+            partition = table(
+                f"{cls.__tablename__}_p{lower}", schema=cls.__table__.schema
+            )
+            if schema_cache.has_table(bind, partition):
+                continue
+            lower_literal, upper_literal = (
+                literal(bound, column_type).compile(
+                    dialect=dialect, compile_kwargs={"literal_binds": True}
+                )
+                for bound in (lower, upper)
+            )
+            logging.info(f"Creating partition {partition.name} of {cls.__name__}...")
+            statement = (
+                f"CREATE TABLE IF NOT EXISTS {preparer.format_table(partition)} "
+                f"PARTITION OF {preparer.format_table(cls.__table__)} "
+                f"FOR VALUES FROM ({lower_literal}) TO ({upper_literal})"
+            )
+            if isinstance(bind, Engine):
+                with bind.begin() as connection:
+                    connection.exec_driver_sql(statement)
+            else:
+                bind.exec_driver_sql(statement)
+            schema_cache.add_table(bind, partition)
+
+    @classmethod
+    def sort_by_primary_keys(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Order rows by their typed primary key values.
+
+        Writers that lock rows in the same key order cannot wait on each other in a cycle.
+
+        Args:
+            df (pd.DataFrame): Rows to order.
+
+        Returns:
+            pd.DataFrame: The rows in ascending primary key order.
+        """
+        primary_keys = cls.get_primary_keys()
+        if df.empty or not set(primary_keys).issubset(df.columns):
+            return df
+        typed_keys = cls._cast_to_column_types(df, primary_keys).reset_index(drop=True)
+        order = typed_keys.sort_values(primary_keys, kind="stable").index
+        return df.iloc[order]
+
+    @classmethod
+    def partition_by_key_hash(
+        cls, df: pd.DataFrame, partitions: int
+    ) -> list[pd.DataFrame]:
+        """
+        Split rows into disjoint partitions by a hash of their typed primary key.
+
+        The same key always lands in the same partition, so concurrent writers never touch
+        the same row, and each partition is sorted by primary key.
+
+        Args:
+            df (pd.DataFrame): Rows to partition.
+            partitions (int): Number of partitions.
+
+        Returns:
+            list[pd.DataFrame]: Non-empty partitions in ascending primary key order.
+        """
+        primary_keys = cls.get_primary_keys()
+        df = cls.sort_by_primary_keys(df)
+        if partitions <= 1 or not set(primary_keys).issubset(df.columns):
+            return [df]
+        key_hashes = pd.util.hash_pandas_object(
+            cls._cast_to_column_types(df, primary_keys), index=False
+        ).to_numpy()
+        buckets = key_hashes % partitions
+        return [
+            df[buckets == bucket]
+            for bucket in range(partitions)
+            if (buckets == bucket).any()
+        ]
+
+    @classmethod
+    def orm_upsert(cls, df: pd.DataFrame) -> UpsertResult:
         """
-        if not cls.__table__.exists(cls.db.engine):
-            logging.info(f"Table for {cls.__name__} does not exist. Creating it...")
-            cls.__table__.create(cls.db.engine)
-            logging.info(f"Table for {cls.__name__} created successfully.")
+        Upsert provided DataFrame with ORM bulk insert/update mappings in one transaction.
+        """
+        primary_keys = cls.get_primary_keys()
+        result = UpsertResult()
+        in_unit_of_work = cls.db.current_transaction is not None
+        try:
+            # Existence lookup, insert and update share one connection and one commit
+            with cls.db.transaction() as session:
+                logging.info(f"Upserting {len(df)} {cls.__name__} records...")
+                existing_records = cls.get_existing_records(df, primary_keys)
+                new_df, existing_df = cls.split_new_and_existing(
+                    df, existing_records, primary_keys
+                )
+                if cls.skip_unchanged:
+                    changed_df = cls.drop_unchanged(
+                        existing_df, existing_records, primary_keys
+                    )
+                    result.unchanged = len(existing_df) - len(changed_df)
+                    existing_df = changed_df
+                cls.bulk_insert(session, new_df)
+                cls.bulk_update(session, existing_df)
+                if cls.track_changes:
+                    cls.log_changes(session, new_df, "insert")
+                    cls.log_changes(session, existing_df, "update")
+                session.flush()
+            result.inserted, result.updated = len(new_df), len(existing_df)
+            logging.info(
+                f"{cls.__name__} data upserted successfully: {result.inserted} inserted, "
+                f"{result.updated} updated, {result.unchanged} unchanged"
+            )
+        except Exception as e:
+            # The transaction is rolled back, a unit of work must fail as a whole
+            logging.error(f"Error while upserting {cls.__name__} data: {e}")
+            if in_unit_of_work:
+                raise
+            result = UpsertResult()
+        return result
+
+    @classmethod
+    def copy_upsert(cls, df: pd.DataFrame) -> UpsertResult:
+        """
+        Upsert provided DataFrame using PostgreSQL COPY.
+
+        The frame is streamed into a temporary staging table with COPY FROM STDIN and merged
+        into the target table with a single INSERT ... ON CONFLICT (pk) DO UPDATE statement.
+        With `skip_unchanged` the update is limited to rows whose content IS DISTINCT FROM
+        the stored row.
+        """
+        result = UpsertResult()
+        copy_df = cls._get_copy_frame(df)
+        if copy_df.empty:
+            logging.info(f"No {cls.__name__} records to upsert.")
+            return result
 
         primary_keys = cls.get_primary_keys()
-        with cls.db.get_session() as session:
-            try:
-                logging.info(f"Upserting {cls.__name__} data...")
-                # Convert DataFrame to list of dictionaries
-                records = df.to_dict(orient="records")
-                existing_ids = cls.get_existing_records(df, primary_keys)
-                cls.bulk_insert(records, existing_ids, primary_keys)
-                cls.bulk_update(records, existing_ids, primary_keys)
-                logging.info(f"{cls.__name__} data upserted successfully...")
-            except Exception as e:
-                # Rollback the session in case of an error to discard the changes
-                session.rollback()
-                logging.error(f"Error while upserting {cls.__name__} data: {e}")
+        if set(primary_keys).issubset(copy_df.columns):
+            # ON CONFLICT cannot touch the same row twice in one statement
+            copy_df = copy_df.drop_duplicates(subset=primary_keys, keep="last")
+
+        preparer = cls.db.engine.dialect.identifier_preparer
+        target_table = preparer.format_table(cls.__table__)
+        staging_table = preparer.quote(f"staging_{cls.__tablename__}")
+        columns = ", ".join(preparer.quote(column) for column in copy_df.columns)
+        conflict_columns = ", ".join(preparer.quote(key) for key in primary_keys)
+        update_columns = [
+            f"{preparer.quote(column)} = EXCLUDED.{preparer.quote(column)}"
+            for column in copy_df.columns
+            if column not in primary_keys
+        ]
+        # SQL defaults and onupdate expressions (e.g. `update_date` = now()) of columns
+        # not provided are applied like the ORM path does
+        default_values = cls._get_sql_defaults(copy_df.columns, "default")
+        insert_columns = ", ".join(
+            [columns, *(preparer.quote(column) for column in default_values)]
+        )
+        insert_values = ", ".join([columns, *default_values.values()])
+        if update_columns:
+            update_columns += [
+                f"{preparer.quote(column)} = {value}"
+                for column, value in cls._get_sql_defaults(
+                    copy_df.columns, "onupdate"
+                ).items()
+            ]
+        conflict_action = (
+            f"DO UPDATE SET {', '.join(update_columns)}"
+            if update_columns
+            else "DO NOTHING"
+        )
+        compared_columns = [
+            column
+            for column in cls.__table__.columns
+            if column.name in copy_df.columns
+            and column.name not in primary_keys
+            and column.name not in cls.fingerprint_exclude_columns
+        ]
+        if update_columns and cls.skip_unchanged and compared_columns:
+            # json has no equality operator, so compare JSON columns as jsonb
+            cast_suffix = {
+                column.name: "::jsonb" if isinstance(column.type, JSON) else ""
+                for column in compared_columns
+            }
+            stored_values = ", ".join(
+                f"{target_table}.{preparer.quote(column.name)}{cast_suffix[column.name]}"
+                for column in compared_columns
+            )
+            incoming_values = ", ".join(
+                f"EXCLUDED.{preparer.quote(column.name)}{cast_suffix[column.name]}"
+                for column in compared_columns
+            )
+            conflict_action += (
+                f" WHERE ROW({stored_values}) IS DISTINCT FROM ROW({incoming_values})"
+            )
+
+        returned_keys = ""
+        log_changes = ""
+        if cls.track_changes:
+            change_log = cls.get_change_log_table()
+            keys = [preparer.quote(key) for key in primary_keys]
+            returned_keys = f"{', '.join(keys)}, "
+            # Statements of one WITH query share a snapshot, so the target table is seen
+            # without the merged rows, which tells inserted rows from updated ones
+            log_changes = (
+                f", logged AS (INSERT INTO {preparer.format_table(change_log)} "
+                f"({conflict_columns}, operation) "
+                f"SELECT {conflict_columns}, CASE WHEN EXISTS "
+                f"(SELECT FROM {target_table} WHERE "
+                + " AND ".join(f"{target_table}.{key} = merged.{key}" for key in keys)
+                + ") THEN 'update' ELSE 'insert' END FROM merged)"
+            )
+
+        buffer = io.StringIO()
+        copy_df.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL_MARKER)
+        buffer.seek(0)
+
+        in_unit_of_work = cls.db.current_transaction is not None
+        try:
+            logging.info(
+                f"Upserting {len(copy_df)} {cls.__name__} records with COPY..."
+            )
+            with cls.db.transaction() as session:
+                dbapi_connection = session.connection().connection
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE TEMPORARY TABLE {staging_table} "
+                        f"(LIKE {target_table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+                    cursor.copy_expert(
+                        f"COPY {staging_table} ({columns}) FROM STDIN "
+                        f"WITH (FORMAT csv, NULL '{COPY_NULL_MARKER}')",
+                        buffer,
+                    )
+                    merge = (
+                        f"INSERT INTO {target_table} ({insert_columns}) "
+                        f"SELECT {insert_values} FROM {staging_table} "
+                        f"ON CONFLICT ({conflict_columns}) {conflict_action}"
+                    )
+                    if cls.get_partition_column() is None:
+                        # xmax = 0 marks freshly inserted rows, others were updated
+                        cursor.execute(
+                            f"WITH merged AS ({merge} "
+                            f"RETURNING {returned_keys}(xmax = 0) AS is_inserted)"
+                            f"{log_changes} "
+                            f"SELECT count(*) FILTER (WHERE is_inserted), "
+                            f"count(*) FILTER (WHERE NOT is_inserted) FROM merged"
+                        )
+                        result.inserted, result.updated = cursor.fetchone()
+                    else:
+                        # System columns cannot be returned from partitioned tables, so
+                        # staged keys missing in the table are counted before the merge
+                        cursor.execute(
+                            f"SELECT count(*) FROM {staging_table} "
+                            f"WHERE NOT EXISTS (SELECT FROM {target_table} WHERE "
+                            + " AND ".join(
+                                f"{target_table}.{key} = {staging_table}.{key}"
+                                for key in map(preparer.quote, primary_keys)
+                            )
+                            + ")"
+                        )
+                        (result.inserted,) = cursor.fetchone()
+                        cursor.execute(
+                            f"WITH merged AS ({merge} RETURNING {returned_keys}1)"
+                            f"{log_changes} SELECT count(*) FROM merged"
+                        )
+                        (merged,) = cursor.fetchone()
+                        result.updated = merged - result.inserted
+                    # Free the name for further chunks loaded in the same transaction
+                    cursor.execute(f"DROP TABLE {staging_table}")
+            result.unchanged = len(copy_df) - result.inserted - result.updated
+            logging.info(
+                f"{cls.__name__} data upserted successfully with COPY: "
+                f"{result.inserted} inserted, {result.updated} updated, "
+                f"{result.unchanged} unchanged"
+            )
+        except Exception as e:
+            # The transaction is rolled back, a unit of work must fail as a whole
+            logging.error(f"Error while upserting {cls.__name__} data with COPY: {e}")
+            if in_unit_of_work:
+                raise
+            result = UpsertResult()
+        return result
+
+    @classmethod
+    def replace(
+        cls,
+        data: pd.DataFrame | Iterable[pd.DataFrame],
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        Replace all rows of the model's table with provided data, for tables recomputed
+        from scratch.
+
+        Rows are streamed with COPY into a shadow table, which is then swapped with the
+        live table (see `_replace_table`). No existing keys are looked up, so primary keys
+        have to be unique across the whole input.
+
+        Args:
+            data (pd.DataFrame | Iterable[pd.DataFrame]): New contents of the table. An
+                iterator of frames is consumed lazily.
+            chunk_size (int | None): Rows per COPY. Defaults to the model's
+                `upsert_chunk_size`.
+
+        Returns:
+            int: Number of rows in the replaced table.
+        """
+
+        def copy_chunks(connection: Connection, shadow_table: str) -> int:
+            preparer = connection.dialect.identifier_preparer
+            copied_rows = 0
+            for chunk in iter_chunks(data, chunk_size or cls.upsert_chunk_size):
+                copy_df = cls._get_copy_frame(chunk)
+                buffer = io.StringIO()
+                copy_df.to_csv(
+                    buffer, index=False, header=False, na_rep=COPY_NULL_MARKER
+                )
+                buffer.seek(0)
+                columns = ", ".join(
+                    preparer.quote(column) for column in copy_df.columns
+                )
+                with connection.connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {shadow_table} ({columns}) FROM STDIN "
+                        f"WITH (FORMAT csv, NULL '{COPY_NULL_MARKER}')",
+                        buffer,
+                    )
+                copied_rows += len(copy_df)
+            return copied_rows
+
+        return cls._replace_table(copy_chunks)
+
+    @classmethod
+    def replace_from_select(cls, statement: Select) -> int:
+        """
+        Replace all rows of the model's table with rows of a SELECT computed inside the
+        database, e.g. an aggregate of another table. Columns of the statement have to
+        match the table's columns by name.
+
+        Returns:
+            int: Number of rows in the replaced table.
+        """
+
+        def insert_rows(connection: Connection, shadow_table: str) -> int:
+            preparer = connection.dialect.identifier_preparer
+            columns = ", ".join(
+                preparer.quote(column.name) for column in statement.selected_columns
+            )
+            return connection.exec_driver_sql(
+                f"INSERT INTO {shadow_table} ({columns}) "
+                f"{render_statement(statement, connection)}"
+            ).rowcount
+
+        return cls._replace_table(insert_rows)
+
+    @classmethod
+    def _replace_table(cls, fill: Callable[[Connection, str], int]) -> int:
+        """
+        Build new contents of the model's table in a shadow table and swap it in.
+
+        The shadow table copies the live table's columns, defaults and constraints, is
+        filled by `fill` without index maintenance, then gets the live table's indexes.
+        Renames swap both tables in one transaction, so readers see either the complete
+        old or the complete new table; they wait only for the swap, not for the build.
+        The swap fails on tables referenced by foreign keys or views, and on partitioned
+        tables, which are left untouched.
+
+        Args:
+            fill (Callable[[Connection, str], int]): Writes rows into the shadow table,
+                given the connection and the quoted table name, and returns their count.
+
+        Returns:
+            int: Number of rows in the replaced table.
+        """
+        cls.ensure_table()
+        preparer = cls.db.engine.dialect.identifier_preparer
+        schema = preparer.format_schema(cls.__table__.schema or "public")
+        live_table = preparer.format_table(cls.__table__)
+        old_name = f"{cls.__tablename__}_replaced"
+        shadow_name = f"{cls.__tablename__}_shadow"
+        shadow_table = f"{schema}.{preparer.quote(shadow_name)}"
+
+        in_unit_of_work = cls.db.current_transaction is not None
+        try:
+            logging.info(f"Replacing {cls.__name__} data...")
+            with cls.db.transaction() as session:
+                connection = session.connection()
+                connection.exec_driver_sql(
+                    f"CREATE TABLE {shadow_table} "
+                    f"(LIKE {live_table} INCLUDING ALL EXCLUDING INDEXES)"
+                )
+                # Client-side SQL defaults (e.g. sequences) apply to columns not provided
+                for column, value in cls._get_sql_defaults((), "default").items():
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {shadow_table} ALTER COLUMN "
+                        f"{preparer.quote(column)} SET DEFAULT {value}"
+                    )
+                replaced_rows = fill(connection, shadow_table)
+
+                # Indexes are built once on the loaded rows, under temporary names
+                indexes = connection.exec_driver_sql(
+                    "SELECT i.relname, pg_get_indexdef(i.oid), c.contype "
+                    "FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+                    "LEFT JOIN pg_constraint c ON c.conindid = i.oid "
+                    "AND c.conrelid = x.indrelid "
+                    "WHERE x.indrelid = %(table)s::regclass",
+                    {"table": live_table},
+                ).fetchall()
+                for index_name, definition, constraint_type in indexes:
+                    shadow_index = f"{index_name}_shadow"
+                    definition = re.sub(
+                        r" INDEX \S+ ON (ONLY )?\S+ ",
+                        f" INDEX {preparer.quote(shadow_index)} ON {shadow_table} ",
+                        definition,
+                        count=1,
+                    )
+                    connection.exec_driver_sql(definition)
+                    if constraint_type in ("p", "u"):
+                        connection.exec_driver_sql(
+                            f"ALTER TABLE {shadow_table} ADD CONSTRAINT "
+                            f"{preparer.quote(shadow_index)} "
+                            f"{'PRIMARY KEY' if constraint_type == 'p' else 'UNIQUE'} "
+                            f"USING INDEX {preparer.quote(shadow_index)}"
+                        )
+
+                # Sequences of serial columns would be dropped with the old table
+                serial_sequences = connection.exec_driver_sql(
+                    "SELECT a.attname, pg_get_serial_sequence(%(table)s, a.attname) "
+                    "FROM pg_attribute a WHERE a.attrelid = %(table)s::regclass "
+                    "AND a.attnum > 0 AND NOT a.attisdropped AND a.attidentity = ''",
+                    {"table": live_table},
+                ).fetchall()
+                for column, sequence in serial_sequences:
+                    if sequence is not None:
+                        connection.exec_driver_sql(
+                            f"ALTER SEQUENCE {sequence} OWNED BY "
+                            f"{shadow_table}.{preparer.quote(column)}"
+                        )
+
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {live_table} RENAME TO {preparer.quote(old_name)}"
+                )
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {shadow_table} "
+                    f"RENAME TO {preparer.quote(cls.__tablename__)}"
+                )
+                connection.exec_driver_sql(
+                    f"DROP TABLE {schema}.{preparer.quote(old_name)}"
+                )
+                for index_name, _, _ in indexes:
+                    # Renames the constraint of the index as well
+                    connection.exec_driver_sql(
+                        f"ALTER INDEX {schema}.{preparer.quote(f'{index_name}_shadow')} "
+                        f"RENAME TO {preparer.quote(index_name)}"
+                    )
+                connection.exec_driver_sql(f"ANALYZE {live_table}")
+                cls.invalidate_cached_queries()
+            logging.info(
+                f"{cls.__name__} data replaced successfully: {replaced_rows} rows"
+            )
+        except Exception as e:
+            # The transaction is rolled back and the live table is kept
+            logging.error(f"Error while replacing {cls.__name__} data: {e}")
+            if in_unit_of_work:
+                raise
+            replaced_rows = 0
+        return replaced_rows
+
+    @classmethod
+    def _get_copy_frame(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prepare DataFrame for COPY: map attribute names to column names, keep only table
+        columns (in table order), serialize JSON values and restore integer columns
+        that pandas turned into floats.
+        """
+        copy_df = cls._to_column_names(df)
+        table_columns = [cls.__table__.c[column] for column in copy_df.columns]
+
+        for column in table_columns:
+            if isinstance(column.type, JSON):
+                copy_df[column.name] = copy_df[column.name].map(
+                    json.dumps, na_action="ignore"
+                )
+            elif isinstance(column.type, Integer):
+                try:
+                    copy_df[column.name] = pd.to_numeric(copy_df[column.name]).astype(
+                        "Int64"
+                    )
+                except (ValueError, TypeError):
+                    pass
+        return copy_df
+
+    @classmethod
+    def _get_sql_defaults(
+        cls, provided_columns: Iterable[str], kind: str
+    ) -> dict[str, str]:
+        """
+        Return compiled SQL expressions of column defaults of given kind ("default" or
+        "onupdate") for table columns missing in `provided_columns`.
+        """
+        dialect = cls.db.engine.dialect
+        defaults = {}
+        for column in cls.__table__.columns:
+            default = getattr(column, kind)
+            if column.name in provided_columns or default is None:
+                continue
+            if default.is_clause_element:
+                defaults[column.name] = str(default.arg.compile(dialect=dialect))
+            elif default.is_sequence:
+                defaults[column.name] = str(
+                    default.next_value().compile(dialect=dialect)
+                )
+        return defaults
+
+    @classmethod
+    def _to_column_names(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rename mapped attribute names (e.g. `c_2020`) to table column names and keep only
+        writable table columns, in table order. Computed columns are generated by the
+        database and cannot be written.
+        """
+        column_names = {
+            attr.key: attr.columns[0].name for attr in cls.__mapper__.column_attrs
+        }
+        renamed_df = df.rename(columns=column_names)
+        return renamed_df[
+            [
+                column.name
+                for column in cls.__table__.columns
+                if column.name in renamed_df.columns and column.computed is None
+            ]
+        ].copy()
+
+    @classmethod
+    def get_computed_columns(cls) -> list[str]:
+        """Return attribute names of columns generated by the database."""
+        return [
+            attr.key
+            for attr in cls.__mapper__.column_attrs
+            if attr.columns[0].computed is not None
+        ]
 
     @classmethod
     def get_existing_records(
         cls, df: pd.DataFrame, primary_keys: list[str]
     ) -> pd.DataFrame:
+        """
+        Retrieve records of the table whose primary keys are present in provided DataFrame.
+
+        On PostgreSQL incoming keys are sent as one array per key column and joined with
+        the table through unnest(), so statement size and lookup time grow linearly with
+        the batch. Other dialects use a chunked tuple IN filter. Inside a unit of work the
+        lookup runs on its connection.
+        """
         try:
-            # Get IDs of input DataFrame
-            key_values = df[primary_keys].to_dict(orient="records")
+            # Get distinct IDs of input DataFrame
+            key_df = df[primary_keys].dropna().drop_duplicates()
         except KeyError as e:
             if "country_id" in e.args[0]:
                 country_df = cls.get_df_from_table()
                 return country_df[["country_id"]]
             return pd.DataFrame()
 
-        if key_values:
-            with cls.db.get_session() as session:
-                # Build filter conditions for each key set
-                conditions = [
-                    and_(
-                        *[getattr(cls, key) == value for key, value in key_set.items()]
-                    )
-                    for key_set in key_values
-                ]
-                # Query the database for matching records
-                existing_records = pd.read_sql_query(
-                    session.query(cls).filter(or_(*conditions)).statement,
-                    cls.db.engine,
+        if key_df.empty:
+            return pd.DataFrame()
+
+        key_columns = [cls.__table__.c[key] for key in primary_keys]
+        if cls.db.engine.dialect.name == "postgresql":
+            incoming_keys = (
+                func.unnest(
+                    *[
+                        cast(
+                            bindparam(
+                                f"{column.name}_keys", key_df[column.name].tolist()
+                            ),
+                            ARRAY(column.type),
+                        )
+                        for column in key_columns
+                    ]
                 )
-                return existing_records
+                .table_valued(*primary_keys)
+                .render_derived(name="incoming_keys")
+            )
+            statement = select(cls.__table__).join(
+                incoming_keys,
+                and_(
+                    *[column == incoming_keys.c[column.name] for column in key_columns]
+                ),
+            )
+            return pd.read_sql_query(statement, cls.get_bind())
+
+        key_values = list(key_df.itertuples(index=False, name=None))
+        existing_chunks = [
+            pd.read_sql_query(
+                select(cls.__table__).where(
+                    tuple_(*key_columns).in_(key_values[i : i + KEY_LOOKUP_CHUNK_SIZE])
+                ),
+                cls.get_bind(),
+            )
+            for i in range(0, len(key_values), KEY_LOOKUP_CHUNK_SIZE)
+        ]
+        return pd.concat(existing_chunks, ignore_index=True)
 
     @classmethod
-    def bulk_insert(
+    def split_new_and_existing(
         cls,
-        records: list[dict[str, Any]],
+        df: pd.DataFrame,
         existing_records: pd.DataFrame,
         primary_keys: list[str],
-    ) -> None:
-        if not existing_records.empty:
-            # Convert primary key values in `existing_key_tuples` with safe casting
-            existing_key_tuples = [
-                tuple(str(existing_records[key].iloc[i]) for key in primary_keys)
-                for i in range(len(existing_records))
-            ]
-            new_records = []
-            for record in records:
-                record_key_tuple = tuple(str(record[key]) for key in primary_keys)
-                if record_key_tuple not in existing_key_tuples:
-                    new_records.append(record)
-        else:
-            new_records = records
-
-        with cls.db.get_session() as session:
-            try:
-                logging.info(f"Inserting new {cls.__name__} records")
-                # Get schema from __table_args__
-                if isinstance(cls.__table_args__, dict):
-                    schema = cls.__table_args__.get("schema", "public")
-                elif isinstance(cls.__table_args__, tuple):
-                    schema = next(
-                        (
-                            item.get("schema", "public")
-                            for item in cls.__table_args__
-                            if isinstance(item, dict)
-                        ),
-                        "public",
-                    )
-                else:
-                    schema = "public"
-
-                # Create table if it doesn't exist
-                if not inspect(cls.db.engine).has_table(
-                    cls.__tablename__, schema=schema
-                ):
-                    cls.__table__.create(cls.db.engine)
-
-                session.bulk_insert_mappings(
-                    cls, new_records
-                )  # Bulk insert new records
-                session.commit()
-                logging.info(
-                    f"{len(new_records)} {cls.__name__} records inserted successfully"
-                )
-            except Exception as e:
-                # Rollback the session in case of an error to discard the changes
-                session.rollback()
-                logging.error(f"Error while inserting {cls.__name__} data: {e}")
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split DataFrame into rows missing from the table and rows that already exist.
+
+        Key columns of both frames are cast to the model's column types and matched with
+        a hash-based MultiIndex lookup, so the split is vectorized and linear in size.
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: New rows and existing rows of `df`.
+        """
+        if existing_records.empty or not set(primary_keys).issubset(df.columns):
+            return df, df.iloc[0:0]
+
+        incoming_keys = pd.MultiIndex.from_frame(
+            cls._cast_to_column_types(df, primary_keys)
+        )
+        existing_keys = pd.MultiIndex.from_frame(
+            cls._cast_to_column_types(existing_records, primary_keys)
+        )
+        is_existing = incoming_keys.isin(existing_keys)
+        return df[~is_existing], df[is_existing]
 
     @classmethod
-    def bulk_update(
+    def drop_unchanged(
         cls,
-        records: list[dict[str, Any]],
+        df: pd.DataFrame,
         existing_records: pd.DataFrame,
         primary_keys: list[str],
-    ) -> None:
-        if not existing_records.empty:
-            # Convert primary key values in `existing_key_tuples` with safe casting
-            existing_key_tuples = {
-                tuple(str(existing_records[key].iloc[i]) for key in primary_keys)
-                for i in range(len(existing_records))
-            }
+    ) -> pd.DataFrame:
+        """
+        Drop rows whose content fingerprint matches the stored row with the same key.
 
-            # Convert primary key values in `new_records` with safe casting
-            records_to_update = [
-                record
-                for record in records
-                if tuple(str(record[key]) for key in primary_keys)
-                in existing_key_tuples
-            ]
-            # TODO: consider checking all fields values to avoid updating full tables
-            if records_to_update:
-                with cls.db.get_session() as session:
-                    try:
-                        logging.info(f"Updating {cls.__name__} records")
-                        session.bulk_update_mappings(
-                            cls, records_to_update
-                        )  # Bulk update existing records
-                        session.commit()
-                        logging.info(
-                            f"{len(records_to_update)} {cls.__name__} records updated successfully"
-                        )
-                    except Exception as e:
-                        # Rollback the session in case of an error to discard the changes
-                        session.rollback()
-                        logging.error(f"Error while updating {cls.__name__} data: {e}")
-
-    @classmethod
-    def _is_same_record(
-        cls, input_record: dict[str, Any], existing_record: pd.Series
-    ) -> bool:
-        """Helper function to check if the input record is the same as the existing record."""
-        # Compare each field, except the primary key
-        existing_record = existing_record
-        primary_keys = (
-            [key.name for key in cls.__mapper__.primary_key] if cls.__mapper__ else []
-        )
-        # FIXME: update doesn't work for Coaches (only insert)
-        for key, value in input_record.items():
-            if (
-                key != primary_key and value != existing_record[key]
-                for primary_key in primary_keys
-            ):
-                logging.info(f"Key {key}, value {value}")
-                return False
-        return True
+        Returns:
+            pd.DataFrame: Rows of `df` that are new or differ from the stored version.
+        """
+        if df.empty:
+            return df
+
+        incoming_df = cls._to_column_names(df)
+        content_columns = [
+            column
+            for column in incoming_df.columns
+            if column not in primary_keys
+            and column not in cls.fingerprint_exclude_columns
+            and column in existing_records.columns
+        ]
+        if not content_columns:
+            return df
+
+        existing_fingerprints = pd.Series(
+            cls.get_row_fingerprints(existing_records, content_columns).to_numpy(),
+            index=pd.MultiIndex.from_frame(
+                cls._cast_to_column_types(existing_records, primary_keys)
+            ),
+        )
+        existing_fingerprints = existing_fingerprints[
+            ~existing_fingerprints.index.duplicated()
+        ]
+        positions = existing_fingerprints.index.get_indexer(
+            pd.MultiIndex.from_frame(
+                cls._cast_to_column_types(incoming_df, primary_keys)
+            )
+        )
+        incoming_fingerprints = cls.get_row_fingerprints(
+            incoming_df, content_columns
+        ).to_numpy()
+        is_unchanged = (positions >= 0) & (
+            existing_fingerprints.to_numpy()[positions] == incoming_fingerprints
+        )
+        return df[~is_unchanged]
+
+    @classmethod
+    def get_row_fingerprints(cls, df: pd.DataFrame, columns: list[str]) -> pd.Series:
+        """Hash given columns of each row after casting them to the model's column types."""
+        return pd.util.hash_pandas_object(
+            cls._cast_to_column_types(df, columns), index=False
+        )
+
+    @classmethod
+    def _cast_to_column_types(
+        cls, df: pd.DataFrame, columns: list[str]
+    ) -> pd.DataFrame:
+        """Cast given columns to pandas dtypes matching the model's column types."""
+        typed_columns = {}
+        for column_name in columns:
+            column_type = cls.__table__.c[column_name].type
+            values = df[column_name]
+            if isinstance(column_type, Integer):
+                typed_columns[column_name] = pd.to_numeric(
+                    values, errors="coerce"
+                ).astype("Int64")
+            elif isinstance(column_type, (Numeric, Float)):
+                typed_columns[column_name] = pd.to_numeric(
+                    values, errors="coerce"
+                ).astype("Float64")
+            elif isinstance(column_type, (Date, DateTime)):
+                typed_columns[column_name] = pd.to_datetime(
+                    values, errors="coerce", utc=True
+                ).dt.tz_localize(None)
+            elif isinstance(column_type, JSON):
+                typed_columns[column_name] = values.map(
+                    lambda value: json.dumps(value, sort_keys=True),
+                    na_action="ignore",
+                ).astype("string")
+            else:
+                typed_columns[column_name] = values.astype("string")
+        return pd.DataFrame(typed_columns, index=df.index)
+
+    @classmethod
+    def bulk_insert(cls, session: Session, new_df: pd.DataFrame) -> None:
+        if new_df.empty:
+            return
+
+        logging.info(f"Inserting {len(new_df)} new {cls.__name__} records")
+        cls.ensure_table()
+        session.bulk_insert_mappings(
+            cls,
+            new_df.drop(columns=cls.get_computed_columns(), errors="ignore").to_dict(
+                orient="records"
+            ),
+        )  # Bulk insert new records
+
+    @classmethod
+    def bulk_update(cls, session: Session, existing_df: pd.DataFrame) -> None:
+        if existing_df.empty:
+            return
+
+        logging.info(f"Updating {len(existing_df)} {cls.__name__} records")
+        session.bulk_update_mappings(
+            cls,
+            existing_df.drop(
+                columns=cls.get_computed_columns(), errors="ignore"
+            ).to_dict(orient="records"),
+        )  # Bulk update existing records
 
 
 # Create a declarative base
 Base = declarative_base(cls=BaseMixin)
+
+# Version of each table, bumped by writes and checked by cached reads of all processes
+cache_versions_table = Table(
+    "query_cache_versions",
+    Base.metadata,
+    Column("table_name", String, primary_key=True),
+    Column("version", BigInteger, nullable=False),
+)
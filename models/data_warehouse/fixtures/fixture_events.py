@@ -1,7 +1,6 @@
 from sqlalchemy import (
     Column,
     Integer,
-    ForeignKey,
     String,
     PrimaryKeyConstraint,
 )
@@ -10,6 +9,7 @@ import datetime as dt
 from sqlalchemy.orm import relationship
 
 from config.entity_names import DW_FIXTURES_SCHEMA_NAME
+from config.vars import FIXTURE_ID_PARTITION_SIZE, UPSERT_PARALLELISM
 from models.base import Base
 
 
@@ -17,14 +17,23 @@ class FixtureEvent(Base):
     __tablename__ = "fixtures_events"
     __table_args__ = (
         PrimaryKeyConstraint("fixture_id", "event_id", name="pk_fixtureId_eventId"),
-        {"schema": DW_FIXTURES_SCHEMA_NAME},
+        {
+            "schema": DW_FIXTURES_SCHEMA_NAME,
+            "postgresql_partition_by": "RANGE (fixture_id)",
+        },
     )
-
-    fixture = relationship("Fixture", back_populates="events")
-
-    fixture_id = Column(
-        Integer, ForeignKey("dw_fixtures.fixtures.fixture_id"), nullable=False
+    partition_interval = FIXTURE_ID_PARTITION_SIZE
+    load_method = "copy"
+    skip_unchanged = True
+    upsert_parallelism = UPSERT_PARALLELISM
+
+    fixture = relationship(
+        "Fixture",
+        primaryjoin="Fixture.fixture_id == foreign(FixtureEvent.fixture_id)",
+        back_populates="events",
     )
+
+    fixture_id = Column(Integer, nullable=False)
     event_id = Column(Integer)
     elapsed_time = Column(Integer)
     extra_time = Column(Integer)
@@ -1,7 +1,6 @@
 from sqlalchemy import (
     Column,
     Integer,
-    ForeignKey,
     PrimaryKeyConstraint,
     String,
 )
@@ -11,6 +10,7 @@ import datetime as dt
 from sqlalchemy.orm import relationship
 
 from config.entity_names import DW_FIXTURES_SCHEMA_NAME
+from config.vars import FIXTURE_ID_PARTITION_SIZE
 from models.base import Base
 
 
@@ -18,14 +18,22 @@ class FixtureStat(Base):
     __tablename__ = "fixtures_stats"
     __table_args__ = (
         PrimaryKeyConstraint("fixture_id", "side", name="pk_fixture_side"),
-        {"schema": DW_FIXTURES_SCHEMA_NAME},
+        {
+            "schema": DW_FIXTURES_SCHEMA_NAME,
+            "postgresql_partition_by": "RANGE (fixture_id)",
+        },
     )
-
-    fixture = relationship("Fixture", back_populates="stats")
-
-    fixture_id = Column(
-        Integer, ForeignKey("dw_fixtures.fixtures.fixture_id"), nullable=False
+    partition_interval = FIXTURE_ID_PARTITION_SIZE
+    load_method = "copy"
+    skip_unchanged = True
+
+    fixture = relationship(
+        "Fixture",
+        primaryjoin="Fixture.fixture_id == foreign(FixtureStat.fixture_id)",
+        back_populates="stats",
     )
+
+    fixture_id = Column(Integer, nullable=False)
     side = Column(String)
     team_id = Column(Integer)
     team_name = Column(String)
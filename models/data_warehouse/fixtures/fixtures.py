@@ -1,37 +1,61 @@
 import datetime as dt
 import logging
 import pandas as pd
+from zoneinfo import ZoneInfo
 
 from sqlalchemy import (
     Column,
+    Computed,
+    Date,
+    Index,
     Integer,
     String,
     ForeignKey,
     func,
     asc,
+    select,
+    true,
+    union,
     DateTime,
-    text,
 )
+from sqlalchemy.sql import ColumnElement, Select
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import relationship
 
 from config.entity_names import FIXTURES_TABLE_NAME, DW_FIXTURES_SCHEMA_NAME
+from config.vars import LOCAL_TIMEZONE
 from models.base import Base
+from services.query_cache import cached_query
 
 
 class Fixture(Base):
     __tablename__ = FIXTURES_TABLE_NAME
-    __table_args__ = {"schema": DW_FIXTURES_SCHEMA_NAME}
+    # Partitions per season are created on load, see `BaseMixin.ensure_partitions`
+    __table_args__ = {
+        "schema": DW_FIXTURES_SCHEMA_NAME,
+        "postgresql_partition_by": "RANGE (season_year)",
+    }
+    load_method = "copy"
+    skip_unchanged = True
 
-    fixture_id = Column(Integer, primary_key=True)
+    fixture_id = Column(Integer, primary_key=True, autoincrement=False)
     league_id = Column(Integer, ForeignKey("dw_main.leagues.league_id"), nullable=False)
     country_name = Column(String, nullable=False)
-    season_year = Column(String, nullable=False)
+    # Partition key, which a partitioned table's primary key has to include
+    season_year = Column(String, primary_key=True)
     league_name = Column(String, nullable=False)
     season_stage = Column(String, nullable=False)
     round = Column(String)
-    # TODO: convert to Column(DateTime(timezone=True)) with Warsaw timezone
+    # Kick-off time in UTC
     date = Column(DateTime, nullable=False)
+    # Day of the match in local timezone, generated from `date`
+    match_date = Column(
+        Date,
+        Computed(
+            f"((\"date\" AT TIME ZONE 'UTC') AT TIME ZONE '{LOCAL_TIMEZONE}')::date",
+            persisted=True,
+        ),
+    )
     status = Column(String, nullable=False)
     referee = Column(String)
     home_team_id = Column(Integer, ForeignKey("dw_main.teams.team_id"), nullable=False)
@@ -42,12 +66,27 @@ class Fixture(Base):
     goals_away = Column(Integer)
     goals_home_ht = Column(Integer)
     goals_away_ht = Column(Integer)
-    update_date = Column(DateTime)
+    # Time of the last insert or change of the row, watermark of incremental refreshes
+    update_date = Column(DateTime, default=func.now(), onupdate=func.now())
 
     league = relationship("League", back_populates="fixture")
-    stats = relationship("FixtureStat", back_populates="fixture")
-    player_stats = relationship("FixturePlayerStat", back_populates="fixture")
-    events = relationship("FixtureEvent", back_populates="fixture")
+    # `fixture_id` alone is not unique in the partitioned table and cannot be referenced
+    # by foreign keys of the detail tables, so their joins are declared explicitly
+    stats = relationship(
+        "FixtureStat",
+        primaryjoin="Fixture.fixture_id == foreign(FixtureStat.fixture_id)",
+        back_populates="fixture",
+    )
+    player_stats = relationship(
+        "FixturePlayerStat",
+        primaryjoin="Fixture.fixture_id == foreign(FixturePlayerStat.fixture_id)",
+        back_populates="fixture",
+    )
+    events = relationship(
+        "FixtureEvent",
+        primaryjoin="Fixture.fixture_id == foreign(FixtureEvent.fixture_id)",
+        back_populates="fixture",
+    )
 
     home_team = relationship(
         "Team", foreign_keys=[home_team_id], back_populates="home_team"
@@ -69,24 +108,77 @@ class Fixture(Base):
         ]
         return date_range
 
+    @staticmethod
+    def get_local_today() -> dt.date:
+        return dt.datetime.now(ZoneInfo(LOCAL_TIMEZONE)).date()
+
+    @classmethod
+    def get_seasons_since_condition(cls, since: dt.date | str) -> ColumnElement:
+        """
+        Condition of seasons that can have fixtures played on or after given date. Seasons
+        are named after the year they start in, so it is implied by such a date filter and
+        added next to it lets PostgreSQL skip partitions of older seasons.
+        """
+        return cls.season_year >= str(pd.Timestamp(since).year - 1)
+
+    @classmethod
+    def get_day_summary_statement(
+        cls, start_date: dt.date | str, end_date: dt.date | str | None = None
+    ) -> Select:
+        return (
+            select(
+                cls.match_date,
+                func.count().label("total"),
+                func.count().filter(cls.status == "NS").label("not_started"),
+            )
+            .where(
+                cls.match_date.between(start_date, end_date or start_date)
+                & cls.get_seasons_since_condition(start_date)
+            )
+            .group_by(cls.match_date)
+            .order_by(cls.match_date)
+        )
+
+    @classmethod
+    def get_day_summary(
+        cls, start_date: dt.date | str, end_date: dt.date | str | None = None
+    ) -> pd.DataFrame:
+        """
+        Count all and not started fixtures of each match day in a single indexed query.
+
+        Args:
+            start_date (dt.date | str): First match day (e.g., "2024-05-01").
+            end_date (dt.date | str | None): Last match day. Defaults to `start_date`.
+
+        Returns:
+            pd.DataFrame: Columns `match_date`, `total` and `not_started`, one row per
+                match day with fixtures.
+        """
+        return cls.db.read_df(cls.get_day_summary_statement(start_date, end_date))
+
     @classmethod
     def calculate_share_of_not_started_games(cls, date_to_check: str) -> int:
-        with cls.db.get_session() as session:
-            try:
-                all_fixture_count: int = (
-                    session.query(func.count(cls.fixture_id))
-                    .filter(func.DATE(cls.date) == date_to_check)
-                    .scalar()
-                )
-                not_started_fixture_count: int = (
-                    session.query(func.count(cls.fixture_id))
-                    .filter(
-                        (func.DATE(cls.date) == date_to_check) & (cls.status == "NS")
-                    )
-                    .scalar()
-                )
-            except Exception as e:
-                logging.error(f"{e}")
+        """
+        Calculate the percentage of not started fixtures of a match day.
+
+        Args:
+            date_to_check (str): The match day (e.g., "2024-05-01").
+
+        Returns:
+            int: Percentage of not started fixtures, 0 for a day without fixtures.
+
+        Raises:
+            Exception: If an error occurs during the database operation.
+        """
+        try:
+            summary_df = cls.get_day_summary(date_to_check)
+        except Exception as e:
+            logging.error(f"Error while summarizing fixtures of {date_to_check}: {e}")
+            raise
+        all_fixture_count = int(summary_df["total"].sum())
+        if not all_fixture_count:
+            return 0
+        not_started_fixture_count = int(summary_df["not_started"].sum())
         return int(not_started_fixture_count / all_fixture_count * 100)
 
     @classmethod
@@ -117,10 +209,7 @@ class Fixture(Base):
     @classmethod
     def get_today_fixtures(cls) -> pd.DataFrame:
         """
-        Retrieve the maximum date of results in the database.
-
-        This method queries the database to find fixtures that
-        were played or will be played today.
+        Retrieve fixtures that were played or will be played today.
 
         Returns:
             pd.DataFrame: Dataframe consists of today's fixtures.
@@ -128,15 +217,32 @@ class Fixture(Base):
         Raises:
             Exception: If an error occurs during the database operation.
         """
-        with cls.db.get_session() as session:
-            try:
-                today_fixtures_df = pd.read_sql_query(
-                    session.query(cls).filter(cls.date == dt.date.today()).statement,
-                    cls.db.engine,
+        return cls.get_fixtures_by_match_date(cls.get_local_today())
+
+    @classmethod
+    @cached_query
+    def get_fixtures_by_match_date(cls, match_date: dt.date | str) -> pd.DataFrame:
+        """
+        Retrieve fixtures of a match day in local timezone.
+
+        Args:
+            match_date (dt.date | str): The match day (e.g., "2024-05-01").
+
+        Returns:
+            pd.DataFrame: Dataframe consists of fixtures of the match day.
+
+        Raises:
+            Exception: If an error occurs during the database operation.
+        """
+        try:
+            return cls.db.read_df(
+                select(cls.__table__).where(
+                    (cls.match_date == match_date)
+                    & cls.get_seasons_since_condition(match_date)
                 )
-                return today_fixtures_df
-            except Exception:
-                raise Exception
+            )
+        except Exception:
+            raise Exception
 
     @classmethod
     def get_season_fixtures_by_team(
@@ -158,33 +264,28 @@ class Fixture(Base):
         Raises:
             Exception: If there's any error during the database query or processing.
         """
-        with cls.db.get_session() as session:
-            try:
-                team_fixtures_df = pd.read_sql_query(
-                    session.query(cls)
-                    .filter(
-                        (cls.season_year == season_year)
-                        & (
-                            (cls.home_team_id == team_id)
-                            | (cls.away_team_id == team_id)
-                        )
-                        & (cls.league_id != 667)  # Excluding Friendlies
-                    )
-                    .statement,
-                    cls.db.engine,
-                )
-                # Return all except Not Started - most statuses are for finished games
-                if status == "FT":
-                    team_fixtures_df = team_fixtures_df[
-                        team_fixtures_df["status"] != "NS"
-                    ]
-                elif status == "NS":
-                    team_fixtures_df = team_fixtures_df[
-                        team_fixtures_df["status"] == "NS"
-                    ]
-                return team_fixtures_df
-            except Exception:
-                raise Exception
+        try:
+            team_fixtures_df = cls.db.read_df(
+                cls.get_season_fixtures_by_team_statement(team_id, season_year)
+            )
+            # Return all except Not Started - most statuses are for finished games
+            if status == "FT":
+                team_fixtures_df = team_fixtures_df[team_fixtures_df["status"] != "NS"]
+            elif status == "NS":
+                team_fixtures_df = team_fixtures_df[team_fixtures_df["status"] == "NS"]
+            return team_fixtures_df
+        except Exception:
+            raise Exception
+
+    @classmethod
+    def get_season_fixtures_by_team_statement(
+        cls, team_id: int, season_year: str
+    ) -> Select:
+        return select(cls.__table__).where(
+            (cls.season_year == season_year)
+            & ((cls.home_team_id == team_id) | (cls.away_team_id == team_id))
+            & (cls.league_id != 667)  # Excluding Friendlies
+        )
 
     @staticmethod
     def filter_fixtures_by_rounds(df: pd.DataFrame, rounds: str | int) -> pd.DataFrame:
@@ -225,8 +326,12 @@ class Fixture(Base):
     #     return game_preview_df
 
     @classmethod
-    def get_breaks(cls) -> pd.DataFrame:
-        overcome_mask = (
+    def get_breaks_condition(cls) -> ColumnElement:
+        """
+        Condition of finished games won by the team losing at half time. Also the predicate
+        of the partial index serving `get_breaks_statement`.
+        """
+        return (
             (cls.goals_home_ht > cls.goals_away_ht)
             & (cls.goals_home < cls.goals_away)
             & (cls.status == "FT")
@@ -235,51 +340,99 @@ class Fixture(Base):
             & (cls.goals_home > cls.goals_away)
             & (cls.status == "FT")
         )
-        with cls.db.get_session() as session:
-            try:
-                overcome_games_df = pd.read_sql_query(
-                    session.query(cls)
-                    .filter(overcome_mask)
-                    .order_by(asc(cls.date))
-                    .statement,
-                    cls.db.engine,
-                )
-            except InvalidRequestError as e:
-                raise InvalidRequestError(
-                    f"Error while reading {cls.__name__} data: {e}"
-                )
-        return overcome_games_df  # .drop(columns=["update_date"])
+
+    @classmethod
+    def get_breaks_statement(cls) -> Select:
+        return (
+            select(cls.__table__)
+            .where(cls.get_breaks_condition())
+            .order_by(asc(cls.date))
+        )
+
+    @classmethod
+    def get_updated_since_condition(cls, since: dt.datetime | None) -> ColumnElement:
+        """
+        Condition of fixtures inserted or changed after given `update_date` watermark, or
+        of all fixtures when there is no watermark yet.
+        """
+        return cls.update_date > since if since is not None else true()
+
+    @classmethod
+    def get_max_update_date_statement(cls, lag: dt.timedelta | None = None) -> Select:
+        """
+        Build a SELECT of the latest `update_date` of fixtures, at most `lag` before now.
+        `update_date` is set when a writing transaction starts, so a transaction still
+        running may commit fixtures updated before the latest visible `update_date`.
+        """
+        max_update_date = func.max(cls.update_date)
+        if lag is None:
+            return select(max_update_date)
+        return select(func.least(max_update_date, func.localtimestamp() - lag))
+
+    @classmethod
+    def get_max_update_date(cls, lag: dt.timedelta | None = None) -> dt.datetime | None:
+        """
+        Return the latest `update_date` of fixtures, the next refresh watermark. With
+        `lag`, the watermark stays behind fixtures of transactions that may not have
+        committed yet, see `get_max_update_date_statement`.
+        """
+        return cls.get_scalar(cls.get_max_update_date_statement(lag))
+
+    @classmethod
+    def get_team_ids_statement(cls, condition: ColumnElement) -> Select:
+        """Build a SELECT of ids of home and away teams of fixtures matching condition."""
+        return union(
+            select(cls.home_team_id.label("team_id")).where(condition),
+            select(cls.away_team_id.label("team_id")).where(condition),
+        )
+
+    @classmethod
+    def get_upcoming_fixtures_statement(cls) -> Select:
+        now = dt.datetime.now()
+        return (
+            select(cls.__table__)
+            .where(
+                (cls.date > now)
+                & (cls.date < now + dt.timedelta(days=5))
+                & cls.get_seasons_since_condition(now)
+            )
+            .order_by(asc(cls.date))
+        )
 
     @classmethod
     def get_upcoming_fixtures(cls) -> pd.DataFrame:
-        with cls.db.get_session() as session:
-            try:
-                upcoming_fixtures_df = pd.read_sql_query(
-                    session.query(cls)
-                    .filter(
-                        text(
-                            f"date > '{dt.datetime.now()}' and date < '{dt.datetime.now()+dt.timedelta(days=5)}'"
-                        )
-                    )
-                    .order_by(asc(cls.date))
-                    .statement,
-                    cls.db.engine,
-                ).drop(
-                    columns=[
-                        "league_id",
-                        "season_year",
-                        "status",
-                        "home_team_id",
-                        "away_team_id",
-                        "goals_home",
-                        "goals_away",
-                        "goals_home_ht",
-                        "goals_away_ht",
-                        "update_date",
-                    ]
-                )
-            except InvalidRequestError as e:
-                raise InvalidRequestError(
-                    f"Error while reading {cls.__name__} data: {e}"
-                )
+        try:
+            upcoming_fixtures_df = cls.db.read_df(
+                cls.get_upcoming_fixtures_statement()
+            ).drop(
+                columns=[
+                    "league_id",
+                    "season_year",
+                    "status",
+                    "home_team_id",
+                    "away_team_id",
+                    "goals_home",
+                    "goals_away",
+                    "goals_home_ht",
+                    "goals_away_ht",
+                    "update_date",
+                    "match_date",
+                ]
+            )
+        except InvalidRequestError as e:
+            raise InvalidRequestError(f"Error while reading {cls.__name__} data: {e}")
         return upcoming_fixtures_df
+
+
+# Indexes of hot query patterns. On existing databases they are created without blocking
+# writes by `python -m services.migrations`.
+Index("ix_fixtures_season_home_team", Fixture.season_year, Fixture.home_team_id)
+Index("ix_fixtures_season_away_team", Fixture.season_year, Fixture.away_team_id)
+Index("ix_fixtures_league_season", Fixture.league_id, Fixture.season_year)
+Index(
+    "ix_fixtures_breaks_date",
+    Fixture.date,
+    postgresql_where=Fixture.get_breaks_condition(),
+)
+Index("ix_fixtures_date_brin", Fixture.date, postgresql_using="brin")
+Index("ix_fixtures_match_date_status", Fixture.match_date, Fixture.status)
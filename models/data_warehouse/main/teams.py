@@ -42,7 +42,10 @@ class Team(Base):
         # Mark which teams exists in Team table and which do not
         merged_df = pd.merge(
             unique_team_ids_df,
-            cls.get_df_from_table(),
+            cls.get_df_from_table(
+                columns=["team_id"],
+                where=cls.team_id.in_(pd.Series(unique_team_ids).dropna().tolist()),
+            ),
             on="team_id",
             how="left",
             indicator=True,
@@ -115,7 +118,10 @@ class Team(Base):
         concatenated_df = pd.concat([missing_teams_to_insert_df, deduplicated_teams_df])
         # Add country_id from League table
         final_df = pd.merge(
-            concatenated_df, Country.get_df_from_table(), on="country_name", how="left"
+            concatenated_df,
+            Country.get_df_from_table(columns=["country_id", "country_name"]),
+            on="country_name",
+            how="left",
         ).filter(items=["team_id", "country_id", "country_name", "team_name", "logo"])
         if not final_df.empty:
             Team.upsert(final_df)
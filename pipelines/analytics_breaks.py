@@ -14,9 +14,15 @@ class AnalyticsBreaksPipeline(BasePipeline):
         super().__init__(entity_config)
 
     def fetch(self) -> None:
-        """Fetch data using the get_method from config."""
+        """
+        Fetch data using the get_method from config. Entities with a refresh_method are
+        refreshed inside the database instead and have nothing to process or load.
+        """
         config = self.config
-        if "get_method" in config and config["get_method"]:
+        if "refresh_method" in config and config["refresh_method"]:
+            logging.info(f"Refreshing {self._current_entity_name}")
+            config["refresh_method"]()
+        elif "get_method" in config and config["get_method"]:
             logging.info(f"Fetching data for {self._current_entity_name}")
             try:
                 self._current_df = config["get_method"]()
@@ -32,6 +38,8 @@ class AnalyticsBreaksPipeline(BasePipeline):
     def process(self) -> None:
         """Process data using dependencies from config."""
         config = self.config
+        if "refresh_method" in config:
+            return
         if self._current_df.empty:
             logging.warning(f"No data to process for {self._current_entity_name}")
             return
@@ -59,6 +67,8 @@ class AnalyticsBreaksPipeline(BasePipeline):
         """Upsert processed data to the database using upsert_method from config."""
         config = self.config
         df = self._current_df
+        if "refresh_method" in config:
+            return
         if "upsert_method" in config and config["upsert_method"] and not df.empty:
             logging.info(f"Upserting data for {self._current_entity_name} to DB...")
             try:
@@ -63,6 +63,11 @@ class BasePipeline(ABC):
         logging.info(f"Finished pipeline: {type(self).__name__}")
 
     def run(self, method: str = "run") -> None:
+        # Pipelines read what their previous steps wrote, so replicas are not used
+        with self.db.primary():
+            self._run_entities(method)
+
+    def _run_entities(self, method: str) -> None:
         methods = {"fetch": self.fetch, "process": self.process, "load": self.load}
         for entity_name in self.entity_config.keys():
             logging.info(
@@ -3,8 +3,12 @@ from config.entity_names import (
     FIXTURE_STATS_DIR,
     FIXTURE_PLAYER_STATS_DIR,
     FIXTURE_EVENTS_DIR,
+    LEAGUES_DIR,
+)
+from data_processing.data_aggregations import (
+    refresh_breaks,
+    refresh_breaks_team_stats_shares,
 )
-from data_processing.data_aggregations import aggregate_breaks_team_stats_from_raw
 from data_processing.data_parsing import (
     parse_seasons,
     parse_leagues,
@@ -14,7 +18,6 @@ from data_processing.data_parsing import (
     parse_fixture_player_stats_file,
     parse_fixture_events_file,
 )
-from models.analytics.breaks import Break, BreaksTeamStats
 from models.data_warehouse.main import Team, Season, League
 from models.data_warehouse.fixtures import (
     Fixture,
@@ -38,7 +41,9 @@ MAIN_ENTITIES_CONFIG = {
     #     "upsert_method": Country.upsert,
     # },
     "leagues": {
-        "api_pull_method": GenericFetcher().pull_single_endpoint("leagues"),
+        "api_pull_method": GenericFetcher(entity=LEAGUES_DIR).pull_single_endpoint(
+            "leagues"
+        ),
         "parse_method": parse_leagues,
         "upsert_method": League.upsert,
     },
@@ -94,14 +99,13 @@ FIXTURE_ENTITIES_CONFIG = {
 }
 
 ANALYTICS_BREAKS_ENTITIES_CONFIG = {
+    # Refreshed inside the database from fixtures changed since the last run, together
+    # with breaks_team_stats
     "breaks": {
-        "get_method": Fixture.get_breaks,
-        "dependencies": [],
-        "upsert_method": Break.upsert,
+        "refresh_method": refresh_breaks,
     },
-    "breaks_team_stats": {
-        "get_method": Break.get_breaks_team_stats_raw,
-        "dependencies": [aggregate_breaks_team_stats_from_raw],
-        "upsert_method": BreaksTeamStats.upsert,
+    # Recomputed from breaks_team_stats and replaced as a whole
+    "breaks_team_stats_shares": {
+        "refresh_method": refresh_breaks_team_stats_shares,
     },
 }
@@ -1,6 +1,6 @@
 import logging
 import sys
-from typing import Any
+from typing import Any, Iterator
 
 import pandas as pd
 
@@ -8,6 +8,7 @@ from data_processing.data_processing import load_json_file_names_from_directory
 from data_processing.json_processor import JsonProcessor
 from pipelines.base import BasePipeline
 from pipelines.config import FIXTURE_ENTITIES_CONFIG
+from services.api.fetch_jobs import retry_failed_requests
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -17,6 +18,8 @@ logging.basicConfig(
 class FixturesPipeline(BasePipeline):
     def __init__(self, entity_config: dict[str, dict[str, Any]]):
         super().__init__(entity_config)
+        # Parsed batches of the current entity, consumed by `load`
+        self._current_frames: Iterator[pd.DataFrame] = iter(())
 
     def fetch(self) -> None:
         """Fetch data from API and save it to JSON files."""
@@ -31,14 +34,20 @@ class FixturesPipeline(BasePipeline):
             logging.info(f"Calling api_pull_method for {self._current_entity_name}")
             try:
                 config["api_pull_method"](dates)
+                # Items of earlier pulls not covered by this one, e.g. of other dates
+                retry_failed_requests([self._current_entity_name])
             except Exception as e:
                 logging.error(
                     f"Error fetching data for {self._current_entity_name}: {e}"
                 )
 
     def process(self) -> None:
-        """Process files or data for the current entity."""
+        """
+        Prepare parsing of files for the current entity. Files are parsed lazily while
+        `load` upserts them, so only a batch of parsed rows is held in memory at once.
+        """
         config = self.config
+        self._current_frames = iter(())
         try:
             file_paths = load_json_file_names_from_directory(self._current_entity_name)
             logging.info(
@@ -52,36 +61,47 @@ class FixturesPipeline(BasePipeline):
             processor = JsonProcessor(
                 parse_method=config.get("parse_method"), batch_size=100, num_processes=2
             )
-            self._current_df = processor.process_files(file_paths)
+            self._current_frames = processor.iter_files(file_paths)
         else:
-            dataframes = [config["parse_method"](fp) for fp in file_paths]
-            self._current_df = pd.concat(dataframes) if dataframes else pd.DataFrame()
-
-            # Apply dependencies in both modes if they exist
-        if "dependencies" in config and config["dependencies"]:
-            for dep in config["dependencies"]:
-                logging.info(
-                    f"Applying dependency {dep.__name__} for {self._current_entity_name}"
-                )
-                dep(self._current_df)
+            self._current_frames = (config["parse_method"](fp) for fp in file_paths)
 
     def load(self) -> None:
-        """Upsert processed data to the database."""
-        config = self.config
-        df = self._current_df
+        """
+        Upsert parsed data to the database as it is parsed.
 
-        if "upsert_method" in config and config["upsert_method"] and not df.empty:
-            logging.info(f"Upserting data for {self._current_entity_name} to DB...")
-            try:
-                config["upsert_method"](df)
-            except Exception as e:
-                logging.error(
-                    f"Error upserting data for {self._current_entity_name}: {e}"
-                )
-        else:
+        Dependencies (e.g. missing teams) of each batch and the upsert run in one unit of
+        work, so the entity is committed once or not at all. Batches are still parsed
+        and written chunk by chunk, only one of them is held in memory at once.
+        """
+        config = self.config
+        if not config.get("upsert_method"):
             logging.warning(
-                f"No upsert_method or empty DataFrame for {self._current_entity_name}, skipping load."
+                f"No upsert_method for {self._current_entity_name}, skipping load."
             )
+            return
+
+        logging.info(f"Upserting data for {self._current_entity_name} to DB...")
+        try:
+            with self.db.transaction():
+                config["upsert_method"](self._iter_frames_with_dependencies())
+        except Exception as e:
+            logging.error(f"Error upserting data for {self._current_entity_name}: {e}")
+
+    def _iter_frames_with_dependencies(self) -> Iterator[pd.DataFrame]:
+        """Yield non-empty parsed batches after applying dependencies to each."""
+        loaded = False
+        for df in self._current_frames:
+            if df.empty:
+                continue
+            for dep in self.config.get("dependencies") or []:
+                logging.info(
+                    f"Applying dependency {dep.__name__} for {self._current_entity_name}"
+                )
+                dep(df)
+            loaded = True
+            yield df
+        if not loaded:
+            logging.warning(f"No data to load for {self._current_entity_name}.")
 
 
 if __name__ == "__main__":
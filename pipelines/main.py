@@ -6,6 +6,7 @@ import pandas as pd
 
 from pipelines.config import MAIN_ENTITIES_CONFIG
 from pipelines.base import BasePipeline
+from services.api.fetch_jobs import retry_failed_requests
 
 
 class MainPipeline(BasePipeline):
@@ -18,6 +19,8 @@ class MainPipeline(BasePipeline):
         if "api_pull_method" in config and config["api_pull_method"]:
             logging.info(f"Fetching data for {self._current_entity_name}")
             config["api_pull_method"]()
+            # Items of earlier pulls that failed and are not covered by this one
+            retry_failed_requests([self._current_entity_name])
 
         self._current_df = pd.DataFrame()
 
@@ -1,71 +1,261 @@
+import gzip
 import json
 import logging
 import os
+import re
+import time
+from typing import Callable, Optional
+
 import requests
-from typing import Optional
 from requests import Response
 
 from config.api_config import ApiConfig
-from config.vars import DATA_DIR, ROOT_DIR
+from config.vars import (
+    DATA_DIR,
+    REQUEST_BACKOFF_BASE_SECONDS,
+    REQUEST_CONNECT_TIMEOUT,
+    REQUEST_MAX_RETRIES,
+    REQUEST_POOL_SIZE,
+    REQUEST_READ_TIMEOUT,
+    REQUEST_RETRY_STATUS_CODES,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_COMPRESSION,
+    RESPONSE_COMPRESSION_LEVEL,
+    ROOT_DIR,
+)
+from services.api.http_session import (
+    RequestTimings,
+    create_session,
+    get_with_timings,
+)
+from services.api.response_cache import ResponseCache, response_cache
+from services.api.retry import (
+    CircuitBreaker,
+    RequestFailedError,
+    get_backoff,
+    get_retry_after,
+)
+from services.api.retry_queue import RetryQueue, retry_queue
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Count of items the API reports ahead of the "response" payload
+RESULTS_PATTERN = re.compile(rb'"results"\s*:\s*(\d+)')
+
 
 class ApiFetcher:
     """
     Base class for handling HTTP requests to the external API.
     Provides:
-      - Quota check
-      - Basic GET request logic
-      - JSON writing to disk
+      - Quota check against the ledger shared by all processes, within the budget of
+        the fetcher's `entity`
+      - Reuse of responses cached on disk instead of new requests
+      - Basic GET request logic on a pooled keep-alive session
+      - Retries of throttled, failed and timed out requests with jittered exponential
+        backoff honoring Retry-After, each taken from the quota, and a circuit breaker
+        pausing all requests of the fetcher while the upstream is degraded
+      - Connect, TLS, first byte and body timings of each request
+      - Writing of raw response bytes to disk, optionally gzip-compressed
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        pool_size: int = REQUEST_POOL_SIZE,
+        cache: Optional[ResponseCache] = (
+            response_cache if RESPONSE_CACHE_ENABLED else None
+        ),
+        entity: Optional[str] = None,
+    ) -> None:
         self.config = ApiConfig()
+        self.cache = cache
+        # Entity whose quota budget requests are taken from, see API_QUOTA_PRIORITIES
+        self.entity = entity
+        self.session = create_session(pool_size)
+        self.timeout = (REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT)
+        self.request_timings: list[RequestTimings] = []
+        self.max_retries = REQUEST_MAX_RETRIES
+        self.backoff_base = REQUEST_BACKOFF_BASE_SECONDS
+        self.circuit_breaker = CircuitBreaker()
+        # Items of list pulls whose requests failed, re-fetched by later pulls
+        self.retry_queue: Optional[RetryQueue] = retry_queue
 
     def fetch_data(self, endpoint: str, **params) -> Optional[Response]:
+        """
+        Returns the cached response of the endpoint with given params, or requests it.
+        Returns a Response object or None if the request or data is invalid.
+        """
+        response = self.get_cached_response(endpoint, **params)
+        if response is not None:
+            return response
+        return self.request_data(endpoint, **params)
+
+    def get_cached_response(self, endpoint: str, **params) -> Optional[Response]:
+        """
+        Returns the response of the endpoint with given params from the cache, marked
+        with `from_cache`, or None when it is not cached.
+        """
+        if self.cache is None:
+            return None
+        content = self.cache.get(endpoint, params)
+        if content is None:
+            return None
+        logging.info(f"Using cached response of: {endpoint}, params={params}")
+        response = Response()
+        response.status_code = 200
+        response.url = f"{self.config.get_base_url()}/{endpoint}"
+        response.encoding = "utf-8"
+        response._content = content
+        response.from_cache = True
+        return response
+
+    def request_data(self, endpoint: str, **params) -> Optional[Response]:
         """
         Executes a GET request to the specified endpoint with given params.
-        Checks API quota before requesting.
+        Takes the request from the API quota before requesting.
         Returns a Response object or None if the request or data is invalid.
         """
-        # 1. Check subscription status before making the request
-        if not self.config.has_quota():
-            raise Exception("Quota exceeded. Cannot make any more requests.")
+        if not self.reserve_request():
+            raise Exception(
+                f"Quota exceeded. Cannot make any more requests for: {self.entity}."
+            )
+        return self.send_request(endpoint, **params)
+
+    def reserve_request(self) -> bool:
+        """
+        Takes one request of today's API quota within the budget of the fetcher's
+        entity. Returns False when none is left.
+        """
+        # Syncs the shared ledger with the subscription status when it is stale
+        if not self.config.has_quota(self.session):
+            return False
+        return self.config.ledger.try_consume(self.entity)
 
+    def send_request(
+        self,
+        endpoint: str,
+        reserve_retry: Optional[Callable[[], bool]] = None,
+        **params,
+    ) -> Optional[Response]:
+        """
+        Executes a GET request to the specified endpoint with given params, whose quota
+        was reserved, and caches non-empty responses. Retries statuses of
+        REQUEST_RETRY_STATUS_CODES and connection errors, taking each retry from the
+        quota with `reserve_retry`, `reserve_request` by default.
+        Returns a Response object or None if the request or data is invalid.
+
+        Raises:
+            RequestFailedError: When the request failed on every attempt or no quota is
+                left for a retry, or `CircuitOpenError` when the upstream is down.
+        """
         url = f"{self.config.get_base_url()}/{endpoint}"
         headers = self.config.get_headers()
+        reserve_retry = reserve_retry or self.reserve_request
 
-        logging.info(f"Fetching data from: {url}, params={params}")
-        response = requests.get(url, headers=headers, params=params)
+        for attempt in range(self.max_retries + 1):
+            if attempt and not reserve_retry():
+                raise RequestFailedError(
+                    f"{url} failed after {attempt} attempts, no quota left to retry: "
+                    f"{error}"
+                )
+            self.circuit_breaker.before_request()
+            logging.info(f"Fetching data from: {url}, params={params}")
+            retry_after = None
+            try:
+                response, timings = get_with_timings(
+                    self.session,
+                    url,
+                    headers=headers,
+                    params=params,
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            else:
+                self.request_timings.append(timings)
+                logging.debug(
+                    f"{url} took {timings.total:.3f}s: "
+                    f"connect {timings.connect:.3f}s, TLS {timings.tls:.3f}s, "
+                    f"first byte {timings.first_byte:.3f}s, body {timings.body:.3f}s"
+                )
+                if response.status_code not in REQUEST_RETRY_STATUS_CODES:
+                    self.circuit_breaker.record_success()
+                    break
+                error = f"API returned status code: {response.status_code}"
+                retry_after = get_retry_after(response)
+            self.circuit_breaker.record_failure(retry_after)
+            if attempt == self.max_retries:
+                raise RequestFailedError(
+                    f"{url} failed after {attempt + 1} attempts: {error}"
+                )
+            if retry_after is None:
+                delay = get_backoff(attempt, self.backoff_base)
+                logging.warning(f"{error}, retrying {url} in {delay:.1f}s")
+                time.sleep(delay)
+            else:
+                # The circuit breaker pauses for it before the next attempt
+                logging.warning(f"{error}, retrying {url} after {retry_after:.1f}s")
 
         if response.status_code == 200:
-            if not response.json().get("response"):
+            if self.is_empty_response(response.content):
                 logging.info("Response is empty. No data returned.")
                 return None
+            if self.cache is not None:
+                self.cache.set(endpoint, params, response.content)
             return response
         else:
             logging.error(f"API returned status code: {response.status_code}")
             return None
 
+    @staticmethod
+    def is_empty_response(content: bytes) -> bool:
+        """
+        Checks whether the API returned no items. The "results" count is read from the
+        raw bytes, the payload is decoded only when the count is missing.
+        """
+        match = RESULTS_PATTERN.search(content)
+        if match:
+            return int(match.group(1)) == 0
+        try:
+            return not json.loads(content).get("response")
+        except (ValueError, AttributeError):
+            return True
+
+    def close(self) -> None:
+        """Closes pooled connections of the session."""
+        self.session.close()
+
     @staticmethod
     def write_response_to_json(
-        response: Response, filename: str, subdir: str = ""
+        response: Response,
+        filename: str,
+        subdir: str = "",
+        compress: bool = RESPONSE_COMPRESSION,
     ) -> None:
         """
-        Writes the API JSON response to a local file.
+        Writes the API JSON response to a local file as received, without decoding it.
+        Compressed responses are stored as ".json.gz" and replace a plain ".json" file
+        of the same name, and the other way round.
         Creates directories if they do not exist.
         """
         if not response:
             return
         file_path = os.path.join(ROOT_DIR, DATA_DIR, subdir, f"{filename}.json")
+        stale_path = file_path
+        content = response.content
+        if compress:
+            file_path = f"{file_path}.gz"
+            content = gzip.compress(content, compresslevel=RESPONSE_COMPRESSION_LEVEL)
+        else:
+            stale_path = f"{file_path}.gz"
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                json.dump(response.json(), file)
+            with open(file_path, "wb") as file:
+                file.write(content)
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
         except (AttributeError, IOError) as e:
             logging.error(f"Failed to write to '{file_path}': {e}")
             raise e
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from config.vars import (
+    REQUEST_BURST,
+    REQUEST_CONCURRENCY,
+    REQUEST_LIMIT_PER_MINUTE,
+    REQUEST_POOL_SIZE,
+)
+from services.api.generic_fetcher import GenericFetcher
+from services.api.http_session import RequestTimings
+from services.api.rate_limiter import TokenBucket
+from services.api.retry import CircuitOpenError, RequestFailedError
+
+
+@dataclass
+class FetchStats:
+    """
+    Outcome of a concurrent pull: requests made, responses taken from the cache and
+    written, time taken and average request phases.
+    """
+
+    requests: int = 0
+    cached: int = 0
+    # Items left unfetched once the entity's quota budget ran out
+    over_budget: int = 0
+    written: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    new_connections: int = 0
+    mean_timings: RequestTimings = field(default_factory=RequestTimings)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+
+class AsyncFetcher(GenericFetcher):
+    """
+    Fetcher keeping several requests in flight with asyncio.
+    Provides:
+      - Up to `concurrency` concurrent requests, each run in a worker thread
+      - Cache lookups before a token is taken, so cached responses are not paced
+      - Stop of the pull once the quota budget of the fetcher's entity is spent
+      - Queueing of items whose requests failed, all remaining ones while the
+        upstream is down
+      - Request pacing by a token bucket instead of a fixed sleep after each request,
+        so request latency does not lower throughput, retries included
+      - Writing of each response as soon as it arrives
+      - Achieved requests per second of the last pull in `last_stats`
+    """
+
+    def __init__(
+        self,
+        concurrency: int = REQUEST_CONCURRENCY,
+        rate_limiter: Optional[TokenBucket] = None,
+        entity: Optional[str] = None,
+    ) -> None:
+        # A pooled connection for every request in flight
+        super().__init__(pool_size=max(concurrency, REQUEST_POOL_SIZE), entity=entity)
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.last_stats = FetchStats()
+
+    def pull_data_for_list(
+        self,
+        values: List[str],
+        endpoint_template: str,
+        filename_prefix: str,
+        subdir: str,
+        sleep_time: Optional[float] = None,
+        extra_params: dict = None,
+        transform_value_func: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        """
+        Fetches data for each item in 'values' list concurrently, see
+        `GenericFetcher.pull_data_for_list`. `sleep_time` is ignored, requests are paced
+        by the rate limiter.
+        """
+        extra_params = extra_params or {}
+        values, retried = self._add_queued_values(
+            values, endpoint_template, extra_params
+        )
+        if not values:
+            logging.info("No items to fetch. Exiting.")
+            return
+        # Checked once up front, so concurrent requests do not race on the status call
+        if not self.config.has_quota(self.session):
+            raise Exception("Quota exceeded. Cannot make any more requests.")
+        logging.info(
+            f"Quota budget of {self.entity}: {self.config.ledger.get_budget(self.entity)} "
+            f"of {self.config.ledger.get_remaining()} requests left today"
+        )
+
+        self.last_stats = asyncio.run(
+            self.pull_data_for_list_async(
+                values,
+                endpoint_template,
+                filename_prefix,
+                subdir,
+                extra_params=extra_params,
+                transform_value_func=transform_value_func,
+                retried=retried,
+            )
+        )
+
+    async def pull_data_for_list_async(
+        self,
+        values: List[str],
+        endpoint_template: str,
+        filename_prefix: str,
+        subdir: str,
+        extra_params: dict = None,
+        transform_value_func: Optional[Callable[[str], str]] = None,
+        retried: Optional[set[str]] = None,
+    ) -> FetchStats:
+        """
+        Fetches data for each item in 'values' list with at most `concurrency` requests
+        in flight and writes responses as they arrive. Items whose requests failed are
+        queued for retry, items in `retried` are removed from the queue once fetched.
+
+        Returns:
+            FetchStats: Counts of requests and written responses, and the elapsed time.
+        """
+        extra_params = extra_params or {}
+        retried = retried or set()
+        # Created in the running event loop
+        rate_limiter = self.rate_limiter or TokenBucket.from_limit_per_minute(
+            REQUEST_LIMIT_PER_MINUTE, REQUEST_BURST
+        )
+        stats = FetchStats()
+        loop = asyncio.get_running_loop()
+
+        def reserve_retry() -> bool:
+            """Takes a token and quota for a retry, from the worker thread."""
+            asyncio.run_coroutine_threadsafe(rate_limiter.acquire(), loop).result()
+            return self.reserve_request()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in values:
+            queue.put_nowait(item)
+
+        async def worker() -> None:
+            while not queue.empty():
+                item = queue.get_nowait()
+                final_value = (
+                    transform_value_func(item) if transform_value_func else item
+                )
+                endpoint = endpoint_template.format(final_value)
+                try:
+                    response = await asyncio.to_thread(
+                        self.get_cached_response, endpoint, **extra_params
+                    )
+                    if response is not None:
+                        stats.cached += 1
+                    else:
+                        await rate_limiter.acquire()
+                        if not await asyncio.to_thread(self.reserve_request):
+                            stats.over_budget += 1 + queue.qsize()
+                            while not queue.empty():
+                                queue.get_nowait()
+                            break
+                        stats.requests += 1
+                        response = await asyncio.to_thread(
+                            self.send_request, endpoint, reserve_retry, **extra_params
+                        )
+                    if str(item) in retried:
+                        await asyncio.to_thread(
+                            self.retry_queue.remove,
+                            [str(item)],
+                            endpoint_template,
+                            extra_params,
+                        )
+                    if response:
+                        await asyncio.to_thread(
+                            self.write_response_to_json,
+                            response,
+                            f"{filename_prefix}{final_value}",
+                            subdir,
+                        )
+                        stats.written += 1
+                    else:
+                        logging.info(f"No data for item: {item}")
+                except CircuitOpenError as e:
+                    # Items of all workers are set aside until the upstream recovers
+                    failed = [item]
+                    while not queue.empty():
+                        failed.append(queue.get_nowait())
+                    stats.failed += len(failed)
+                    logging.error(f"{e} Queueing {len(failed)} items for retry.")
+                    await asyncio.to_thread(
+                        self._queue_for_retry,
+                        failed,
+                        endpoint_template,
+                        filename_prefix,
+                        subdir,
+                        extra_params,
+                        str(e),
+                    )
+                    break
+                except RequestFailedError as e:
+                    stats.failed += 1
+                    logging.error(f"{e} Queueing item for retry: {item}")
+                    await asyncio.to_thread(
+                        self._queue_for_retry,
+                        [item],
+                        endpoint_template,
+                        filename_prefix,
+                        subdir,
+                        extra_params,
+                        str(e),
+                    )
+                except Exception as e:
+                    stats.failed += 1
+                    logging.error(f"Error while fetching {endpoint}: {e}")
+
+        started_at = time.monotonic()
+        timings_start = len(self.request_timings)
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.concurrency, len(values))))
+        )
+        stats.elapsed = time.monotonic() - started_at
+        timings = self.request_timings[timings_start:]
+        stats.new_connections = sum(timing.is_new_connection for timing in timings)
+        stats.mean_timings = RequestTimings.mean(timings)
+        logging.info(
+            f"Fetched {stats.requests} items in {stats.elapsed:.1f}s "
+            f"({stats.requests_per_second:.2f} requests/s), {stats.cached} from cache: "
+            f"{stats.written} written, {stats.failed} failed"
+        )
+        if stats.over_budget:
+            logging.warning(
+                f"Quota budget of {self.entity} spent, {stats.over_budget} items left "
+                f"unfetched"
+            )
+        if self.cache is not None:
+            self.cache.log_stats()
+        logging.info(
+            f"Mean request time {stats.mean_timings.total:.3f}s: "
+            f"connect {stats.mean_timings.connect:.3f}s, "
+            f"TLS {stats.mean_timings.tls:.3f}s, "
+            f"first byte {stats.mean_timings.first_byte:.3f}s, "
+            f"body {stats.mean_timings.body:.3f}s; "
+            f"{stats.new_connections} new connections"
+        )
+        return stats
@@ -1,14 +1,34 @@
 import logging
-from typing import List
+from typing import List, Optional
+
+from config.entity_names import (
+    COACHES_DIR,
+    FIXTURE_EVENTS_DIR,
+    FIXTURE_PLAYER_STATS_DIR,
+    FIXTURE_STATS_DIR,
+    FIXTURES_DIR,
+    TEAMS_DIR,
+)
 from models.data_warehouse.main import Team, Country
-from services.api.generic_fetcher import GenericFetcher
+from services.api.async_fetcher import AsyncFetcher
+from services.api.retry_queue import retry_queue
+
+
+def retry_failed_requests(entities: Optional[List[str]] = None) -> None:
+    """
+    Re-fetches only the items whose requests failed in earlier pulls, of given entities
+    or of every entity.
+    """
+    for entity in retry_queue.get_entities():
+        if entities is None or entity in entities:
+            AsyncFetcher(entity=entity).retry_failed()
 
 
 def pull_coaches_for_all_teams():
     """
     Example job that fetches all teams from DB, then pulls coaches for each team.
     """
-    fetcher = GenericFetcher()
+    fetcher = AsyncFetcher(entity=COACHES_DIR)
     teams_df = Team.get_df_from_table()
     team_ids = [str(x) for x in teams_df["team_id"]]  # ensure strings
     fetcher.pull_data_for_list(
@@ -23,7 +43,7 @@ def pull_fixtures_by_dates(dates_to_pull: List[str]) -> None:
     if not dates_to_pull:
         logging.info("No dates to update for fixtures.")
         return
-    fetcher = GenericFetcher()
+    fetcher = AsyncFetcher(entity=FIXTURES_DIR)
     fetcher.pull_data_by_dates(
         dates=dates_to_pull,
         endpoint_template="fixtures?date={}",
@@ -36,7 +56,7 @@ def pull_events_by_dates(dates_to_pull: List[str]) -> None:
     if not dates_to_pull:
         logging.info("No dates to update for fixture events.")
         return
-    fetcher = GenericFetcher()
+    fetcher = AsyncFetcher(entity=FIXTURE_EVENTS_DIR)
     fetcher.pull_data_by_dates(
         dates=dates_to_pull,
         endpoint_template="fixtures/events?fixture={}",
@@ -49,7 +69,7 @@ def pull_fixtures_stats_by_dates(dates_to_pull: List[str]) -> None:
     if not dates_to_pull:
         logging.info("No dates to update for player stats.")
         return
-    fetcher = GenericFetcher()
+    fetcher = AsyncFetcher(entity=FIXTURE_STATS_DIR)
     fetcher.pull_data_by_dates(
         dates=dates_to_pull,
         endpoint_template="fixtures/stats?fixture={}",
@@ -62,7 +82,7 @@ def pull_player_stats_by_dates(dates_to_pull: List[str]) -> None:
     if not dates_to_pull:
         logging.info("No dates to update for player stats.")
         return
-    fetcher = GenericFetcher()
+    fetcher = AsyncFetcher(entity=FIXTURE_PLAYER_STATS_DIR)
     fetcher.pull_data_by_dates(
         dates=dates_to_pull,
         endpoint_template="fixtures/players?fixture={}",
@@ -72,7 +92,7 @@ def pull_player_stats_by_dates(dates_to_pull: List[str]) -> None:
 
 
 def pull_teams_for_all_countries():
-    fetcher = GenericFetcher()
+    fetcher = AsyncFetcher(entity=TEAMS_DIR)
     all_countries = Country.get_df_from_table()
     fetcher.pull_data_for_list(
         values=all_countries["country_name"].dropna().tolist(),
@@ -86,7 +106,7 @@ def pull_fixture_stats_by_ids(fixture_ids: list[int]):
     if not fixture_ids:
         logging.info("No fixtures to update for fixture stats.")
         return
-    fetcher = GenericFetcher()
+    fetcher = AsyncFetcher(entity=FIXTURE_STATS_DIR)
     string_ids = [str(x) for x in fixture_ids]
     fetcher.pull_data_for_list(
         values=string_ids,
@@ -5,6 +5,7 @@ from typing import Callable, List, Optional
 
 from config.vars import SLEEP_TIME
 from services.api.api_fetcher import ApiFetcher
+from services.api.retry import CircuitOpenError, RequestFailedError
 
 
 class GenericFetcher(ApiFetcher):
@@ -13,6 +14,8 @@ class GenericFetcher(ApiFetcher):
       - Pulling data by date
       - Pulling data for a list of IDs (fixtures, teams, coaches, etc.)
       - Single or multiple endpoints
+      - Queueing of items whose requests failed, re-fetched by the next pull of the
+        same endpoint or by `retry_failed`
     Minimizes code duplication: pass relevant parameters for each scenario.
     """
 
@@ -39,22 +42,128 @@ class GenericFetcher(ApiFetcher):
         :param transform_value_func: optional function to transform each item into a string
                                      for the endpoint (e.g. int -> str).
         """
+        extra_params = extra_params or {}
+        values, retried = self._add_queued_values(
+            values, endpoint_template, extra_params
+        )
         if not values:
             logging.info("No items to fetch. Exiting.")
             return
 
-        extra_params = extra_params or {}
+        try:
+            self._pull_items(
+                values,
+                endpoint_template,
+                filename_prefix,
+                subdir,
+                sleep_time,
+                extra_params,
+                transform_value_func,
+                retried,
+            )
+        finally:
+            if self.cache is not None:
+                self.cache.log_stats()
 
-        for item in values:
+    def _pull_items(
+        self,
+        values: List[str],
+        endpoint_template: str,
+        filename_prefix: str,
+        subdir: str,
+        sleep_time: int,
+        extra_params: dict,
+        transform_value_func: Optional[Callable[[str], str]],
+        retried: set[str],
+    ) -> None:
+        for index, item in enumerate(values):
             final_value = transform_value_func(item) if transform_value_func else item
             endpoint = endpoint_template.format(final_value)
-            response = self.fetch_data(endpoint, **extra_params)
+            try:
+                response = self.fetch_data(endpoint, **extra_params)
+            except CircuitOpenError as e:
+                logging.error(f"{e} Queueing {len(values) - index} items for retry.")
+                self._queue_for_retry(
+                    values[index:],
+                    endpoint_template,
+                    filename_prefix,
+                    subdir,
+                    extra_params,
+                    str(e),
+                )
+                return
+            except RequestFailedError as e:
+                logging.error(f"{e} Queueing item for retry: {item}")
+                self._queue_for_retry(
+                    [item],
+                    endpoint_template,
+                    filename_prefix,
+                    subdir,
+                    extra_params,
+                    str(e),
+                )
+                time.sleep(sleep_time)
+                continue
+            if str(item) in retried:
+                self.retry_queue.remove([str(item)], endpoint_template, extra_params)
             if response:
                 filename = f"{filename_prefix}{final_value}"
                 self.write_response_to_json(response, filename, subdir)
             else:
                 logging.info(f"No data for item: {item}")
-            time.sleep(sleep_time)
+            # Responses from the cache spend no request
+            if not getattr(response, "from_cache", False):
+                time.sleep(sleep_time)
+
+    def _add_queued_values(
+        self, values: List[str], endpoint_template: str, extra_params: dict
+    ) -> tuple[List[str], set[str]]:
+        """
+        Appends items queued by failed pulls of the same endpoint and params.
+
+        Returns:
+            tuple[List[str], set[str]]: All items to fetch, and the queued ones.
+        """
+        if self.retry_queue is None:
+            return values, set()
+        queued = self.retry_queue.get_values(endpoint_template, extra_params)
+        if not queued:
+            return values, set()
+        logging.info(f"Retrying {len(queued)} queued items of {endpoint_template}")
+        pulled = {str(value) for value in values}
+        return list(values) + [value for value in queued if value not in pulled], set(
+            queued
+        )
+
+    def _queue_for_retry(
+        self,
+        values: List[str],
+        endpoint_template: str,
+        filename_prefix: str,
+        subdir: str,
+        extra_params: dict,
+        error: str,
+    ) -> None:
+        if self.retry_queue is not None:
+            self.retry_queue.add(
+                [str(value) for value in values],
+                endpoint_template,
+                filename_prefix,
+                subdir,
+                extra_params,
+                self.entity,
+                error,
+            )
+
+    def retry_failed(self) -> None:
+        """
+        Re-fetches the queued items of all pulls of the fetcher's entity whose requests
+        failed before.
+        """
+        if self.retry_queue is None:
+            return
+        for job in self.retry_queue.get_jobs(self.entity):
+            self.pull_data_for_list([], **job)
 
     def pull_data_by_dates(
         self,
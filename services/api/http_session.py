@@ -0,0 +1,143 @@
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Iterable
+
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config.vars import REQUEST_ACCEPT_ENCODING, REQUEST_POOL_SIZE
+
+# Timings of the request made by the current thread
+_local = threading.local()
+
+
+@dataclass
+class RequestTimings:
+    """
+    Phases of one HTTP request in seconds. Connect and TLS are 0 when a pooled
+    connection is reused, first byte is the wait for response headers.
+    """
+
+    connect: float = 0.0
+    tls: float = 0.0
+    first_byte: float = 0.0
+    body: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.connect + self.tls + self.first_byte + self.body
+
+    @property
+    def is_new_connection(self) -> bool:
+        return self.connect > 0
+
+    @classmethod
+    def mean(cls, timings: Iterable["RequestTimings"]) -> "RequestTimings":
+        """Returns the average of each phase, zeros when there are no timings."""
+        timings = list(timings)
+        if not timings:
+            return cls()
+        return cls(
+            **{
+                phase.name: sum(getattr(timing, phase.name) for timing in timings)
+                / len(timings)
+                for phase in fields(cls)
+            }
+        )
+
+
+def _add_phase(phase: str, seconds: float) -> None:
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        setattr(timings, phase, getattr(timings, phase) + seconds)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _add_phase("connect", time.perf_counter() - started_at)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _add_phase("connect", time.perf_counter() - started_at)
+
+    def connect(self) -> None:
+        """Opens the TCP connection and performs the TLS handshake, timed separately."""
+        timings = getattr(_local, "timings", None)
+        connect_before = timings.connect if timings is not None else 0.0
+        started_at = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            if timings is not None:
+                tcp_time = timings.connect - connect_before
+                timings.tls += time.perf_counter() - started_at - tcp_time
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter whose pooled connections report connect and TLS times."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def create_session(pool_size: int = REQUEST_POOL_SIZE) -> requests.Session:
+    """
+    Creates a session keeping up to `pool_size` connections per host alive, so repeated
+    requests skip the TCP and TLS handshakes, and asking for compressed responses.
+    """
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = REQUEST_ACCEPT_ENCODING
+    return session
+
+
+def get_with_timings(
+    session: requests.Session, url: str, **kwargs: Any
+) -> tuple[Response, RequestTimings]:
+    """
+    Executes a GET request on the session and reads the whole body.
+
+    Returns:
+        tuple[Response, RequestTimings]: The response and its phase timings.
+    """
+    timings = RequestTimings()
+    _local.timings = timings
+    try:
+        response = session.get(url, stream=True, **kwargs)
+        # `elapsed` runs from sending the request to parsing response headers
+        timings.first_byte = max(
+            response.elapsed.total_seconds() - timings.connect - timings.tls, 0.0
+        )
+        started_at = time.perf_counter()
+        response.content
+        timings.body = time.perf_counter() - started_at
+    finally:
+        _local.timings = None
+    return response, timings
@@ -0,0 +1,294 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from config.vars import (
+    API_QUOTA_DEFAULT_PRIORITY,
+    API_QUOTA_LEDGER_FILE,
+    API_QUOTA_PRIORITIES,
+    API_QUOTA_RESERVED_SHARES,
+    API_QUOTA_SYNC_INTERVAL_SECONDS,
+    DATA_DIR,
+    ROOT_DIR,
+)
+
+
+class QuotaPlanner:
+    """
+    Splits the remaining daily API quota across entities by priority.
+    Provides:
+      - Budgets of entities served in priority order, so backfills only get what
+        higher priority pulls leave over
+      - Reserves of `reserved_shares` of the daily limit for higher priority entities
+        that did not pull yet, held until they used them
+      - Proportional split of the quota within entities of the same priority
+    """
+
+    def __init__(
+        self,
+        priorities: Optional[dict[str, int]] = None,
+        reserved_shares: Optional[dict[str, float]] = None,
+        default_priority: int = API_QUOTA_DEFAULT_PRIORITY,
+    ) -> None:
+        self.priorities = API_QUOTA_PRIORITIES if priorities is None else priorities
+        self.reserved_shares = (
+            API_QUOTA_RESERVED_SHARES if reserved_shares is None else reserved_shares
+        )
+        self.default_priority = default_priority
+
+    def get_priority(self, entity: Optional[str]) -> int:
+        return self.priorities.get(entity, self.default_priority)
+
+    def get_reserve(self, entity: str, limit: int, used: dict[str, int]) -> int:
+        """Returns requests still held back today for the entity."""
+        reserved = math.ceil(self.reserved_shares.get(entity, 0) * limit)
+        return max(reserved - used.get(entity, 0), 0)
+
+    def plan(
+        self,
+        demands: dict[Optional[str], int],
+        remaining: int,
+        limit: int,
+        used: dict[str, int],
+    ) -> dict[Optional[str], int]:
+        """
+        Splits the remaining quota across entities requesting it.
+
+        Args:
+            demands (dict): Requests each entity wants to make.
+            remaining (int): Requests left today.
+            limit (int): Daily request limit.
+            used (dict): Requests each entity made today.
+
+        Returns:
+            dict: Requests each entity may make, at most its demand.
+        """
+        allocation = {}
+        for priority in sorted({self.get_priority(entity) for entity in demands}):
+            held = sum(
+                self.get_reserve(entity, limit, used)
+                for entity in self.reserved_shares
+                if entity not in demands and self.get_priority(entity) < priority
+            )
+            tier = {
+                entity: demand
+                for entity, demand in demands.items()
+                if self.get_priority(entity) == priority
+            }
+            tier_allocation = self._split(max(remaining - held, 0), tier)
+            allocation.update(tier_allocation)
+            remaining -= sum(tier_allocation.values())
+        return allocation
+
+    def get_budget(
+        self,
+        entity: Optional[str],
+        remaining: int,
+        limit: int,
+        used: dict[str, int],
+    ) -> int:
+        """Returns requests the entity may make of the remaining quota."""
+        return self.plan({entity: remaining}, remaining, limit, used)[entity]
+
+    @staticmethod
+    def _split(
+        available: int, demands: dict[Optional[str], int]
+    ) -> dict[Optional[str], int]:
+        if sum(demands.values()) <= available:
+            return dict(demands)
+        total = sum(demands.values())
+        allocation = {
+            entity: available * demand // total for entity, demand in demands.items()
+        }
+        # Requests lost to rounding down go to the largest demands
+        leftover = available - sum(allocation.values())
+        for entity in sorted(demands, key=demands.get, reverse=True)[:leftover]:
+            allocation[entity] += 1
+        return allocation
+
+
+class QuotaLedger:
+    """
+    Ledger of API requests made today, in a SQLite file shared by all processes.
+    Provides:
+      - Today's limit and usage, reconciled with the API's /status every
+        `sync_interval` seconds instead of on every fetcher
+      - Atomic consumption of requests within the budget of an entity, see
+        `QuotaPlanner`
+      - Usage of each entity, for reporting and planning
+    Days follow UTC, when the API resets its counter.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        planner: Optional[QuotaPlanner] = None,
+        sync_interval: float = API_QUOTA_SYNC_INTERVAL_SECONDS,
+    ) -> None:
+        self.path = path or os.path.join(ROOT_DIR, DATA_DIR, API_QUOTA_LEDGER_FILE)
+        self.planner = planner or QuotaPlanner()
+        self.sync_interval = sync_interval
+        # Connection of each thread, with the process and path it was opened for
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._schema_path: Optional[str] = None
+        # Connections inherited from the parent process, left open for the parent
+        self._inherited: list[sqlite3.Connection] = []
+
+    @staticmethod
+    def get_day() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    def _create_schema(self, connection: sqlite3.Connection) -> None:
+        """Creates the ledger's tables, once per file the ledger is pointed at."""
+        if self._schema_path == self.path:
+            return
+        with self._lock:
+            if self._schema_path == self.path:
+                return
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS quota (day TEXT PRIMARY KEY, "
+                "limit_day INTEGER NOT NULL, used INTEGER NOT NULL, "
+                "synced_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS usage (day TEXT NOT NULL, "
+                "entity TEXT NOT NULL, used INTEGER NOT NULL, "
+                "PRIMARY KEY (day, entity))"
+            )
+            self._schema_path = self.path
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yields the connection of the current thread, opened on first use. A forked
+        process opens its own instead of sharing the parent's. Transactions are begun
+        explicitly.
+        """
+        key = (os.getpid(), self.path)
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.key != key:
+            if self._local.key[0] == key[0]:
+                connection.close()
+            else:
+                self._inherited.append(connection)
+            connection = None
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._create_schema(connection)
+            self._local.connection = connection
+            self._local.key = key
+        yield connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Runs statements in a transaction holding the ledger's write lock."""
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def needs_sync(self) -> bool:
+        """Checks whether today's usage is unknown or older than `sync_interval`."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT synced_at FROM quota WHERE day = ?", (self.get_day(),)
+            ).fetchone()
+        return row is None or row[0] < time.time() - self.sync_interval
+
+    def sync(self, limit_day: int, current: int) -> None:
+        """
+        Records the limit and usage reported by the API. Requests made since the API
+        counted them are kept, so usage never goes down within a day.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO quota (day, limit_day, used, synced_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (day) DO UPDATE SET "
+                "limit_day = excluded.limit_day, "
+                "used = max(used, excluded.used), "
+                "synced_at = excluded.synced_at",
+                (self.get_day(), limit_day, current, time.time()),
+            )
+
+    def _get_quota(self, connection: sqlite3.Connection) -> tuple[int, int]:
+        day = self.get_day()
+        row = connection.execute(
+            "SELECT limit_day, used FROM quota WHERE day = ?", (day,)
+        ).fetchone()
+        return row if row is not None else (0, 0)
+
+    def _get_usage(self, connection: sqlite3.Connection) -> dict[str, int]:
+        return dict(
+            connection.execute(
+                "SELECT entity, used FROM usage WHERE day = ?", (self.get_day(),)
+            ).fetchall()
+        )
+
+    def get_remaining(self) -> int:
+        """Returns requests left today, 0 before the first sync of the day."""
+        with self._connect() as connection:
+            limit_day, used = self._get_quota(connection)
+        return max(limit_day - used, 0)
+
+    def get_usage(self) -> dict[str, int]:
+        """Returns requests each entity made today through the ledger."""
+        with self._connect() as connection:
+            return self._get_usage(connection)
+
+    def get_budget(self, entity: Optional[str] = None) -> int:
+        """Returns requests the entity may still make today."""
+        with self._connect() as connection:
+            limit_day, used = self._get_quota(connection)
+            usage = self._get_usage(connection)
+        return self.planner.get_budget(
+            entity, max(limit_day - used, 0), limit_day, usage
+        )
+
+    def plan(self, demands: dict[Optional[str], int]) -> dict[Optional[str], int]:
+        """Splits today's remaining quota across the demands, see `QuotaPlanner.plan`."""
+        with self._connect() as connection:
+            limit_day, used = self._get_quota(connection)
+            usage = self._get_usage(connection)
+        return self.planner.plan(demands, max(limit_day - used, 0), limit_day, usage)
+
+    def try_consume(self, entity: Optional[str] = None, count: int = 1) -> bool:
+        """
+        Takes `count` requests of today's quota for the entity.
+
+        Returns:
+            bool: False, taking nothing, when they exceed the entity's budget.
+        """
+        with self._transaction() as connection:
+            limit_day, used = self._get_quota(connection)
+            usage = self._get_usage(connection)
+            budget = self.planner.get_budget(
+                entity, max(limit_day - used, 0), limit_day, usage
+            )
+            if budget < count:
+                return False
+            connection.execute(
+                "UPDATE quota SET used = used + ? WHERE day = ?",
+                (count, self.get_day()),
+            )
+            if entity is not None:
+                connection.execute(
+                    "INSERT INTO usage (day, entity, used) VALUES (?, ?, ?) "
+                    "ON CONFLICT (day, entity) DO UPDATE SET used = used + excluded.used",
+                    (self.get_day(), entity, count),
+                )
+        return True
+
+
+quota_ledger = QuotaLedger()
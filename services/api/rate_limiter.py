@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the rate of requests of asyncio tasks.
+    Provides:
+      - Refill at `rate` tokens per second, up to `capacity` tokens for short bursts
+      - Waiting in `acquire` until a token is available, in order of arrival
+    Over any window of `t` seconds at most `rate * t + capacity` tokens are handed out.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_limit_per_minute(cls, limit: int, burst: int = 1) -> "TokenBucket":
+        """
+        Returns a bucket that never exceeds `limit` requests in any minute, including
+        its burst.
+        """
+        return cls(rate=(limit - burst) / 60, capacity=burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """
+        Takes one token, waiting for the refill when the bucket is empty.
+        """
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import parse_qsl
+
+from config.entity_names import FIXTURES_API_ENDPOINT
+from config.vars import (
+    DATA_DIR,
+    FINISHED_FIXTURE_STATUSES,
+    RESPONSE_CACHE_DEFAULT_TTL_SECONDS,
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_TTL_SECONDS,
+    ROOT_DIR,
+)
+
+
+class ResponseCache:
+    """
+    On-disk cache of raw API responses, addressed by a hash of endpoint and params.
+    Provides:
+      - Expiry per endpoint, see `RESPONSE_CACHE_TTL_SECONDS`. Fixtures responses whose
+        fixtures have all finished never expire.
+      - Hit and miss counts of the process, with the hit rate
+    Each entry is the response body as received next to a metadata file holding its
+    request and expiry, so entries survive restarts and can be replayed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttls: Optional[dict[str, Optional[float]]] = None,
+        default_ttl: float = RESPONSE_CACHE_DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.cache_dir = cache_dir or os.path.join(
+            ROOT_DIR, DATA_DIR, RESPONSE_CACHE_DIR
+        )
+        self.ttls = RESPONSE_CACHE_TTL_SECONDS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split_endpoint(
+        endpoint: str, params: dict[str, Any]
+    ) -> tuple[str, dict[str, str]]:
+        """
+        Splits an endpoint like "fixtures?date=2024-05-01" into its path and all query
+        params, including the given ones.
+        """
+        path, _, query = endpoint.partition("?")
+        return path.strip("/"), {
+            **dict(parse_qsl(query)),
+            **{name: str(value) for name, value in params.items()},
+        }
+
+    def get_key(self, endpoint: str, params: dict[str, Any]) -> str:
+        """Returns the hash addressing responses of the request, independent of param order."""
+        path, all_params = self.split_endpoint(endpoint, params)
+        request = json.dumps([path, sorted(all_params.items())])
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def _get_paths(self, key: str) -> tuple[str, str]:
+        directory = os.path.join(self.cache_dir, key[:2])
+        return (
+            os.path.join(directory, f"{key}.json"),
+            os.path.join(directory, f"{key}.meta.json"),
+        )
+
+    def get(self, endpoint: str, params: dict[str, Any]) -> Optional[bytes]:
+        """
+        Returns the cached response body of the request, or None when missing or expired.
+        """
+        body_path, meta_path = self._get_paths(self.get_key(endpoint, params))
+        content = None
+        try:
+            with open(meta_path, encoding="utf-8") as file:
+                expires_at = json.load(file)["expires_at"]
+            if expires_at is None or expires_at > time.time():
+                with open(body_path, "rb") as file:
+                    content = file.read()
+        except (OSError, ValueError, KeyError):
+            pass
+        with self._lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return content
+
+    def set(self, endpoint: str, params: dict[str, Any], content: bytes) -> None:
+        """
+        Caches the response body of the request for the TTL of its endpoint. Endpoints
+        with a TTL of 0 are not cached.
+        """
+        path, all_params = self.split_endpoint(endpoint, params)
+        ttl = self.get_ttl(path, content)
+        if ttl == 0:
+            return
+        stored_at = time.time()
+        meta = {
+            "endpoint": path,
+            "params": all_params,
+            "stored_at": stored_at,
+            "expires_at": None if ttl is None else stored_at + ttl,
+        }
+        body_path, meta_path = self._get_paths(self.get_key(endpoint, params))
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        # Metadata is written last, so an entry is never found without its body
+        for file_path, data in (
+            (body_path, content),
+            (meta_path, json.dumps(meta).encode()),
+        ):
+            tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, file_path)
+
+    def get_ttl(self, path: str, content: bytes) -> Optional[float]:
+        """Returns seconds the response stays valid, None when it never expires."""
+        if path == FIXTURES_API_ENDPOINT and self._are_fixtures_finished(content):
+            return None
+        return self.ttls.get(path, self.default_ttl)
+
+    @staticmethod
+    def _are_fixtures_finished(content: bytes) -> bool:
+        try:
+            fixtures = json.loads(content).get("response") or []
+        except (ValueError, AttributeError):
+            return False
+        return bool(fixtures) and all(
+            fixture.get("fixture", {}).get("status", {}).get("short")
+            in FINISHED_FIXTURE_STATUSES
+            for fixture in fixtures
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def log_stats(self) -> None:
+        logging.info(
+            f"Response cache: {self.hits} hits, {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate)"
+        )
+
+
+response_cache = ResponseCache()
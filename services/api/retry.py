@@ -0,0 +1,124 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from requests import Response
+
+from config.vars import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_PAUSE_SECONDS,
+    CIRCUIT_RESET_SECONDS,
+    REQUEST_BACKOFF_MAX_SECONDS,
+)
+
+
+class RequestFailedError(Exception):
+    """Raised when a request still fails after all its retries."""
+
+
+class CircuitOpenError(RequestFailedError):
+    """Raised instead of requesting while the upstream is considered down."""
+
+
+def get_backoff(
+    attempt: int, base: float, cap: float = REQUEST_BACKOFF_MAX_SECONDS
+) -> float:
+    """
+    Returns seconds to wait before retrying the attempt, counted from 0. Exponential
+    with full jitter, so concurrent retries spread out instead of arriving together.
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def get_retry_after(response: Response) -> Optional[float]:
+    """
+    Returns seconds the server asked to wait in the Retry-After header, given in
+    seconds or as an HTTP date, or None without a valid header.
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker pausing every request of a fetcher while the upstream is degraded.
+    Provides:
+      - A pause of `reset_timeout` seconds after `failure_threshold` consecutive
+        failures, or as long as a Retry-After header asks
+      - A doubled pause when the first request after a pause fails again
+      - Failing at once with `CircuitOpenError` when the pause would exceed
+        `max_pause`, so callers can set their items aside
+    Thread safe, requests of concurrent workers share one breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_SECONDS,
+        max_pause: float = CIRCUIT_MAX_PAUSE_SECONDS,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_pause = max_pause
+        self.failures = 0
+        # Pauses since the last successful request
+        self.trips = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_until > time.monotonic()
+
+    def before_request(self) -> None:
+        """Waits until the pause is over, or raises when it is longer than allowed."""
+        with self._lock:
+            wait = self.open_until - time.monotonic()
+        if wait <= 0:
+            return
+        if wait > self.max_pause:
+            raise CircuitOpenError(
+                f"Upstream is unavailable for another {wait:.0f}s, request skipped."
+            )
+        logging.warning(f"Circuit open, pausing requests for {wait:.1f}s")
+        time.sleep(wait)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.trips = 0
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """
+        Counts a failed request, opening the circuit at the threshold or when the server
+        asked to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Requests sent before the circuit opened do not prolong the pause
+            if self.open_until > now:
+                return
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                pause = max(self.reset_timeout * 2**self.trips, retry_after or 0.0)
+                self.trips += 1
+                # One more failure after the pause opens the circuit again
+                self.failures = self.failure_threshold - 1
+            elif retry_after is not None:
+                pause = retry_after
+            else:
+                return
+            self.open_until = now + pause
+        logging.warning(f"Circuit opened for {pause:.1f}s after failed requests")
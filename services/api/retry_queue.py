@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from config.vars import DATA_DIR, RETRY_QUEUE_FILE, RETRY_QUEUE_MAX_ATTEMPTS, ROOT_DIR
+
+
+class RetryQueue:
+    """
+    Queue of items whose API requests failed, in a SQLite file shared by all processes.
+    Provides:
+      - Items of a pull kept with its endpoint template, params and output location,
+        so a later pull re-fetches only them
+      - Dropping of items failing more than `max_attempts` times
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, max_attempts: int = RETRY_QUEUE_MAX_ATTEMPTS
+    ) -> None:
+        self.path = path or os.path.join(ROOT_DIR, DATA_DIR, RETRY_QUEUE_FILE)
+        self.max_attempts = max_attempts
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection per operation, committed when it succeeds."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS retries (endpoint_template TEXT NOT NULL, "
+                "extra_params TEXT NOT NULL, value TEXT NOT NULL, "
+                "filename_prefix TEXT NOT NULL, subdir TEXT NOT NULL, entity TEXT, "
+                "attempts INTEGER NOT NULL, last_error TEXT, queued_at REAL NOT NULL, "
+                "PRIMARY KEY (endpoint_template, extra_params, value))"
+            )
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _get_params_key(extra_params: Optional[dict]) -> str:
+        return json.dumps(extra_params or {}, sort_keys=True)
+
+    def add(
+        self,
+        values: list[str],
+        endpoint_template: str,
+        filename_prefix: str,
+        subdir: str,
+        extra_params: Optional[dict] = None,
+        entity: Optional[str] = None,
+        error: str = "",
+    ) -> None:
+        """Queues failed items of a pull, counting the attempts of ones queued before."""
+        params_key = self._get_params_key(extra_params)
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO retries (endpoint_template, extra_params, value, "
+                "filename_prefix, subdir, entity, attempts, last_error, queued_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (endpoint_template, extra_params, value) DO UPDATE SET "
+                "attempts = attempts + 1, last_error = excluded.last_error, "
+                "queued_at = excluded.queued_at",
+                [
+                    (
+                        endpoint_template,
+                        params_key,
+                        value,
+                        filename_prefix,
+                        subdir,
+                        entity,
+                        error,
+                        time.time(),
+                    )
+                    for value in values
+                ],
+            )
+            dropped = connection.execute(
+                "SELECT value FROM retries WHERE attempts > ?", (self.max_attempts,)
+            ).fetchall()
+            connection.execute(
+                "DELETE FROM retries WHERE attempts > ?", (self.max_attempts,)
+            )
+        if dropped:
+            logging.error(
+                f"Dropped {len(dropped)} items of {endpoint_template} after "
+                f"{self.max_attempts} failed attempts: {[row[0] for row in dropped]}"
+            )
+
+    def remove(
+        self,
+        values: list[str],
+        endpoint_template: str,
+        extra_params: Optional[dict] = None,
+    ) -> None:
+        """Removes items fetched successfully from the queue."""
+        params_key = self._get_params_key(extra_params)
+        with self._connect() as connection:
+            connection.executemany(
+                "DELETE FROM retries WHERE endpoint_template = ? AND extra_params = ? "
+                "AND value = ?",
+                [(endpoint_template, params_key, value) for value in values],
+            )
+
+    def get_values(
+        self, endpoint_template: str, extra_params: Optional[dict] = None
+    ) -> list[str]:
+        """Returns queued items of the endpoint and params, oldest first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT value FROM retries WHERE endpoint_template = ? "
+                "AND extra_params = ? ORDER BY queued_at",
+                (endpoint_template, self._get_params_key(extra_params)),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_jobs(self, entity: Optional[str] = None) -> list[dict[str, Any]]:
+        """
+        Returns the pulls with queued items, optionally of one entity, as keyword
+        arguments of `GenericFetcher.pull_data_for_list` without values.
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT DISTINCT endpoint_template, extra_params, filename_prefix, "
+                "subdir, entity FROM retries"
+            ).fetchall()
+        return [
+            {
+                "endpoint_template": endpoint_template,
+                "extra_params": json.loads(extra_params),
+                "filename_prefix": filename_prefix,
+                "subdir": subdir,
+            }
+            for endpoint_template, extra_params, filename_prefix, subdir, job_entity in rows
+            if entity is None or job_entity == entity
+        ]
+
+    def get_entities(self) -> list[Optional[str]]:
+        """Returns entities with queued items."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT DISTINCT entity FROM retries").fetchall()
+        return [row[0] for row in rows]
+
+
+retry_queue = RetryQueue()
@@ -0,0 +1,106 @@
+import io
+import json
+from typing import Any
+
+import pandas as pd
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.compiler import Compiled
+from sqlalchemy.types import JSON, Date, DateTime, Float, Numeric, String
+
+try:
+    import pyarrow  # noqa: F401
+
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+COPY_NULL_MARKER = "\\N"
+
+
+def read_select_with_copy(statement: Select, connection: Connection) -> pd.DataFrame:
+    """
+    Reads result of a SELECT through PostgreSQL `COPY (query) TO STDOUT` in CSV format.
+
+    The result is transferred as one stream and parsed by the pandas CSV reader (pyarrow
+    engine when installed) instead of building Python objects row by row. Column types
+    come from the statement and the frame matches what `pd.read_sql_query` returns.
+
+    Args:
+        statement (Select): SQLAlchemy SELECT to read.
+        connection (Connection): PostgreSQL (psycopg2) connection to run COPY on.
+
+    Returns:
+        pd.DataFrame: Typed result of the statement.
+    """
+    columns = list(statement.selected_columns)
+    query = render_statement(statement, connection)
+
+    buffer = io.BytesIO()
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY ({query}) TO STDOUT WITH (FORMAT csv, NULL '{COPY_NULL_MARKER}')",
+            buffer,
+        )
+    buffer.seek(0)
+
+    df = pd.read_csv(
+        buffer,
+        header=None,
+        names=[column.name for column in columns],
+        # Text values are kept as read, e.g. "01" or "1e5" are not numbers
+        dtype={
+            column.name: str
+            for column in columns
+            if isinstance(column.type, (String, JSON, Date, DateTime))
+        },
+        na_values=[COPY_NULL_MARKER],
+        keep_default_na=False,
+        true_values=["t"],
+        false_values=["f"],
+        engine=CSV_ENGINE,
+    )
+
+    for column in columns:
+        values = df[column.name]
+        if isinstance(column.type, JSON):
+            values = values.map(json.loads, na_action="ignore")
+        elif isinstance(column.type, DateTime):
+            values = pd.to_datetime(values, format="ISO8601", utc=column.type.timezone)
+        elif isinstance(column.type, Date):
+            values = pd.to_datetime(values, format="ISO8601").dt.date
+        elif isinstance(column.type, (Numeric, Float)):
+            values = values.astype("float64")
+        is_null = values.isna()
+        if is_null.all() or (values.dtype == object and is_null.any()):
+            # NULLs in columns of Python objects are None, as returned by the driver
+            values = values.astype(object).where(~is_null, None)
+        df[column.name] = values
+    return df
+
+
+def render_statement(statement: Select, connection: Connection) -> str:
+    """
+    Renders a statement as SQL text with parameter values inlined by the driver, to be
+    embedded in statements like COPY or EXPLAIN.
+    """
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    with connection.connection.cursor() as cursor:
+        return cursor.mogrify(str(compiled), _process_params(compiled)).decode()
+
+
+def _process_params(compiled: Compiled) -> dict[str, Any]:
+    """
+    Applies bind processors of parameter types (e.g. JSON serialization) to the values.
+    """
+    params = {}
+    for name, value in compiled.params.items():
+        bind = compiled.binds.get(name)
+        processor = (
+            bind.type.bind_processor(compiled.dialect) if bind is not None else None
+        )
+        params[name] = processor(value) if processor else value
+    return params
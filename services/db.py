@@ -1,33 +1,119 @@
+import itertools
 import logging
+import multiprocessing
+import os
 import pandas as pd
+import threading
 import typing
+import weakref
 
 
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.schema import MetaData
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker, scoped_session, Query
+from sqlalchemy.orm import Session, sessionmaker, scoped_session, Query
+from sqlalchemy.sql import Select
 from typing import Callable, Optional, Any
 
 from config.db_config import DbConfig
+from services.copy_reader import read_select_with_copy, render_statement
+from services.engine_registry import engine_registry
+from services.schema_cache import schema_cache
+
+# Instances whose sessions are recreated in forked processes
+_instances: "weakref.WeakSet[Db]" = weakref.WeakSet()
 
 
 class Db:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        replica_urls: Optional[list[str]] = None,
+        pool_options: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Args:
+            replica_urls (Optional[list[str]]): URLs of read replicas of the primary.
+                Defaults to `DB_REPLICA_HOSTS`, reached with the primary's credentials.
+            pool_options (Optional[dict[str, Any]]): Engine options overriding the pool
+                settings of `get_pool_options`, e.g. {"pool_size": 1}.
+        """
         self.config = DbConfig()
-        self.engine = create_engine(self._construct_db_url(self.config))
-        self.Session = scoped_session(sessionmaker(bind=self.engine))
+        self.pool_options = pool_options or {}
+        self._url = self._construct_db_url(self.config)
+        if replica_urls is None:
+            replica_urls = [
+                self._construct_db_url(self.config, host)
+                for host in self.config.DB_REPLICA_HOSTS
+            ]
+        self._replica_urls = replica_urls
+        self._replica_cycle = itertools.cycle(replica_urls)
+        self._reset_sessions()
+        _instances.add(self)
+
+    def _reset_sessions(self) -> None:
+        """
+        Creates the session factory and per-thread state, also anew in a forked process,
+        where sessions and units of work of the parent must not be used.
+        """
+        self._replica_lock = threading.Lock()
+        self._session_factory = sessionmaker(bind=self.engine)
+        self.Session = scoped_session(self._session_factory)
+        # Session of the unit of work opened by `transaction()` in the current thread
+        # and depth of `primary()` blocks entered by it
+        self._unit_of_work = threading.local()
+
+    def get_pool_options(self) -> dict[str, Any]:
+        """
+        Returns pool settings of engines created in this process. Worker processes get
+        the smaller `DB_WORKER_*` pool, as many of them connect at once.
+        """
+        # Forked workers are detected by the registry, as multiprocessing sets their
+        # parent process only after fork handlers ran
+        in_worker = (
+            engine_registry.forked or multiprocessing.parent_process() is not None
+        )
+        return {
+            "pool_size": (
+                self.config.DB_WORKER_POOL_SIZE
+                if in_worker
+                else self.config.DB_POOL_SIZE
+            ),
+            "max_overflow": (
+                self.config.DB_WORKER_MAX_OVERFLOW
+                if in_worker
+                else self.config.DB_MAX_OVERFLOW
+            ),
+            "pool_timeout": self.config.DB_POOL_TIMEOUT,
+            "pool_recycle": self.config.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.config.DB_POOL_PRE_PING,
+            **self.pool_options,
+        }
+
+    @property
+    def engine(self) -> Engine:
+        """
+        Returns engine of the primary owned by the current process, created on first use.
+        """
+        return engine_registry.get_engine(self._url, **self.get_pool_options())
+
+    @property
+    def replica_engines(self) -> list[Engine]:
+        return [
+            engine_registry.get_engine(url, **self.get_pool_options())
+            for url in self._replica_urls
+        ]
 
     @staticmethod
-    def _construct_db_url(config: DbConfig) -> str:
+    def _construct_db_url(config: DbConfig, host: Optional[str] = None) -> str:
         """
-        Constructs the database URL from a configuration dictionary.
+        Constructs the database URL from a configuration dictionary, for the primary or
+        for the given "host[:port]".
         """
         user = config.DB_USER
         password = config.DB_PASSWORD
-        host = config.DB_HOST
-        port = config.DB_PORT
+        host, _, port = (host or config.DB_HOST).partition(":")
+        port = port or config.DB_PORT
         database = config.DB_NAME
 
         return f"postgresql://{user}:{password}@{host}:{port}/{database}"
@@ -43,12 +129,125 @@ class Db:
         finally:
             session.close()
 
+    @property
+    def current_transaction(self) -> Optional[Session]:
+        """
+        Returns session of the unit of work open in the current thread, if any.
+        """
+        return getattr(self._unit_of_work, "session", None)
+
+    @contextmanager
+    def transaction(self) -> typing.Generator[Session, None, None]:
+        """
+        Opens a unit of work: writes of all models made inside share one session and one
+        transaction, committed once on exit and rolled back entirely on error.
+
+        Nested calls join the outer unit of work, so only the outermost one commits.
+        """
+        session = self.current_transaction
+        if session is not None:
+            yield session
+            return
+
+        session = self._session_factory()
+        self._unit_of_work.session = session
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            # Tables created in the unit of work are gone with it
+            schema_cache.invalidate(self.engine)
+            raise
+        finally:
+            self._unit_of_work.session = None
+            session.close()
+
+    @contextmanager
+    def primary(self) -> typing.Generator[None, None, None]:
+        """
+        Routes reads of the current thread to the primary, e.g. to read own writes that
+        replicas may not have replayed yet.
+        """
+        self._unit_of_work.primary_reads = self._primary_reads + 1
+        try:
+            yield
+        finally:
+            self._unit_of_work.primary_reads = self._primary_reads - 1
+
+    @property
+    def _primary_reads(self) -> int:
+        return getattr(self._unit_of_work, "primary_reads", 0)
+
+    @property
+    def read_engine(self) -> Engine:
+        """
+        Returns engine for reads: the next replica in turn, or the primary when there are
+        no replicas, inside `primary()` and inside a unit of work.
+        """
+        if (
+            not self._replica_urls
+            or self._primary_reads
+            or self.current_transaction is not None
+        ):
+            return self.engine
+        with self._replica_lock:
+            replica_url = next(self._replica_cycle)
+        return engine_registry.get_engine(replica_url, **self.get_pool_options())
+
+    def read_df(
+        self,
+        statement: Select,
+        bind: Connection | Engine | None = None,
+        fast: bool | None = None,
+    ) -> pd.DataFrame:
+        """
+        Reads result of a SELECT statement into a DataFrame.
+
+        The fast path streams the result with `COPY (query) TO STDOUT` and parses it with the
+        pandas CSV reader, which avoids building Python objects row by row on large reads.
+        Otherwise `pd.read_sql_query` is used. Both return the same frame, so the switch
+        can be used to compare them.
+
+        Args:
+            statement (Select): SQLAlchemy SELECT to read.
+            bind (Connection | Engine | None): Connection or engine to read with. Defaults
+                to `read_engine`.
+            fast (bool | None): Use the COPY path. Defaults to `DB_FAST_READS` setting.
+                Ignored for non-PostgreSQL databases.
+        """
+        bind = bind if bind is not None else self.read_engine
+        fast = self.config.DB_FAST_READS if fast is None else fast
+        if not fast or bind.dialect.name != "postgresql":
+            return pd.read_sql_query(statement, bind)
+
+        if isinstance(bind, Connection):
+            return read_select_with_copy(statement, bind)
+        with bind.connect() as connection:
+            return read_select_with_copy(statement, connection)
+
+    def explain(self, statement: Select, force_index: bool = False) -> str:
+        """
+        Returns PostgreSQL plan of a SELECT statement.
+
+        Args:
+            statement (Select): SQLAlchemy SELECT to explain.
+            force_index (bool): Disable sequential scans, so the plan shows whether the
+                statement can use an index at all, regardless of table size.
+        """
+        with self.engine.connect() as connection, connection.begin():
+            with connection.connection.cursor() as cursor:
+                if force_index:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {render_statement(statement, connection)}")
+                return "\n".join(row[0] for row in cursor.fetchall())
+
     def execute_raw_query(self, query: str | Query) -> Optional[pd.DataFrame]:
         """
-        Executes a raw SQL query or SQLAlchemy query object.
+        Executes a raw SQL query or SQLAlchemy query object on `read_engine`.
         """
         try:
-            with self.engine.connect() as connection:
+            with self.read_engine.connect() as connection:
                 if isinstance(query, str):
                     return pd.read_sql_query(query, connection)
                 else:
@@ -76,11 +275,13 @@ class Db:
 
     def close(self) -> None:
         """
-        Closes the engine and removes the session.
+        Closes the engines and removes the session.
         """
         try:
             self.Session.remove()
             self.engine.dispose()
+            for replica_engine in self.replica_engines:
+                replica_engine.dispose()
         except Exception as e:
             logging.error(f"Error during closing resources: {e}")
 
@@ -89,6 +290,7 @@ class Db:
             # Create all tables in the database
             logging.info("Creating all tables...")
             metadata.create_all(bind=self.engine)
+            schema_cache.invalidate(self.engine)
         except Exception as e:
             # Handle any exceptions or errors that occur during the connection test
             logging.error(f"Error while creating tables: {e}")
@@ -99,7 +301,18 @@ class Db:
             if metadata.tables:
                 logging.info("Dropping all tables...")
                 metadata.drop_all(bind=self.engine)
+                schema_cache.invalidate(self.engine)
         except Exception as e:
             # Handle any exceptions or errors that occur during the connection test
             logging.error(f"Error while dropping tables: {e}")
             raise Exception
+
+
+def _reset_after_fork() -> None:
+    for db in list(_instances):
+        db._reset_sessions()
+
+
+if hasattr(os, "register_at_fork"):
+    # Runs after the engine registry dropped engines inherited from the parent
+    os.register_at_fork(after_in_child=_reset_after_fork)
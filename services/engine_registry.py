@@ -0,0 +1,54 @@
+import logging
+import os
+import threading
+from typing import Any
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+
+class EngineRegistry:
+    """
+    Pooled engines of the current process, one per database URL and engine options.
+    Provides:
+      - Sharing of an engine and its pool by all users of the same database with the
+        same options
+      - Fresh engines in forked processes, e.g. workers of `multiprocessing.Pool`.
+        Inherited engines are dropped without closing connections the parent still uses.
+    """
+
+    def __init__(self) -> None:
+        self._engines: dict[tuple[str, frozenset], Engine] = {}
+        self._lock = threading.Lock()
+        # Whether this process was forked from one that used the registry
+        self.forked = False
+
+    def get_engine(self, url: str, **engine_options: Any) -> Engine:
+        """
+        Returns the process's engine of the URL and options, created on first use.
+        """
+        key = (url, frozenset(engine_options.items()))
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = create_engine(url, **engine_options)
+                self._engines[key] = engine
+            return engine
+
+    def reset_after_fork(self) -> None:
+        """
+        Drops engines inherited from the parent process. Their pooled connections stay
+        open for the parent, the child connects again on next use.
+        """
+        for engine in self._engines.values():
+            engine.dispose(close=False)
+        self._engines = {}
+        self._lock = threading.Lock()
+        self.forked = True
+        logging.debug(f"Engine registry reset in forked process {os.getpid()}")
+
+
+engine_registry = EngineRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=engine_registry.reset_after_fork)
@@ -0,0 +1,265 @@
+import logging
+import pandas as pd
+from typing import Any, Iterable
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn, CreateIndex, Index, MetaData, Table
+
+from services.db import Db
+from services.schema_cache import schema_cache
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+
+def _drop_invalid_index(connection: Connection, index: Index) -> None:
+    """
+    Drops an index left invalid by an interrupted concurrent build, which IF NOT EXISTS
+    would otherwise keep.
+    """
+    is_valid = connection.exec_driver_sql(
+        "SELECT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relname = %(name)s AND n.nspname = %(schema)s",
+        {"name": index.name, "schema": index.table.schema or "public"},
+    ).scalar()
+    if is_valid is False:
+        logging.warning(f"Dropping invalid index {index.name}...")
+        preparer = connection.dialect.identifier_preparer
+        connection.exec_driver_sql(
+            f"DROP INDEX CONCURRENTLY IF EXISTS "
+            f"{preparer.format_schema(index.table.schema or 'public')}."
+            f"{preparer.quote(index.name)}"
+        )
+
+
+def _is_partitioned(connection: Connection, table: Table) -> bool:
+    return (
+        connection.exec_driver_sql(
+            "SELECT c.relkind FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = %(name)s AND n.nspname = %(schema)s",
+            {"name": table.name, "schema": table.schema or "public"},
+        ).scalar()
+        == "p"
+    )
+
+
+def _drop_foreign_keys_to(connection: Connection, table: Table, name: str) -> None:
+    """
+    Drops foreign keys referencing table `name` in the schema of given table. Keys of
+    renamed tables follow them, e.g. keys of fixture detail tables to `fixtures` point at
+    `fixtures_unpartitioned` after the rename.
+    """
+    preparer = connection.dialect.identifier_preparer
+    foreign_keys = connection.exec_driver_sql(
+        "SELECT cn.nspname, c.relname, con.conname FROM pg_constraint con "
+        "JOIN pg_class c ON c.oid = con.conrelid "
+        "JOIN pg_namespace cn ON cn.oid = c.relnamespace "
+        "JOIN pg_class r ON r.oid = con.confrelid "
+        "JOIN pg_namespace rn ON rn.oid = r.relnamespace "
+        "WHERE con.contype = 'f' AND r.relname = %(name)s AND rn.nspname = %(schema)s",
+        {"name": name, "schema": table.schema or "public"},
+    ).all()
+    for schema, table_name, constraint_name in foreign_keys:
+        logging.info(
+            f"Dropping foreign key {constraint_name} of {schema}.{table_name} "
+            f"to {name}..."
+        )
+        connection.exec_driver_sql(
+            f"ALTER TABLE {preparer.format_schema(schema)}.{preparer.quote(table_name)} "
+            f"DROP CONSTRAINT {preparer.quote(constraint_name)}"
+        )
+
+
+def _drop_unpartitioned_table(connection: Connection, table: Table) -> None:
+    """
+    Drops `<table>_unpartitioned` left by `partition_tables` once every one of its rows
+    has a row with the same primary key in the partitioned table.
+
+    Raises:
+        RuntimeError: If rows of the old table are missing in the partitioned one.
+    """
+    preparer = connection.dialect.identifier_preparer
+    old_table = (
+        f"{preparer.format_schema(table.schema)}."
+        f"{preparer.quote(f'{table.name}_unpartitioned')}"
+    )
+    key_match = " AND ".join(
+        f"new.{preparer.quote(column.name)} = old.{preparer.quote(column.name)}"
+        for column in table.primary_key.columns
+    )
+    missing_rows = connection.exec_driver_sql(
+        f"SELECT count(*) FROM {old_table} old WHERE NOT EXISTS "
+        f"(SELECT 1 FROM {preparer.format_table(table)} new WHERE {key_match})"
+    ).scalar()
+    if missing_rows:
+        raise RuntimeError(
+            f"{missing_rows} rows of {old_table} are missing in {table.fullname}."
+        )
+    logging.info(f"Dropping {old_table}...")
+    connection.exec_driver_sql(f"DROP TABLE {old_table}")
+
+
+def partition_tables(db: Db, models: Iterable[Any]) -> None:
+    """
+    Converts existing tables of models declared with `postgresql_partition_by` into
+    partitioned tables. Each table is renamed to `<table>_unpartitioned`, recreated as
+    declared with partitions for its rows, and its rows are copied over in one transaction.
+    Once all tables are converted, the old tables are dropped together with foreign keys
+    that still reference them, see `_drop_unpartitioned_table`.
+    """
+    models = list(models)
+    with db.engine.begin() as connection:
+        inspector = inspect(connection)
+        preparer = connection.dialect.identifier_preparer
+        for model in models:
+            table = model.__table__
+            partition_column = model.get_partition_column()
+            if (
+                partition_column is None
+                or not inspector.has_table(table.name, schema=table.schema)
+                or _is_partitioned(connection, table)
+            ):
+                continue
+
+            logging.info(f"Partitioning {table.fullname} by {partition_column}...")
+            old_name = f"{table.name}_unpartitioned"
+            old_table = (
+                f"{preparer.format_schema(table.schema)}.{preparer.quote(old_name)}"
+            )
+            connection.exec_driver_sql(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"RENAME TO {preparer.quote(old_name)}"
+            )
+            # Free index names, including the primary key's, for the new table
+            for index_name in connection.exec_driver_sql(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE schemaname = %(schema)s AND tablename = %(name)s",
+                {"name": old_name, "schema": table.schema or "public"},
+            ).scalars():
+                connection.exec_driver_sql(
+                    f"ALTER INDEX {preparer.format_schema(table.schema)}."
+                    f"{preparer.quote(index_name)} "
+                    f"RENAME TO {preparer.quote(f'{index_name}_unpartitioned')}"
+                )
+            table.create(connection)
+
+            # Lower bounds of the partitions needed, as one value of each partition
+            partition_keys = connection.exec_driver_sql(
+                f"SELECT DISTINCT {preparer.quote(partition_column)}::bigint "
+                f"/ {model.partition_interval} * {model.partition_interval} "
+                f"FROM {old_table}"
+            ).scalars()
+            model.ensure_partitions(
+                pd.DataFrame({partition_column: list(partition_keys)}), connection
+            )
+            columns = ", ".join(
+                preparer.quote(column.name)
+                for column in table.columns
+                if column.computed is None
+            )
+            copied_rows = connection.exec_driver_sql(
+                f"INSERT INTO {preparer.format_table(table)} ({columns}) "
+                f"SELECT {columns} FROM {old_table}"
+            ).rowcount
+            logging.info(f"{copied_rows} rows copied to partitioned {table.fullname}.")
+
+        # Tables left by earlier runs are dropped as well
+        old_tables = [
+            model.__table__
+            for model in models
+            if model.get_partition_column() is not None
+            and inspector.has_table(
+                f"{model.__tablename__}_unpartitioned", schema=model.__table__.schema
+            )
+        ]
+        for table in old_tables:
+            _drop_foreign_keys_to(connection, table, f"{table.name}_unpartitioned")
+        for table in old_tables:
+            _drop_unpartitioned_table(connection, table)
+    schema_cache.invalidate(db.engine)
+
+
+def add_missing_columns(db: Db, metadata: MetaData) -> None:
+    """
+    Adds columns declared on models that are missing in existing tables, e.g. generated
+    columns like `Fixture.match_date`. Stored generated columns are computed for all
+    existing rows, which rewrites the table.
+    """
+    with db.engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name, schema=table.schema):
+                continue
+            existing_columns = {
+                column["name"]
+                for column in inspector.get_columns(table.name, schema=table.schema)
+            }
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                logging.info(f"Adding column {column.name} to {table.fullname}...")
+                column_spec = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.exec_driver_sql(
+                    f"ALTER TABLE "
+                    f"{connection.dialect.identifier_preparer.format_table(table)} "
+                    f"ADD COLUMN IF NOT EXISTS {column_spec}"
+                )
+
+
+def create_indexes(db: Db, metadata: MetaData) -> None:
+    """
+    Creates indexes declared on models for existing tables with
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS, so tables stay writable during the build.
+    Tables created later get their indexes with the table.
+    """
+    with db.engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        inspector = inspect(connection)
+        for table in metadata.sorted_tables:
+            if not table.indexes or not inspector.has_table(
+                table.name, schema=table.schema
+            ):
+                continue
+            # Indexes of partitioned tables cannot be built concurrently
+            concurrently = not _is_partitioned(connection, table)
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                _drop_invalid_index(connection, index)
+                statement = str(
+                    CreateIndex(index, if_not_exists=True).compile(
+                        dialect=connection.dialect
+                    )
+                )
+                if concurrently:
+                    # Concurrent build cannot run in the transaction of
+                    # metadata.create_all(), so it is requested here instead of on the
+                    # declared index
+                    statement = statement.replace(
+                        "CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1
+                    )
+                logging.info(f"Creating index {index.name} on {table.fullname}...")
+                connection.exec_driver_sql(statement)
+    logging.info("Indexes created successfully.")
+
+
+if __name__ == "__main__":
+    # Register all models in Base.metadata
+    import models.analytics.breaks  # noqa: F401
+    import models.data_warehouse.fixtures  # noqa: F401
+    import models.data_warehouse.main  # noqa: F401
+    from models.base import Base
+
+    migration_db = Db()
+    try:
+        partition_tables(
+            migration_db, [mapper.class_ for mapper in Base.registry.mappers]
+        )
+        add_missing_columns(migration_db, Base.metadata)
+        create_indexes(migration_db, Base.metadata)
+    finally:
+        migration_db.close()
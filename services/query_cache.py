@@ -0,0 +1,198 @@
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import pandas as pd
+from sqlalchemy.sql import ClauseElement
+
+from config.vars import (
+    QUERY_CACHE_MAX_ENTRIES,
+    QUERY_CACHE_SPILL_DIR,
+    QUERY_CACHE_TTL_SECONDS,
+)
+
+
+class QueryCache:
+    """
+    In-process cache of DataFrames returned by model read methods.
+    Provides:
+      - LRU eviction above `max_entries` and expiry after `ttl` seconds
+      - Optional spill of evicted entries to pickle files in `spill_dir`
+      - Invalidation of all entries of a table
+      - Entries stored with a version of their table, served only while it is current
+    Entries are stored and returned as copies, so callers may modify the frames.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        ttl: float = QUERY_CACHE_TTL_SECONDS,
+        spill_dir: Optional[str] = QUERY_CACHE_SPILL_DIR,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        # key -> (table, expires_at, version, DataFrame)
+        self._entries: OrderedDict[
+            Hashable, tuple[str, float, Hashable, pd.DataFrame]
+        ] = OrderedDict()
+        # key -> (table, expires_at, version, path of the pickled DataFrame)
+        self._spilled: dict[Hashable, tuple[str, float, Hashable, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable = None) -> Optional[pd.DataFrame]:
+        """
+        Returns a copy of the cached DataFrame, or None when missing, expired or cached
+        at another version of its table.
+        """
+        with self._lock:
+            if key in self._entries:
+                table, expires_at, entry_version, df = self._entries[key]
+                if expires_at > time.monotonic() and entry_version == version:
+                    self._entries.move_to_end(key)
+                    return df.copy()
+                del self._entries[key]
+            elif key in self._spilled:
+                table, expires_at, entry_version, path = self._spilled.pop(key)
+                if expires_at > time.monotonic() and entry_version == version:
+                    with open(path, "rb") as file:
+                        df = pickle.load(file)
+                    os.remove(path)
+                    self._store(key, table, expires_at, version, df)
+                    return df.copy()
+                os.remove(path)
+        return None
+
+    def set(
+        self, key: Hashable, table: str, df: pd.DataFrame, version: Hashable = None
+    ) -> None:
+        """
+        Caches a copy of the DataFrame read from the given table at the given version.
+        """
+        with self._lock:
+            self._store(key, table, time.monotonic() + self.ttl, version, df.copy())
+
+    def _store(
+        self,
+        key: Hashable,
+        table: str,
+        expires_at: float,
+        version: Hashable,
+        df: pd.DataFrame,
+    ) -> None:
+        self._entries[key] = (table, expires_at, version, df)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, (
+                evicted_table,
+                evicted_expires_at,
+                evicted_version,
+                evicted_df,
+            ) = self._entries.popitem(last=False)
+            if self.spill_dir:
+                self._spill(
+                    evicted_key,
+                    evicted_table,
+                    evicted_expires_at,
+                    evicted_version,
+                    evicted_df,
+                )
+
+    def _spill(
+        self,
+        key: Hashable,
+        table: str,
+        expires_at: float,
+        version: Hashable,
+        df: pd.DataFrame,
+    ) -> None:
+        os.makedirs(self.spill_dir, exist_ok=True)
+        file_name = hashlib.sha1(f"{os.getpid()}:{key!r}".encode()).hexdigest()
+        path = os.path.join(self.spill_dir, f"{file_name}.pkl")
+        with open(path, "wb") as file:
+            pickle.dump(df, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spilled[key] = (table, expires_at, version, path)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """
+        Drops cached entries of the given table, or all entries.
+        """
+        with self._lock:
+            for key in [
+                key
+                for key, (entry_table, _, _, _) in self._entries.items()
+                if table is None or entry_table == table
+            ]:
+                del self._entries[key]
+            for key in [
+                key
+                for key, (entry_table, _, _, _) in self._spilled.items()
+                if table is None or entry_table == table
+            ]:
+                _, _, _, path = self._spilled.pop(key)
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+query_cache = QueryCache()
+
+
+def _make_key_part(value: Any) -> Hashable:
+    """
+    Converts a read method argument to a hashable cache key part.
+    SQL expressions are keyed by their compiled SQL text and bound parameters.
+    """
+    if isinstance(value, ClauseElement):
+        compiled = value.compile()
+        return str(compiled), _make_key_part(sorted(compiled.params.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_make_key_part(item) for item in value)
+    hash(value)
+    return value
+
+
+def cached_query(method: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    """
+    Caches DataFrames returned by a model classmethod in `query_cache`, keyed by model,
+    method and arguments. Entries are invalidated by upserts of the model's table, and
+    served only while the table's version shared by all processes is unchanged, see
+    `BaseMixin.get_cache_version`.
+
+    Reads inside a unit of work bypass the cache, as they may see uncommitted writes.
+    Not for reads relative to the current time, whose arguments do not change while
+    their results do. Place it below `@classmethod`.
+    """
+
+    @functools.wraps(method)
+    def wrapper(cls: Any, *args: Any, **kwargs: Any) -> pd.DataFrame:
+        if cls.db is not None and cls.db.current_transaction is not None:
+            return method(cls, *args, **kwargs)
+        try:
+            key = (
+                cls.__name__,
+                method.__name__,
+                _make_key_part(args),
+                tuple(
+                    (name, _make_key_part(value))
+                    for name, value in sorted(kwargs.items())
+                ),
+            )
+        except Exception as e:
+            logging.debug(f"Not caching {cls.__name__}.{method.__name__}: {e}")
+            return method(cls, *args, **kwargs)
+
+        # Read before the data, so writes committed meanwhile invalidate the entry
+        version = cls.get_cache_version()
+        df = query_cache.get(key, version)
+        if df is None:
+            df = method(cls, *args, **kwargs)
+            query_cache.set(key, cls.__table__.fullname, df, version)
+        return df
+
+    return wrapper
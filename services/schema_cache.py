@@ -0,0 +1,79 @@
+import logging
+import threading
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import TableClause
+
+SYSTEM_SCHEMAS = ("information_schema",)
+
+
+class SchemaCache:
+    """
+    Process-level cache of tables existing in each database.
+    Provides:
+      - One catalog read per engine, on first use
+      - Registration of tables created by the application
+      - Explicit invalidation after DDL made elsewhere or rolled back
+    """
+
+    def __init__(self) -> None:
+        self._tables: dict[str, set[tuple[str | None, str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(bind: Connection | Engine) -> str:
+        return str(bind.engine.url)
+
+    @staticmethod
+    def _read_tables(bind: Connection | Engine) -> set[tuple[str | None, str]]:
+        """
+        Reads names of all user tables from the database catalog.
+        Tables of the default schema are also registered without schema.
+        """
+        inspector = inspect(bind)
+        tables: set[tuple[str | None, str]] = set()
+        for schema in inspector.get_schema_names():
+            if schema.startswith("pg_") or schema in SYSTEM_SCHEMAS:
+                continue
+            for table_name in inspector.get_table_names(schema=schema):
+                tables.add((schema, table_name))
+                if schema == inspector.default_schema_name:
+                    tables.add((None, table_name))
+        return tables
+
+    def has_table(self, bind: Connection | Engine, table: TableClause) -> bool:
+        """
+        Checks whether the table (or table partition) exists, reading the catalog only when
+        the engine's cache is not warmed yet.
+        """
+        key = self._get_key(bind)
+        with self._lock:
+            if key not in self._tables:
+                logging.info("Warming schema cache...")
+                self._tables[key] = self._read_tables(bind)
+            return (table.schema, table.name) in self._tables[key]
+
+    def add_table(self, bind: Connection | Engine, table: TableClause) -> None:
+        """
+        Registers a table created by the application. A cold cache is left to be warmed
+        from the catalog.
+        """
+        with self._lock:
+            tables = self._tables.get(self._get_key(bind))
+            if tables is not None:
+                tables.add((table.schema, table.name))
+
+    def invalidate(self, bind: Connection | Engine | None = None) -> None:
+        """
+        Drops cached tables of the given engine, or of all engines, so the catalog is read
+        again on next use.
+        """
+        with self._lock:
+            if bind is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(self._get_key(bind), None)
+
+
+schema_cache = SchemaCache()
@@ -1,5 +1,11 @@
+import datetime as dt
+
+import pandas as pd
 import pytest
 import psycopg2
+from sqlalchemy import JSON, Date, Numeric, String, cast, func, literal, select
+
+from services.db import Db
 
 
 class TestDatabaseConnection:
@@ -23,3 +29,21 @@ class TestDatabaseConnection:
                     assert result[0] == 1, "Query should return 1"
         except psycopg2.Error as e:
             pytest.fail(f"Failed to execute query: {e}")
+
+    def test_fast_read_matches_read_sql_query(self):
+        """Test that the COPY read path returns the same frame as pd.read_sql_query."""
+        db = Db()
+        values = select(
+            func.generate_series(1, 3).label("id"),
+            literal("01", String).label("code"),
+            literal(None, String).label("missing"),
+            literal(1.5, Numeric).label("share"),
+            cast(literal({"a": [1, 2]}, JSON), JSON).label("payload"),
+            literal(dt.date(2024, 5, 1), Date).label("day"),
+        )
+        try:
+            pd.testing.assert_frame_equal(
+                db.read_df(values, fast=False), db.read_df(values, fast=True)
+            )
+        finally:
+            db.close()
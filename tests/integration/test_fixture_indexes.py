@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import inspect
+
+from models.base import BaseMixin
+from models.data_warehouse.main import Team  # noqa: F401
+from models.data_warehouse.fixtures import Fixture
+from services.db import Db
+
+
+@pytest.fixture(scope="module")
+def db():
+    """Provide database connection for the Fixture models."""
+    db = Db()
+    BaseMixin.set_db(db)
+    if not inspect(db.engine).has_table(
+        Fixture.__tablename__, schema=Fixture.__table__.schema
+    ):
+        pytest.skip("Fixtures table does not exist")
+    yield db
+    db.close()
+
+
+def get_partition_index_names(db, index_names):
+    """Return given index names with names of their indexes on table partitions."""
+    with db.engine.connect() as connection:
+        partition_index_names = connection.exec_driver_sql(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = ANY(%(names)s)",
+            {"names": list(index_names)},
+        ).scalars()
+        return list(index_names) + list(partition_index_names)
+
+
+class TestFixtureIndexes:
+    """Integration tests checking that Fixture queries can use the declared indexes.
+
+    Indexes are created by `python -m services.migrations`. On partitioned tables the
+    indexes of the scanned partitions are used.
+    """
+
+    @pytest.mark.parametrize(
+        "statement, index_names",
+        [
+            (Fixture.get_breaks_statement, ["ix_fixtures_breaks_date"]),
+            # Partitions of recent seasons may be read by season as well
+            (
+                Fixture.get_upcoming_fixtures_statement,
+                ["ix_fixtures_date_brin", "ix_fixtures_season_home_team"],
+            ),
+            (
+                lambda: Fixture.get_season_fixtures_by_team_statement(1, "2024"),
+                ["ix_fixtures_season_home_team", "ix_fixtures_season_away_team"],
+            ),
+            (
+                lambda: Fixture.get_day_summary_statement("2024-05-01"),
+                ["ix_fixtures_match_date_status"],
+            ),
+        ],
+    )
+    def test_query_uses_index(self, db, statement, index_names):
+        """Test that the plan scans one of the expected indexes with seq scans off."""
+        plan = db.explain(statement(), force_index=True)
+        index_names = get_partition_index_names(db, index_names)
+
+        assert "Seq Scan" not in plan, f"Sequential scan in plan:\n{plan}"
+        # Nothing is read when all partitions are pruned
+        assert " Scan " not in plan or any(
+            index_name in plan for index_name in index_names
+        ), f"None of {index_names} used in plan:\n{plan}"
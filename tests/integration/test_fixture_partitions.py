@@ -0,0 +1,48 @@
+import re
+
+import pytest
+from sqlalchemy import inspect
+
+from models.base import BaseMixin
+from models.data_warehouse.main import Team  # noqa: F401
+from models.data_warehouse.fixtures import Fixture
+from services.db import Db
+
+
+@pytest.fixture(scope="module")
+def db():
+    """Provide database connection for the Fixture models."""
+    db = Db()
+    BaseMixin.set_db(db)
+    if not inspect(db.engine).has_table(
+        Fixture.__tablename__, schema=Fixture.__table__.schema
+    ):
+        pytest.skip("Fixtures table does not exist")
+    yield db
+    db.close()
+
+
+class TestFixturePartitions:
+    """Integration tests checking that Fixture queries skip partitions of other seasons.
+
+    Existing tables are partitioned by `python -m services.migrations`.
+    """
+
+    @staticmethod
+    def get_scanned_partitions(db, statement):
+        return set(re.findall(r"\bfixtures_p\d+\b", db.explain(statement)))
+
+    def test_season_query_scans_only_its_partition(self, db):
+        """Test that a query of one season reads at most that season's partition."""
+        statement = Fixture.get_season_fixtures_by_team_statement(1, "2024")
+
+        assert self.get_scanned_partitions(db, statement) <= {"fixtures_p2024"}
+
+    def test_date_query_skips_older_seasons(self, db):
+        """Test that a match day query does not read partitions of older seasons."""
+        statement = Fixture.get_day_summary_statement("2024-05-01")
+
+        assert all(
+            partition >= "fixtures_p2023"
+            for partition in self.get_scanned_partitions(db, statement)
+        )
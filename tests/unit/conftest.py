@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from services.api.quota_ledger import quota_ledger
+from services.api.response_cache import response_cache
+from services.api.retry_queue import retry_queue
+from services.db import Db
+
+STATUS_RESPONSE = {
+    "response": {
+        "account": {"firstname": "Test"},
+        "subscription": {"plan": "Free", "end": "2030-01-01"},
+        "requests": {"current": 0, "limit_day": 100},
+    }
+}
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    """Serves fixtures of the requested date after a short delay, none for "empty"."""
+
+    # Keeps connections alive between requests
+    protocol_version = "HTTP/1.1"
+    requests = 0
+    status_requests = 0
+    # date -> (status, headers) of responses served before the fixtures
+    failures: dict[str, list[tuple[int, dict]]] = {}
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/status":
+            with self.lock:
+                MockApiHandler.status_requests += 1
+            body = STATUS_RESPONSE
+        else:
+            with self.lock:
+                MockApiHandler.requests += 1
+                MockApiHandler.in_flight += 1
+                MockApiHandler.max_in_flight = max(
+                    MockApiHandler.max_in_flight, MockApiHandler.in_flight
+                )
+            time.sleep(0.05)
+            with self.lock:
+                MockApiHandler.in_flight -= 1
+            date = parse_qs(url.query)["date"][0]
+            with self.lock:
+                failure = (self.failures.get(date) or [None]).pop(0)
+            if failure:
+                status, headers = failure
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            items = [] if date == "empty" else [{"date": date}]
+            body = {
+                "get": "fixtures",
+                "parameters": {"date": date},
+                "errors": [],
+                "results": len(items),
+                "response": items,
+            }
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_server(monkeypatch, tmp_path):
+    """
+    Run the mock API locally and write fetched files, cached responses, the quota
+    ledger and the retry queue to the test's `tmp_path`.
+    """
+    MockApiHandler.requests = 0
+    MockApiHandler.status_requests = 0
+    MockApiHandler.failures = {}
+    MockApiHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for name, value in {
+        "API_FOOTBALL_BASE_URL": f"http://127.0.0.1:{server.server_port}",
+        "API_FOOTBALL_HEADER_KEY_NAME": "x-apisports-key",
+        "API_FOOTBALL_HEADER_KEY_VALUE": "secret",
+        "API_FOOTBALL_HEADER_HOST_NAME": "x-apisports-host",
+        "API_FOOTBALL_HEADER_HOST_VALUE": "localhost",
+    }.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr("services.api.api_fetcher.ROOT_DIR", tmp_path)
+    monkeypatch.setattr(response_cache, "cache_dir", str(tmp_path / "response_cache"))
+    monkeypatch.setattr(response_cache, "hits", 0)
+    monkeypatch.setattr(response_cache, "misses", 0)
+    monkeypatch.setattr(quota_ledger, "path", str(tmp_path / "api_quota.sqlite"))
+    monkeypatch.setattr(retry_queue, "path", str(tmp_path / "api_retry_queue.sqlite"))
+    yield MockApiHandler
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def db_env(monkeypatch):
+    """Point Db at a PostgreSQL server it connects to only when used."""
+    for name, value in {
+        "DB_USER": "user",
+        "DB_PASSWORD": "secret",
+        "DB_HOST": "primary",
+        "DB_PORT": "5432",
+        "DB_NAME": "football",
+    }.items():
+        monkeypatch.setenv(name, value)
+
+
+@pytest.fixture
+def db(db_env):
+    """Provide Db for the PostgreSQL dialect, engines connect only when used."""
+    db = Db()
+    yield db
+    db.close()
@@ -0,0 +1,104 @@
+import os
+
+from helpers.utils import get_df_from_json, get_json_file_stem
+from services.api.api_fetcher import ApiFetcher
+from services.api.http_session import RequestTimings, create_session, get_with_timings
+
+
+class TestApiFetcher:
+    """Unit tests for requests made on the pooled API session."""
+
+    def test_times_connect_only_for_new_connections(self, api_server):
+        """Test that a kept-alive connection skips the connect phase."""
+        session = create_session()
+        url = f"{os.environ['API_FOOTBALL_BASE_URL']}/fixtures"
+
+        timings = [
+            get_with_timings(session, url, params={"date": "2024-05-01"})[1]
+            for _ in range(2)
+        ]
+        session.close()
+
+        assert timings[0].connect > 0
+        assert timings[1].connect == 0
+
+    def test_reuses_connection_and_times_request_phases(self, api_server):
+        """Test that requests reuse the session's connection and phases are timed."""
+        fetcher = ApiFetcher()
+
+        responses = [
+            fetcher.fetch_data("fixtures", date=f"2024-05-0{day}")
+            for day in range(1, 6)
+        ]
+        fetcher.close()
+
+        assert all(response.json()["response"] for response in responses)
+        # The connection is opened by the quota check before the first request
+        assert not any(timing.is_new_connection for timing in fetcher.request_timings)
+        # The mock API waits 50 ms before responding
+        assert all(timing.first_byte >= 0.04 for timing in fetcher.request_timings)
+        assert all(timing.tls == 0 for timing in fetcher.request_timings)
+
+    def test_requests_compressed_responses(self, api_server):
+        """Test that the session asks for compressed responses."""
+        assert "gzip" in ApiFetcher().session.headers["Accept-Encoding"]
+
+    def test_mean_timings(self):
+        """Test that phases are averaged over requests."""
+        mean = RequestTimings.mean(
+            [
+                RequestTimings(connect=0.2, first_byte=0.1),
+                RequestTimings(first_byte=0.3),
+            ]
+        )
+
+        assert mean == RequestTimings(connect=0.1, first_byte=0.2)
+        assert RequestTimings.mean([]) == RequestTimings()
+
+
+class TestResponsePersistence:
+    """Unit tests for writing raw responses and reading them back."""
+
+    def test_detects_empty_response_without_decoding(self):
+        """Test that the results count decides, payloads without it are decoded."""
+        assert ApiFetcher.is_empty_response(b'{"results": 0, "response": []}')
+        assert not ApiFetcher.is_empty_response(b'{"results":2,"response":[{},{}]}')
+        assert not ApiFetcher.is_empty_response(b'{"response": [{"id": 1}]}')
+        assert ApiFetcher.is_empty_response(b'{"response": []}')
+        assert ApiFetcher.is_empty_response(b"not json")
+
+    def test_writes_raw_bytes_and_reads_compressed_files(
+        self, api_server, tmp_path, monkeypatch
+    ):
+        """Test that bytes are stored as received and gzip files parse like plain ones."""
+        monkeypatch.setattr("helpers.utils.ROOT_DIR", tmp_path)
+        fetcher = ApiFetcher()
+        response = fetcher.fetch_data("fixtures", date="2024-05-01")
+
+        fetcher.write_response_to_json(response, "FIXTURES_plain", "fixtures")
+        fetcher.write_response_to_json(
+            response, "FIXTURES_gzip", "fixtures", compress=True
+        )
+
+        fixtures_dir = tmp_path / "data" / "fixtures"
+        assert (fixtures_dir / "FIXTURES_plain.json").read_bytes() == response.content
+        assert sorted(path.name for path in fixtures_dir.iterdir()) == [
+            "FIXTURES_gzip.json.gz",
+            "FIXTURES_plain.json",
+        ]
+        assert get_df_from_json(
+            get_json_file_stem("FIXTURES_gzip.json.gz"), "fixtures"
+        ).equals(get_df_from_json("FIXTURES_plain", "fixtures"))
+
+    def test_compressed_write_replaces_plain_file(self, api_server, tmp_path):
+        """Test that a response is stored once, in the latest format."""
+        fetcher = ApiFetcher()
+        response = fetcher.fetch_data("fixtures", date="2024-05-01")
+
+        fetcher.write_response_to_json(response, "FIXTURES_1", "fixtures")
+        fetcher.write_response_to_json(
+            response, "FIXTURES_1", "fixtures", compress=True
+        )
+
+        fixtures_dir = tmp_path / "data" / "fixtures"
+        assert [path.name for path in fixtures_dir.iterdir()] == ["FIXTURES_1.json.gz"]
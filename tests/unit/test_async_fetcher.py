@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from services.api.async_fetcher import AsyncFetcher
+from services.api.rate_limiter import TokenBucket
+
+
+class TestAsyncFetcher:
+    """Unit tests for concurrent, rate limited API pulls."""
+
+    def test_writes_responses_of_concurrent_requests(self, api_server, tmp_path):
+        """Test that requests overlap and each non-empty response is written."""
+        dates = [f"2024-05-{day:02d}" for day in range(1, 11)] + ["empty"]
+        fetcher = AsyncFetcher(concurrency=4)
+
+        fetcher.pull_data_by_dates(dates, "fixtures?date={}", "FIXTURES_", "fixtures")
+
+        written = sorted(path.name for path in (tmp_path / "data/fixtures").iterdir())
+        assert written == [f"FIXTURES_{date}.json" for date in dates[:-1]]
+        assert api_server.max_in_flight > 1
+        assert fetcher.last_stats.requests == 11
+        assert fetcher.last_stats.written == 10
+        assert fetcher.last_stats.requests_per_second > 0
+
+    def test_rate_limiter_caps_requests_per_second(self, api_server):
+        """Test that the token bucket paces requests regardless of concurrency."""
+        fetcher = AsyncFetcher(
+            concurrency=8, rate_limiter=TokenBucket(rate=20, capacity=1)
+        )
+
+        fetcher.pull_data_by_dates(
+            [f"2024-06-{day:02d}" for day in range(1, 11)],
+            "fixtures?date={}",
+            "FIXTURES_",
+            "fixtures",
+        )
+
+        # First token is available at once, the other nine refill at 20 per second
+        assert fetcher.last_stats.elapsed >= 0.45
+        assert fetcher.last_stats.requests_per_second <= 22
+
+
+class TestTokenBucket:
+    """Unit tests for the token bucket rate limiter."""
+
+    def test_limit_per_minute_includes_burst(self):
+        """Test that burst and refill together stay within the per-minute limit."""
+        bucket = TokenBucket.from_limit_per_minute(400, burst=5)
+
+        assert bucket.rate * 60 + bucket.capacity == 400
+
+    def test_burst_is_immediate_then_paced(self):
+        """Test that a full bucket serves its capacity at once, then refills."""
+        bucket = TokenBucket(rate=50, capacity=3)
+
+        async def acquire_times():
+            started_at = time.monotonic()
+            times = []
+            for _ in range(5):
+                await bucket.acquire()
+                times.append(time.monotonic() - started_at)
+            return times
+
+        times = asyncio.run(acquire_times())
+
+        assert times[2] < 0.01
+        assert times[4] >= 0.035
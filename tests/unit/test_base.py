@@ -0,0 +1,345 @@
+import json
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+
+from models.analytics.breaks import BreaksTeamStats, Pair
+from models.base import BaseMixin, UpsertResult
+from models.data_warehouse.fixtures import Fixture, FixtureEvent, FixtureStat
+
+
+class TestCopyFrame:
+    """Unit tests for preparing DataFrames for the COPY load path."""
+
+    def test_maps_attribute_names_to_column_names(self):
+        """Test that mapped attribute names are renamed to table column names."""
+        df = pd.DataFrame(
+            [{"team_id": 1, "team_name": "Team", "c_2020": 3, "rounds_1_13": 2}]
+        )
+
+        copy_df = BreaksTeamStats._get_copy_frame(df)
+
+        assert list(copy_df.columns) == ["team_id", "team_name", "2020", "rounds_1-13"]
+
+    def test_serializes_json_and_restores_integers(self):
+        """Test that JSON values are dumped, integers restored and unknown columns dropped."""
+        df = pd.DataFrame(
+            [
+                {
+                    "fixture_id": 1.0,
+                    "side": "home",
+                    "team_id": None,
+                    "statistics": {"Shots": 4},
+                    "unknown": "x",
+                }
+            ]
+        )
+
+        copy_df = FixtureStat._get_copy_frame(df)
+
+        assert "unknown" not in copy_df.columns
+        assert copy_df["fixture_id"].dtype == "Int64"
+        assert copy_df["team_id"].isna().all()
+        assert json.loads(copy_df["statistics"].iloc[0]) == {"Shots": 4}
+
+    def test_skips_computed_columns(self):
+        """Test that columns generated by the database are not written."""
+        df = pd.DataFrame([{"fixture_id": 1, "match_date": "2024-05-01"}])
+
+        copy_df = Fixture._get_copy_frame(df)
+
+        assert list(copy_df.columns) == ["fixture_id"]
+        assert Fixture.get_computed_columns() == ["match_date"]
+
+
+class TestSplitNewAndExisting:
+    """Unit tests for partitioning upsert input into new and existing rows."""
+
+    def test_splits_on_composite_keys_with_mismatched_dtypes(self):
+        """Test that keys are matched after casting both sides to column types."""
+        df = pd.DataFrame(
+            {
+                "fixture_id": [1, 1, 2, 3],
+                "event_id": [1, 2, 1, 1],
+                "event_type": ["Goal", "Card", "Goal", "Var"],
+            }
+        )
+        existing_records = pd.DataFrame(
+            {"fixture_id": ["1", "3"], "event_id": [2.0, 1.0]}
+        )
+
+        new_df, existing_df = FixtureEvent.split_new_and_existing(
+            df, existing_records, ["fixture_id", "event_id"]
+        )
+
+        assert new_df["event_type"].tolist() == ["Goal", "Goal"]
+        assert existing_df["event_type"].tolist() == ["Card", "Var"]
+
+    def test_returns_all_rows_as_new_without_existing_records(self):
+        """Test that every row is new when nothing exists in the table."""
+        df = pd.DataFrame({"fixture_id": [1, 2], "event_id": [1, 1]})
+
+        new_df, existing_df = FixtureEvent.split_new_and_existing(
+            df, pd.DataFrame(), ["fixture_id", "event_id"]
+        )
+
+        assert len(new_df) == 2
+        assert existing_df.empty
+
+
+class TestDropUnchanged:
+    """Unit tests for fingerprint-based change detection."""
+
+    def test_keeps_only_changed_rows(self):
+        """Test that rows equal to the stored version are dropped after type casting."""
+        df = pd.DataFrame(
+            {
+                "fixture_id": [1, 2],
+                "side": ["home", "home"],
+                "team_id": [10, 20],
+                "statistics": [{"b": 1, "a": 2}, {"a": 1}],
+            }
+        )
+        existing_records = pd.DataFrame(
+            {
+                "fixture_id": [1, 2],
+                "side": ["home", "home"],
+                "team_id": [10.0, 20.0],
+                "team_name": ["A", "B"],
+                "statistics": [{"a": 2, "b": 1}, {"a": 2}],
+            }
+        )
+
+        changed_df = FixtureStat.drop_unchanged(
+            df, existing_records, ["fixture_id", "side"]
+        )
+
+        assert changed_df["fixture_id"].tolist() == [2]
+
+
+class TestUpsertChunks:
+    """Unit tests for upserts of iterators of frames."""
+
+    class RecordingDb:
+        """Stands in for Db, records each transaction opened by chunk loads."""
+
+        current_transaction = None
+
+        def __init__(self, events: list):
+            self.events = events
+
+        @contextmanager
+        def transaction(self):
+            self.events.append("begin")
+            yield
+            self.events.append("commit")
+
+    def test_iterator_is_loaded_lazily_one_transaction_per_chunk(self, monkeypatch):
+        """Test that frames are pulled as chunks are written, each chunk committed."""
+        events = []
+
+        def load_chunk(df):
+            with Fixture.db.transaction():
+                events.append(df["fixture_id"].tolist())
+            return UpsertResult(inserted=len(df))
+
+        def frames():
+            for start in (0, 3, 6):
+                events.append(f"parse {start}")
+                yield pd.DataFrame(
+                    {"fixture_id": range(start, start + 3), "season_year": "2024"}
+                )
+
+        monkeypatch.setattr(Fixture, "db", self.RecordingDb(events))
+        monkeypatch.setattr(Fixture, "ensure_table", lambda: None)
+        monkeypatch.setattr(Fixture, "ensure_partitions", lambda df: None)
+        monkeypatch.setattr(Fixture, "prune_change_log", lambda: 0)
+        monkeypatch.setattr(Fixture, "invalidate_cached_queries", lambda: None)
+        monkeypatch.setattr(Fixture, "orm_upsert", load_chunk)
+
+        result = Fixture.upsert(frames(), load_method="orm", chunk_size=2)
+
+        assert result.inserted == 9
+        assert events == [
+            "parse 0",
+            *["begin", [0, 1], "commit"],
+            *["begin", [2], "commit"],
+            "parse 3",
+            *["begin", [3, 4], "commit"],
+            *["begin", [5], "commit"],
+            "parse 6",
+            *["begin", [6, 7], "commit"],
+            *["begin", [8], "commit"],
+        ]
+
+
+class TestShareOfNotStartedGames:
+    """Unit tests for the share of not started fixtures of a match day."""
+
+    def test_share_of_day_summary(self, monkeypatch):
+        """Test that the share is computed over all rows of the summary."""
+        summary_df = pd.DataFrame({"total": [3, 1], "not_started": [1, 0]})
+        monkeypatch.setattr(Fixture, "get_day_summary", lambda date: summary_df)
+
+        assert Fixture.calculate_share_of_not_started_games("2024-05-01") == 25
+
+    def test_day_without_fixtures_is_zero(self, monkeypatch):
+        """Test that an empty summary gives 0 instead of dividing by zero."""
+        summary_df = pd.DataFrame({"total": [], "not_started": []})
+        monkeypatch.setattr(Fixture, "get_day_summary", lambda date: summary_df)
+
+        assert Fixture.calculate_share_of_not_started_games("2024-05-01") == 0
+
+    def test_read_errors_are_raised(self, monkeypatch):
+        """Test that a failed read is raised instead of an unbound summary."""
+
+        def get_day_summary(date):
+            raise ConnectionError("database is down")
+
+        monkeypatch.setattr(Fixture, "get_day_summary", get_day_summary)
+
+        with pytest.raises(ConnectionError):
+            Fixture.calculate_share_of_not_started_games("2024-05-01")
+
+
+class TestPartitionByKeyHash:
+    """Unit tests for splitting upsert chunks across concurrent writers."""
+
+    def test_partitions_are_disjoint_sorted_and_deterministic(self):
+        """Test that keys land in one partition regardless of dtype and are sorted."""
+        df = pd.DataFrame(
+            {
+                "fixture_id": [3, 1, 2, 1, 3, 2],
+                "event_id": [1, 2, 1, 1, 2, 2],
+                "event_type": ["a", "b", "c", "d", "e", "f"],
+            }
+        )
+
+        partitions = FixtureEvent.partition_by_key_hash(df, 3)
+        float_partitions = FixtureEvent.partition_by_key_hash(
+            df.astype({"fixture_id": float}), 3
+        )
+
+        assert sum(len(partition) for partition in partitions) == len(df)
+        assert [p["event_type"].tolist() for p in partitions] == [
+            p["event_type"].tolist() for p in float_partitions
+        ]
+        for partition in partitions:
+            keys = list(zip(partition["fixture_id"], partition["event_id"]))
+            assert keys == sorted(keys)
+
+
+class TestGetTableSelect:
+    """Unit tests for building projected and filtered table reads."""
+
+    def test_projects_columns_and_applies_filter(self):
+        """Test that only requested columns are selected and the filter is applied."""
+        statement = Fixture.get_table_select(
+            columns=["fixture_id", "status"], where=Fixture.status == "NS"
+        )
+
+        assert [column.name for column in statement.selected_columns] == [
+            "fixture_id",
+            "status",
+        ]
+        assert "WHERE dw_fixtures.fixtures.status = " in str(statement)
+
+    def test_selects_all_columns_by_default(self):
+        """Test that the whole table is read without projection."""
+        statement = BreaksTeamStats.get_table_select()
+
+        assert len(statement.selected_columns) == len(BreaksTeamStats.__table__.columns)
+
+
+class TestPartitionBounds:
+    """Unit tests for routing partition key values to range partitions."""
+
+    def test_reads_partition_column_from_table_options(self):
+        """Test that the range partition key is taken from the table declaration."""
+        assert Fixture.get_partition_column() == "season_year"
+        assert FixtureEvent.get_partition_column() == "fixture_id"
+        assert BreaksTeamStats.get_partition_column() is None
+
+    def test_season_bounds_are_strings(self):
+        """Test that text partition keys get text bounds of one season."""
+        assert Fixture.get_partition_bounds("2024") == ("2024", "2025")
+
+    def test_fixture_id_bounds_cover_interval(self):
+        """Test that values of one interval share bounds, also when read as floats."""
+        interval = FixtureStat.partition_interval
+
+        assert FixtureStat.get_partition_bounds(interval + 1) == (
+            interval,
+            2 * interval,
+        )
+        assert FixtureStat.get_partition_bounds(float(2 * interval - 1)) == (
+            interval,
+            2 * interval,
+        )
+
+
+class TestChangeLog:
+    """Unit tests for the change log of upserted rows."""
+
+    def test_change_log_table_holds_primary_keys(self):
+        """Test that the change log is defined once, next to the model's table."""
+        change_log = Fixture.get_change_log_table()
+
+        assert change_log is Fixture.get_change_log_table()
+        assert change_log.fullname == "dw_fixtures.fixtures_changes"
+        assert [column.name for column in change_log.columns] == [
+            "change_id",
+            "fixture_id",
+            "season_year",
+            "operation",
+            "changed_at",
+        ]
+        assert [column.name for column in change_log.primary_key] == ["change_id"]
+
+    def test_changed_since_condition_filters_by_offset(self):
+        """Test that the condition selects keys of changes after the offset."""
+        sql = str(
+            Fixture.get_changed_since_condition(42).compile(
+                compile_kwargs={"literal_binds": True}
+            )
+        )
+
+        assert (
+            "(dw_fixtures.fixtures.fixture_id, dw_fixtures.fixtures.season_year) IN"
+            in sql
+        )
+        assert "dw_fixtures.fixtures_changes.change_id > 42" in sql
+
+    def test_prune_statement_removes_changes_past_retention(self):
+        """Test that pruning deletes only changes older than the retention."""
+        sql = str(
+            Fixture.get_change_log_prune_statement().compile(
+                compile_kwargs={"literal_binds": True}
+            )
+        )
+
+        assert sql.startswith("DELETE FROM dw_fixtures.fixtures_changes WHERE")
+        assert "dw_fixtures.fixtures_changes.changed_at < now() -" in sql
+
+
+class TestSqlDefaults:
+    """Unit tests for SQL defaults applied by COPY loads and table replacement."""
+
+    @pytest.fixture(autouse=True)
+    def set_db(self, monkeypatch, db):
+        """Set Db for the PostgreSQL dialect, it connects only when used."""
+        monkeypatch.setattr(BaseMixin, "db", db)
+
+    def test_renders_sequence_and_clause_defaults(self):
+        """Test that sequences and SQL expressions of missing columns are rendered."""
+        assert Pair._get_sql_defaults((), "default") == {
+            "pair_id": "nextval('pair_id_seq')"
+        }
+        assert Fixture._get_sql_defaults(("fixture_id",), "onupdate") == {
+            "update_date": "now()"
+        }
+
+    def test_skips_provided_columns(self):
+        """Test that provided columns keep their values."""
+        assert Pair._get_sql_defaults(("pair_id",), "default") == {}
@@ -0,0 +1,167 @@
+import datetime as dt
+import importlib
+from contextlib import nullcontext
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from config.vars import REFRESH_WATERMARK_LAG_SECONDS
+from models.analytics.breaks import Break, BreaksTeamStats, Pair, RefreshWatermark
+from models.data_warehouse.fixtures import Fixture
+from models.data_warehouse.main import Team
+
+LAG = dt.timedelta(seconds=REFRESH_WATERMARK_LAG_SECONDS)
+
+
+@pytest.fixture
+def aggregations(db_env):
+    """Provide the aggregations module, its Db connects only when used."""
+    return importlib.import_module("data_processing.data_aggregations")
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """
+    Record calls of a breaks refresh instead of running them in the database, with the
+    last watermark at noon and the latest fixture update from `max_update_date`.
+    """
+    calls = {"since": dt.datetime(2024, 5, 1, 12)}
+
+    def get_max_update_date(lag=None):
+        calls["lag"] = lag
+        return calls["max_update_date"]
+
+    monkeypatch.setattr(Fixture, "db", type("FakeDb", (), {"transaction": nullcontext}))
+    monkeypatch.setattr(Fixture, "get_max_update_date", get_max_update_date)
+    monkeypatch.setattr(RefreshWatermark, "get_watermark", lambda name: calls["since"])
+    monkeypatch.setattr(
+        RefreshWatermark,
+        "set_watermark",
+        lambda name, watermark: calls.update(watermark=watermark),
+    )
+    monkeypatch.setattr(
+        Break, "refresh_from_fixtures", lambda updated: calls.update(updated=updated)
+    )
+    monkeypatch.setattr(BreaksTeamStats, "refresh_teams", lambda team_ids: 0)
+    return calls
+
+
+class TestAggregateStatement:
+    """Unit tests for computing breaks team stats inside the database."""
+
+    def test_selects_table_columns_in_order(self):
+        """Test that every table column has an aggregate, in insert order."""
+        statement = BreaksTeamStats.get_aggregate_statement()
+
+        assert [column.name for column in statement.selected_columns] == [
+            column.name for column in BreaksTeamStats.__table__.columns
+        ]
+
+    def test_restricts_both_sides_to_given_teams(self):
+        """Test that home and away rows are limited to the given teams."""
+        team_ids = select(BreaksTeamStats.team_id).where(BreaksTeamStats.total > 5)
+
+        sql = str(
+            BreaksTeamStats.get_aggregate_statement(team_ids).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        assert "home_team_id IN (SELECT" in sql
+        assert "away_team_id IN (SELECT" in sql
+
+
+class TestIncrementalRefresh:
+    """Unit tests for selecting fixtures changed since the last breaks refresh."""
+
+    def test_watermark_stays_behind_uncommitted_writes(self):
+        """Test that the next watermark is at most the lag before now."""
+        compiled = Fixture.get_max_update_date_statement(LAG).compile(
+            dialect=postgresql.dialect()
+        )
+
+        assert str(compiled).startswith(
+            "SELECT least(max(dw_fixtures.fixtures.update_date), LOCALTIMESTAMP - "
+        )
+        assert list(compiled.params.values()) == [LAG]
+
+    def test_selects_fixtures_updated_after_watermark(self, aggregations, calls):
+        """Test that fixtures updated after the last watermark are recomputed."""
+        calls["max_update_date"] = dt.datetime(2024, 5, 1, 12, 30)
+
+        aggregations.refresh_breaks()
+        compiled = calls["updated"].compile(dialect=postgresql.dialect())
+
+        assert calls["lag"] == LAG
+        assert str(compiled) == "dw_fixtures.fixtures.update_date > %(update_date_1)s"
+        assert compiled.params == {"update_date_1": dt.datetime(2024, 5, 1, 12)}
+        assert calls["watermark"] == dt.datetime(2024, 5, 1, 12, 30)
+
+    def test_skips_refresh_without_newer_fixtures(self, aggregations, calls):
+        """Test that nothing is recomputed while the watermark does not advance."""
+        calls["max_update_date"] = dt.datetime(2024, 5, 1, 12)
+
+        aggregations.refresh_breaks()
+
+        assert "updated" not in calls
+        assert "watermark" not in calls
+
+
+class TestPairs:
+    """Unit tests for replacing pairs of teams with coincidental breaks."""
+
+    @pytest.fixture
+    def replaced(self, monkeypatch):
+        """Record frames passed to `Pair.replace` instead of writing them."""
+        replaced = []
+        teams_df = pd.DataFrame(
+            {
+                "team_id": [1, 2, 3, 4],
+                "team_name": ["T1", "T2", "T3", "T4"],
+                "country_name": "Poland",
+            }
+        )
+        monkeypatch.setattr(Team, "get_df_from_table", lambda: teams_df)
+        monkeypatch.setattr(Pair, "replace", replaced.append)
+        monkeypatch.setattr(pd.DataFrame, "to_csv", lambda *args, **kwargs: None)
+        return replaced
+
+    @staticmethod
+    def get_breaks(home_team_id: int, away_team_id: int, first_id: int) -> list:
+        return [
+            {
+                "fixture_id": first_id + game,
+                "league_name": "Ekstraklasa",
+                "round": "1",
+                "date": f"2024-{game + 1:02d}-01",
+                "referee": None,
+                "home_team_id": home_team_id,
+                "away_team_id": away_team_id,
+            }
+            for game in range(6)
+        ]
+
+    def test_pairs_are_replaced_in_one_frame(self, replaced):
+        """Test that all pairs are swapped in with a single frame."""
+        breaks_df = pd.DataFrame(self.get_breaks(1, 3, 0) + self.get_breaks(2, 4, 10))
+
+        Pair.search_coincidental_breaks_by_team_id(breaks_df)
+
+        assert len(replaced) == 1
+        assert replaced[0][["team_id_1", "team_id_2"]].values.tolist() == [
+            [1, 2],
+            [1, 4],
+            [2, 3],
+            [3, 4],
+        ]
+        assert replaced[0].index.tolist() == [0, 1, 2, 3]
+
+    def test_existing_pairs_are_kept_without_new_ones(self, replaced):
+        """Test that the table is not emptied when no pairs are found."""
+        breaks_df = pd.DataFrame(self.get_breaks(1, 3, 0)[:1])
+
+        Pair.search_coincidental_breaks_by_team_id(breaks_df)
+
+        assert replaced == []
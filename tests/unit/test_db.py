@@ -0,0 +1,98 @@
+import pytest
+
+from services.db import Db, _reset_after_fork
+from services.engine_registry import EngineRegistry
+
+
+@pytest.fixture
+def db_env(db_env, monkeypatch):
+    """Add two replicas to the Db of each test."""
+    monkeypatch.setenv("DB_REPLICA_HOSTS", "replica-1, replica-2:5433")
+
+
+class TestReadRouting:
+    """Unit tests for routing reads to read replicas."""
+
+    def test_builds_replica_urls_from_hosts(self, db):
+        """Test that replicas share the primary's credentials and default port."""
+        assert [
+            (engine.url.host, engine.url.port, engine.url.username)
+            for engine in db.replica_engines
+        ] == [("replica-1", 5432, "user"), ("replica-2", 5433, "user")]
+
+    def test_reads_rotate_over_replicas(self, db):
+        """Test that consecutive reads are spread over all replicas."""
+        hosts = [db.read_engine.url.host for _ in range(4)]
+
+        assert hosts == ["replica-1", "replica-2", "replica-1", "replica-2"]
+
+    def test_primary_block_and_unit_of_work_read_from_primary(self, db):
+        """Test that reads needing own writes stay on the primary."""
+        with db.primary():
+            with db.primary():
+                assert db.read_engine is db.engine
+            assert db.read_engine is db.engine
+        assert db.read_engine is not db.engine
+
+        with db.transaction():
+            assert db.read_engine is db.engine
+
+    def test_reads_from_primary_without_replicas(self, db):
+        """Test that the primary serves reads when no replica is configured."""
+        primary_only_db = Db(replica_urls=[])
+
+        assert primary_only_db.read_engine is primary_only_db.engine
+        primary_only_db.close()
+
+
+class TestConnectionPooling:
+    """Unit tests for pool configuration and per-process engines."""
+
+    def test_pool_options_from_config(self, db, monkeypatch):
+        """Test that engines get the configured pool, smaller in worker processes."""
+        options = db.get_pool_options()
+
+        assert options["pool_size"] == db.config.DB_POOL_SIZE
+        assert options["max_overflow"] == db.config.DB_MAX_OVERFLOW
+        assert options["pool_pre_ping"] is True
+        assert db.engine.pool.size() == db.config.DB_POOL_SIZE
+
+        monkeypatch.setattr(
+            "services.db.multiprocessing.parent_process", lambda: object()
+        )
+        assert db.get_pool_options()["pool_size"] == db.config.DB_WORKER_POOL_SIZE
+        assert db.get_pool_options()["max_overflow"] == db.config.DB_WORKER_MAX_OVERFLOW
+
+    def test_pool_options_override(self, db):
+        """Test that options passed to Db take precedence over the config."""
+        small_db = Db(pool_options={"pool_size": 1})
+
+        assert small_db.get_pool_options()["pool_size"] == 1
+        assert small_db.engine.pool.size() == 1
+        assert db.engine.pool.size() == db.config.DB_POOL_SIZE
+        small_db.close()
+
+    def test_registry_shares_engine_per_url_and_options(self):
+        """Test that the registry returns one engine per URL and options until reset."""
+        registry = EngineRegistry()
+        url = "postgresql://user@primary:5432/football"
+
+        engine = registry.get_engine(url)
+
+        assert registry.get_engine(url) is engine
+        assert registry.get_engine(f"{url}_other") is not engine
+        assert registry.get_engine(url, pool_size=2).pool.size() == 2
+        assert registry.get_engine(url, pool_size=2) is not engine
+
+        registry.reset_after_fork()
+
+        assert registry.get_engine(url) is not engine
+
+    def test_sessions_recreated_after_fork(self, db):
+        """Test that a forked process gets a new session factory and unit of work."""
+        with db.transaction():
+            session_factory = db.Session
+            _reset_after_fork()
+
+            assert db.Session is not session_factory
+            assert db.current_transaction is None
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+import pandas as pd
+
+from models.data_warehouse.main import Team
+from services.query_cache import QueryCache, _make_key_part
+
+
+class TestQueryCache:
+    """Unit tests for the in-process query result cache."""
+
+    def test_returns_copies_until_table_is_invalidated(self):
+        """Test that cached frames are copies and upserted tables are dropped."""
+        cache = QueryCache(max_entries=4, ttl=60)
+        cache.set("teams", "dw_main.teams", pd.DataFrame({"team_id": [1]}))
+        cache.set("countries", "dw_main.countries", pd.DataFrame({"country_id": [1]}))
+
+        cache.get("teams")["team_id"] = 2
+        assert cache.get("teams")["team_id"].tolist() == [1]
+
+        cache.invalidate("dw_main.teams")
+        assert cache.get("teams") is None
+        assert cache.get("countries") is not None
+
+    def test_serves_entries_only_at_their_version(self):
+        """Test that entries of a table written by another process are not served."""
+        cache = QueryCache(max_entries=4, ttl=60)
+        cache.set("teams", "dw_main.teams", pd.DataFrame({"team_id": [1]}), version=3)
+
+        assert cache.get("teams", version=3)["team_id"].tolist() == [1]
+        assert cache.get("teams", version=4) is None
+        assert cache.get("teams", version=3) is None
+
+    def test_keys_statements_by_sql_and_bound_params(self):
+        """Test that filters are keyed without rendering their values into the SQL."""
+        team_ids = list(range(1000))
+
+        sql, params = _make_key_part(Team.team_id.in_(team_ids))
+
+        assert sql == "dw_main.teams.team_id IN (__[POSTCOMPILE_team_id_1])"
+        assert params == (("team_id_1", tuple(team_ids)),)
+        assert _make_key_part(Team.team_id.in_([1, 2])) != _make_key_part(
+            Team.team_id.in_([1, 3])
+        )
+
+    @patch("services.query_cache.time.monotonic")
+    def test_expires_entries_after_ttl(self, mock_monotonic):
+        """Test that entries older than the TTL are not served."""
+        cache = QueryCache(max_entries=4, ttl=60)
+        mock_monotonic.return_value = 0
+        cache.set("teams", "dw_main.teams", pd.DataFrame({"team_id": [1]}))
+
+        mock_monotonic.return_value = 61
+        assert cache.get("teams") is None
+
+    def test_spills_least_recently_used_entries(self, tmp_path):
+        """Test that entries evicted from memory are served from the spill directory."""
+        cache = QueryCache(max_entries=1, ttl=60, spill_dir=str(tmp_path))
+        cache.set("teams", "dw_main.teams", pd.DataFrame({"team_id": [1]}))
+        cache.set("countries", "dw_main.countries", pd.DataFrame({"country_id": [1]}))
+
+        assert len(list(tmp_path.iterdir())) == 1
+        assert cache.get("teams")["team_id"].tolist() == [1]
+
+        cache.invalidate()
+        assert list(tmp_path.iterdir()) == []
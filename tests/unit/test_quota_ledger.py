@@ -0,0 +1,151 @@
+import multiprocessing
+import sqlite3
+import threading
+
+from services.api.api_fetcher import ApiFetcher
+from services.api.async_fetcher import AsyncFetcher
+from services.api.quota_ledger import QuotaLedger, QuotaPlanner
+
+PLANNER = QuotaPlanner(
+    priorities={"fixtures": 0, "fixture_stats": 1, "teams": 2},
+    reserved_shares={"fixtures": 0.2, "fixture_stats": 0.1},
+    default_priority=3,
+)
+
+
+def consume_until_spent(path: str) -> int:
+    ledger = QuotaLedger(path=path, planner=PLANNER)
+    consumed = 0
+    while ledger.try_consume("fixtures"):
+        consumed += 1
+    return consumed
+
+
+class TestQuotaPlanner:
+    """Unit tests for splitting the daily quota by priority."""
+
+    def test_backfills_leave_reserves_of_higher_priorities(self):
+        """Test that lower priorities cannot use quota held for higher ones."""
+        budget = PLANNER.get_budget("backfill", remaining=100, limit=100, used={})
+
+        assert budget == 70
+
+    def test_reserve_shrinks_as_entity_uses_it(self):
+        """Test that quota is only held for what an entity did not use yet."""
+        used = {"fixtures": 15, "fixture_stats": 10}
+
+        budget = PLANNER.get_budget("teams", remaining=75, limit=100, used=used)
+
+        assert budget == 70
+
+    def test_plan_serves_priorities_in_order(self):
+        """Test that high priority demands are met before low priority ones."""
+        plan = PLANNER.plan(
+            {"backfill": 500, "fixtures": 30, "fixture_stats": 50},
+            remaining=100,
+            limit=100,
+            used={},
+        )
+
+        assert plan == {"fixtures": 30, "fixture_stats": 50, "backfill": 20}
+
+    def test_plan_splits_a_priority_by_demand(self):
+        """Test that entities of one priority share the quota by their demands."""
+        planner = QuotaPlanner(priorities={}, reserved_shares={}, default_priority=0)
+
+        plan = planner.plan({"a": 300, "b": 100}, remaining=41, limit=100, used={})
+
+        assert plan == {"a": 31, "b": 10}
+
+
+class TestQuotaLedger:
+    """Unit tests for the quota ledger shared by processes."""
+
+    def test_consumption_is_shared_by_processes(self, tmp_path):
+        """Test that processes consuming at once never exceed the limit together."""
+        path = str(tmp_path / "api_quota.sqlite")
+        QuotaLedger(path=path, planner=PLANNER).sync(limit_day=200, current=50)
+
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            consumed = pool.map(consume_until_spent, [path] * 4)
+
+        ledger = QuotaLedger(path=path, planner=PLANNER)
+        assert sum(consumed) == 150
+        assert ledger.get_remaining() == 0
+        assert ledger.get_usage() == {"fixtures": 150}
+
+    def test_sync_keeps_requests_not_counted_by_api(self, tmp_path):
+        """Test that a lagging API counter does not lower the recorded usage."""
+        ledger = QuotaLedger(path=str(tmp_path / "api_quota.sqlite"), planner=PLANNER)
+        ledger.sync(limit_day=100, current=10)
+        ledger.try_consume("fixtures", count=5)
+
+        ledger.sync(limit_day=100, current=12)
+
+        assert ledger.get_remaining() == 85
+        assert not ledger.needs_sync()
+
+    def test_nothing_is_consumed_before_sync(self, tmp_path):
+        """Test that requests are refused while today's limit is unknown."""
+        ledger = QuotaLedger(path=str(tmp_path / "api_quota.sqlite"))
+
+        assert ledger.needs_sync()
+        assert not ledger.try_consume("fixtures")
+
+    def test_threads_reuse_their_connection(self, monkeypatch, tmp_path):
+        """Test that each thread opens one connection and the schema is created once."""
+        statements = []
+        sqlite_connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            connection = sqlite_connect(*args, **kwargs)
+            connection.set_trace_callback(statements.append)
+            return connection
+
+        monkeypatch.setattr(sqlite3, "connect", connect)
+        ledger = QuotaLedger(path=str(tmp_path / "api_quota.sqlite"), planner=PLANNER)
+        ledger.sync(limit_day=100, current=0)
+        first_connection = ledger._local.connection
+        ledger.try_consume("fixtures")
+        ledger.needs_sync()
+        thread = threading.Thread(target=ledger.try_consume, args=("fixtures",))
+        thread.start()
+        thread.join()
+
+        assert ledger._local.connection is first_connection
+        assert ledger.get_usage() == {"fixtures": 2}
+        assert sum(statement.startswith("CREATE") for statement in statements) == 2
+
+
+class TestFetcherQuota:
+    """Unit tests for fetchers taking requests from the shared quota."""
+
+    def test_status_is_checked_once_for_all_fetchers(self, api_server):
+        """Test that fetchers share the synced ledger instead of asking the API."""
+        fetchers = [ApiFetcher(entity="fixtures") for _ in range(3)]
+
+        for day, fetcher in enumerate(fetchers, start=1):
+            fetcher.fetch_data("fixtures", date=f"2024-05-0{day}")
+            fetcher.close()
+
+        assert api_server.status_requests == 1
+        assert fetchers[0].config.ledger.get_usage() == {"fixtures": 3}
+
+    def test_async_pull_stops_at_budget(self, api_server):
+        """Test that a pull leaves items unfetched once its budget is spent."""
+        fetcher = AsyncFetcher(concurrency=2, entity="backfill")
+        ledger = fetcher.config.ledger
+        ledger.sync(limit_day=100, current=0)
+        # Leaves the backfill three requests beyond the reserves of other entities
+        ledger.sync(limit_day=100, current=ledger.get_budget("backfill") - 3)
+
+        fetcher.pull_data_by_dates(
+            [f"2024-05-{day:02d}" for day in range(1, 11)],
+            "fixtures?date={}",
+            "FIXTURES_",
+            "fixtures",
+        )
+
+        assert fetcher.last_stats.requests == 3
+        assert fetcher.last_stats.over_budget == 7
+        assert api_server.requests == 3
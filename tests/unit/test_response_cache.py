@@ -0,0 +1,97 @@
+import json
+
+from services.api.api_fetcher import ApiFetcher
+from services.api.async_fetcher import AsyncFetcher
+from services.api.response_cache import ResponseCache
+
+
+def get_fixtures_content(*statuses: str) -> bytes:
+    return json.dumps(
+        {
+            "results": len(statuses),
+            "response": [
+                {"fixture": {"status": {"short": status}}} for status in statuses
+            ],
+        }
+    ).encode()
+
+
+class TestResponseCache:
+    """Unit tests for the on-disk response cache."""
+
+    def test_key_ignores_param_order_and_placement(self, tmp_path):
+        """Test that params in the endpoint and passed separately address one entry."""
+        cache = ResponseCache(cache_dir=str(tmp_path))
+
+        key = cache.get_key("fixtures?date=2024-05-01&league=39", {})
+
+        assert key == cache.get_key("fixtures", {"league": 39, "date": "2024-05-01"})
+        assert key != cache.get_key("fixtures", {"date": "2024-05-02", "league": 39})
+
+    def test_finished_fixtures_never_expire(self, tmp_path):
+        """Test that fixtures responses expire unless all their fixtures finished."""
+        cache = ResponseCache(cache_dir=str(tmp_path), ttls={"fixtures": -1})
+        cache.set("fixtures?date=2024-05-01", {}, get_fixtures_content("FT", "PEN"))
+        cache.set("fixtures?date=2024-05-02", {}, get_fixtures_content("FT", "NS"))
+
+        assert cache.get("fixtures?date=2024-05-01", {}) is not None
+        assert cache.get("fixtures?date=2024-05-02", {}) is None
+
+    def test_zero_ttl_is_not_cached(self, tmp_path):
+        """Test that endpoints with a TTL of 0 are never written."""
+        cache = ResponseCache(cache_dir=str(tmp_path), ttls={"odds/live": 0})
+        cache.set("odds/live", {}, b"{}")
+
+        assert not list(tmp_path.iterdir())
+
+    def test_hit_rate(self, tmp_path):
+        """Test that lookups are counted as hits and misses."""
+        cache = ResponseCache(cache_dir=str(tmp_path))
+        cache.set("teams", {"id": 1}, b"{}")
+
+        cache.get("teams", {"id": 1})
+        cache.get("teams", {"id": 2})
+        cache.get("teams", {"id": 1})
+
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert cache.hit_rate == 2 / 3
+
+
+class TestCachedFetch:
+    """Unit tests for fetchers answering from the response cache."""
+
+    def test_repeated_fetch_is_served_from_cache(self, api_server):
+        """Test that a repeated request is answered from the cache and not sent."""
+        fetcher = ApiFetcher()
+
+        first = fetcher.fetch_data("fixtures", date="2024-05-01")
+        second = fetcher.fetch_data("fixtures", date="2024-05-01")
+        fetcher.close()
+
+        assert api_server.requests == 1
+        assert second.from_cache
+        assert second.content == first.content
+        assert fetcher.cache.hit_rate == 0.5
+
+    def test_empty_responses_are_not_cached(self, api_server):
+        """Test that responses without data are requested again."""
+        fetcher = ApiFetcher()
+
+        fetcher.fetch_data("fixtures", date="empty")
+        fetcher.fetch_data("fixtures", date="empty")
+        fetcher.close()
+
+        assert api_server.requests == 2
+
+    def test_async_pull_skips_cached_items(self, api_server, tmp_path):
+        """Test that a repeated pull writes every item without new requests."""
+        dates = [f"2024-05-{day:02d}" for day in range(1, 6)]
+        fetcher = AsyncFetcher(concurrency=4)
+
+        fetcher.pull_data_by_dates(dates, "fixtures?date={}", "FIXTURES_", "fixtures")
+        fetcher.pull_data_by_dates(dates, "fixtures?date={}", "FIXTURES_", "fixtures")
+
+        assert api_server.requests == 5
+        assert fetcher.last_stats.requests == 0
+        assert fetcher.last_stats.cached == 5
+        assert fetcher.last_stats.written == 5
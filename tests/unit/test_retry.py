@@ -0,0 +1,275 @@
+import time
+from email.utils import formatdate
+
+import pytest
+from requests import Response
+
+from services.api.api_fetcher import ApiFetcher
+from services.api.async_fetcher import AsyncFetcher
+from services.api.fetch_jobs import retry_failed_requests
+from services.api.generic_fetcher import GenericFetcher
+from services.api.rate_limiter import TokenBucket
+from services.api.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RequestFailedError,
+    get_backoff,
+    get_retry_after,
+)
+from services.api.retry_queue import RetryQueue, retry_queue
+
+
+def get_response(**headers: str) -> Response:
+    response = Response()
+    response.headers.update(headers)
+    return response
+
+
+class CountingBucket(TokenBucket):
+    """Token bucket counting the tokens taken."""
+
+    acquired = 0
+
+    async def acquire(self) -> None:
+        self.acquired += 1
+        await super().acquire()
+
+
+def make_fast(fetcher: ApiFetcher, breaker: CircuitBreaker) -> ApiFetcher:
+    fetcher.backoff_base = 0.001
+    fetcher.circuit_breaker = breaker
+    return fetcher
+
+
+class TestBackoff:
+    """Unit tests for delays between retries."""
+
+    def test_backoff_is_jittered_below_exponential_cap(self):
+        """Test that delays stay within the exponential bound and the cap."""
+        delays = [get_backoff(3, base=1, cap=5) for _ in range(100)]
+
+        assert all(0 <= delay <= 5 for delay in delays)
+        assert len(set(delays)) > 1
+        assert get_backoff(0, base=0.5) <= 0.5
+
+    def test_retry_after_in_seconds_or_date(self):
+        """Test that both Retry-After formats are read, invalid ones ignored."""
+        in_a_minute = formatdate(time.time() + 60, usegmt=True)
+
+        assert get_retry_after(get_response(**{"Retry-After": "7"})) == 7
+        assert 55 < get_retry_after(get_response(**{"Retry-After": in_a_minute})) <= 60
+        assert get_retry_after(get_response(**{"Retry-After": "soon"})) is None
+        assert get_retry_after(get_response()) is None
+
+
+class TestCircuitBreaker:
+    """Unit tests for pausing requests while the upstream is degraded."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the threshold and pauses the next request."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.1, max_pause=1)
+        breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            breaker.record_failure()
+
+        started_at = time.monotonic()
+        breaker.before_request()
+
+        assert time.monotonic() - started_at >= 0.09
+        assert not breaker.is_open
+
+    def test_failure_after_pause_doubles_it(self):
+        """Test that one failure after a pause reopens the circuit for longer."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05, max_pause=1)
+        breaker.record_failure()
+        breaker.record_failure()
+        # Failures of requests in flight while open are ignored
+        breaker.record_failure()
+        breaker.before_request()
+
+        breaker.record_failure()
+
+        assert breaker.open_until - time.monotonic() > 0.05
+
+    def test_fails_at_once_beyond_max_pause(self):
+        """Test that requests fail without waiting when the pause is too long."""
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0.01, max_pause=1)
+        breaker.record_failure(retry_after=30)
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+
+class TestRetryQueue:
+    """Unit tests for the queue of failed items."""
+
+    def test_counts_attempts_and_drops_after_max(self, tmp_path):
+        """Test that items failing too often leave the queue."""
+        queue = RetryQueue(path=str(tmp_path / "retries.sqlite"), max_attempts=2)
+        for _ in range(2):
+            queue.add(["1", "2"], "teams?id={}", "TEAMS_", "teams", entity="teams")
+        queue.remove(["2"], "teams?id={}")
+
+        assert queue.get_values("teams?id={}") == ["1"]
+        assert queue.get_jobs("teams") == [
+            {
+                "endpoint_template": "teams?id={}",
+                "extra_params": {},
+                "filename_prefix": "TEAMS_",
+                "subdir": "teams",
+            }
+        ]
+
+        queue.add(["1"], "teams?id={}", "TEAMS_", "teams", entity="teams")
+
+        assert queue.get_values("teams?id={}") == []
+
+    def test_params_separate_queues(self, tmp_path):
+        """Test that items of a pull with other params are not mixed up."""
+        queue = RetryQueue(path=str(tmp_path / "retries.sqlite"))
+        queue.add(["1"], "teams?id={}", "TEAMS_", "teams", {"season": 2024})
+
+        assert queue.get_values("teams?id={}", {"season": 2024}) == ["1"]
+        assert queue.get_values("teams?id={}") == []
+
+
+class TestFetcherRetries:
+    """Unit tests for retries of requests to the API."""
+
+    def test_retries_server_errors(self, api_server):
+        """Test that a request is retried until the API recovers."""
+        api_server.failures = {"2024-05-01": [(503, {}), (502, {})]}
+        fetcher = make_fast(ApiFetcher(), CircuitBreaker(failure_threshold=5))
+
+        response = fetcher.fetch_data("fixtures", date="2024-05-01")
+        fetcher.close()
+
+        assert response.json()["response"]
+        assert api_server.requests == 3
+
+    def test_honors_retry_after(self, api_server):
+        """Test that a throttled request waits as long as the API asks."""
+        api_server.failures = {"2024-05-01": [(429, {"Retry-After": "0.3"})]}
+        fetcher = make_fast(ApiFetcher(), CircuitBreaker(failure_threshold=5))
+
+        started_at = time.monotonic()
+        response = fetcher.fetch_data("fixtures", date="2024-05-01")
+        fetcher.close()
+
+        assert response.json()["response"]
+        assert time.monotonic() - started_at >= 0.3
+
+    def test_raises_after_last_attempt(self, api_server):
+        """Test that a request failing on every attempt raises."""
+        api_server.failures = {"2024-05-01": [(500, {})] * 3}
+        fetcher = make_fast(ApiFetcher(), CircuitBreaker(failure_threshold=5))
+        fetcher.max_retries = 2
+
+        with pytest.raises(RequestFailedError):
+            fetcher.fetch_data("fixtures", date="2024-05-01")
+        fetcher.close()
+
+        assert api_server.requests == 3
+
+    def test_failed_items_are_retried_by_next_pull(self, api_server, tmp_path):
+        """Test that the next pull of the endpoint re-fetches only failed items."""
+        api_server.failures = {"2024-05-02": [(500, {})] * 2}
+        fetcher = make_fast(GenericFetcher(), CircuitBreaker(failure_threshold=5))
+        fetcher.max_retries = 1
+        dates = ["2024-05-01", "2024-05-02"]
+
+        fetcher.pull_data_by_dates(
+            dates, "fixtures?date={}", "FIXTURES_", "fixtures", 0
+        )
+        queued = fetcher.retry_queue.get_values("fixtures?date={}")
+        fetcher.retry_failed()
+        fetcher.close()
+
+        assert queued == ["2024-05-02"]
+        assert fetcher.retry_queue.get_values("fixtures?date={}") == []
+        written = sorted(path.name for path in (tmp_path / "data/fixtures").iterdir())
+        assert written == [f"FIXTURES_{date}.json" for date in dates]
+        # Two failed attempts, then one request for each date
+        assert api_server.requests == 4
+
+    def test_open_circuit_queues_remaining_items(self, api_server):
+        """Test that a pull sets all items aside once the upstream is down."""
+        dates = [f"2024-05-{day:02d}" for day in range(1, 11)]
+        api_server.failures = {date: [(503, {"Retry-After": "60"})] for date in dates}
+        fetcher = make_fast(
+            AsyncFetcher(concurrency=2),
+            CircuitBreaker(failure_threshold=5, max_pause=1),
+        )
+
+        fetcher.pull_data_by_dates(dates, "fixtures?date={}", "FIXTURES_", "fixtures")
+
+        assert fetcher.last_stats.failed == 10
+        assert fetcher.last_stats.written == 0
+        assert sorted(fetcher.retry_queue.get_values("fixtures?date={}")) == dates
+        assert api_server.requests <= 2
+
+    def test_retries_take_quota(self, api_server):
+        """Test that every retry is taken from the quota, and stops once it is spent."""
+        api_server.failures = {"2024-05-01": [(503, {})] * 2}
+        fetcher = make_fast(
+            ApiFetcher(entity="fixtures"), CircuitBreaker(failure_threshold=5)
+        )
+        ledger = fetcher.config.ledger
+
+        fetcher.fetch_data("fixtures", date="2024-05-01")
+
+        assert ledger.get_usage() == {"fixtures": 3}
+
+        api_server.failures = {"2024-05-02": [(503, {})] * 3}
+        ledger.sync(limit_day=100, current=98)
+        with pytest.raises(RequestFailedError, match="no quota left"):
+            fetcher.fetch_data("fixtures", date="2024-05-02")
+        fetcher.close()
+
+        assert api_server.requests == 5
+        assert ledger.get_remaining() == 0
+
+    def test_async_retries_take_tokens(self, api_server):
+        """Test that concurrent retries are paced and taken from the quota too."""
+        api_server.failures = {"2024-05-01": [(503, {}), (502, {})]}
+        rate_limiter = CountingBucket(rate=100, capacity=5)
+        fetcher = make_fast(
+            AsyncFetcher(concurrency=2, rate_limiter=rate_limiter, entity="fixtures"),
+            CircuitBreaker(failure_threshold=5),
+        )
+
+        fetcher.pull_data_by_dates(
+            ["2024-05-01", "2024-05-02"], "fixtures?date={}", "FIXTURES_", "fixtures"
+        )
+
+        assert fetcher.last_stats.written == 2
+        assert api_server.requests == 4
+        assert rate_limiter.acquired == 4
+        assert fetcher.config.ledger.get_usage() == {"fixtures": 4}
+
+    def test_pipelines_replay_queued_items_of_their_entity(self, api_server):
+        """Test that queued items are re-fetched only for the given entities."""
+        retry_queue.add(
+            ["2024-05-01"],
+            "fixtures?date={}",
+            "FIXTURES_",
+            "fixtures",
+            entity="fixtures",
+        )
+        retry_queue.add(
+            ["2024-05-02"],
+            "fixtures?date={}",
+            "TEAMS_",
+            "teams",
+            {"league": 1},
+            entity="teams",
+        )
+
+        retry_failed_requests(["fixtures"])
+
+        assert api_server.requests == 1
+        assert retry_queue.get_values("fixtures?date={}") == []
+        assert retry_queue.get_values("fixtures?date={}", {"league": 1}) == [
+            "2024-05-02"
+        ]
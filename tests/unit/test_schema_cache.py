@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine
+
+from services.schema_cache import SchemaCache
+
+
+class TestSchemaCache:
+    """Unit tests for the process-level table existence cache."""
+
+    def test_reads_catalog_once_until_invalidated(self):
+        """Test that tables created behind the cache's back are seen only after invalidation."""
+        engine = create_engine("sqlite://")
+        table = Table("teams", MetaData(), Column("team_id", Integer, primary_key=True))
+        cache = SchemaCache()
+
+        assert not cache.has_table(engine, table)
+        table.create(engine)
+        assert not cache.has_table(engine, table)
+
+        cache.invalidate(engine)
+        assert cache.has_table(engine, table)
+
+    def test_registers_created_tables(self):
+        """Test that tables added by the application are cached without a catalog read."""
+        engine = create_engine("sqlite://")
+        table = Table("teams", MetaData(), Column("team_id", Integer, primary_key=True))
+        cache = SchemaCache()
+
+        assert not cache.has_table(engine, table)
+        cache.add_table(engine, table)
+        assert cache.has_table(engine, table)